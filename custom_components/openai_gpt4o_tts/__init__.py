@@ -1,9 +1,55 @@
 import logging
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.const import EVENT_HOMEASSISTANT_STOP, EVENT_STATE_CHANGED
+from homeassistant.core import Event, HomeAssistant, callback
+from homeassistant.helpers.event import async_track_time_interval
+from homeassistant.helpers.start import async_at_started
+from homeassistant.helpers.storage import STORAGE_DIR
 
-from .const import DOMAIN, PLATFORMS
+from .const import (
+    CACHE_DIR,
+    CACHE_WARM_INTERVAL,
+    CACHE_WARM_MIN_COUNT,
+    CONF_CACHE,
+    CONF_CACHE_SIZE,
+    CONF_CACHE_WARM,
+    CONF_EARCON_AFTER,
+    CONF_EARCON_TEXT,
+    CONF_PREWARM,
+    CONF_RECORD_TRACE,
+    CONF_WYOMING_HOST,
+    CONF_WYOMING_PORT,
+    DATA_EARCONS,
+    DATA_PROFILE,
+    DATA_QUEUES,
+    DATA_USAGE,
+    DATA_VIEW,
+    DEFAULT_CACHE,
+    DEFAULT_CACHE_SIZE,
+    DEFAULT_CACHE_WARM,
+    DEFAULT_EARCON_AFTER,
+    DEFAULT_EARCON_TEXT,
+    DEFAULT_PREWARM,
+    DEFAULT_RECORD_TRACE,
+    DEFAULT_WYOMING_HOST,
+    DEFAULT_WYOMING_PORT,
+    AUTO,
+    DOMAIN,
+    EVENT_CLIP,
+    PLATFORMS,
+    SERVICE_ENQUEUE,
+    SERVICE_PROFILE,
+)
+from .announce import AnnouncementQueues, async_setup_services
+from .earcon import EarconMasker
 from .gpt4o import GPT4oClient
+from .ledger import UsageLedger
+from .profiler import async_setup_profile_service
+from .request import SynthesisRequest
+from .trace import TraceRecorder, trace_salt
+from .usage import UsageTracker
+from .view import CachedClipView, async_clip_url
+from .wyoming_server import WyomingServer
 
 
 async def _async_update_listener(hass: HomeAssistant, entry: ConfigEntry) -> None:
@@ -12,13 +58,173 @@ async def _async_update_listener(hass: HomeAssistant, entry: ConfigEntry) -> Non
 
 _LOGGER = logging.getLogger(__name__)
 
+# Satellite states entered between the wake word and the spoken reply
+_SATELLITE_ACTIVE_STATES = ("listening", "processing")
+
+
+def _pipeline_starting(entity_id: str, new_state) -> bool:
+    """Return True if a state change means an Assist pipeline just started."""
+    if new_state is None:
+        return False
+    if entity_id.startswith("assist_satellite."):
+        return new_state.state in _SATELLITE_ACTIVE_STATES
+    # Older ESPHome/Wyoming satellites only expose an "in progress" sensor
+    return (
+        entity_id.startswith("binary_sensor.")
+        and entity_id.endswith("_assist_in_progress")
+        and new_state.state == "on"
+    )
+
+
+def _wyoming_host(hass: HomeAssistant, opts: dict) -> str:
+    """Return the address satellites reach the Wyoming server on.
+
+    Wyoming has no authentication, so by default only Home Assistant's LAN
+    address is served, not every interface.
+    """
+    if host := opts.get(CONF_WYOMING_HOST, DEFAULT_WYOMING_HOST).strip():
+        return host
+    # Set up by the http integration, which this one depends on
+    api = getattr(hass.config, "api", None)
+    return api.local_ip if api is not None else "127.0.0.1"
+
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Set up GPT-4o TTS from a config entry."""
     hass.data.setdefault(DOMAIN, {})
+    if not hass.data.get(DATA_VIEW):
+        # Views cannot be unregistered, so one serves every entry
+        hass.http.register_view(CachedClipView(hass))
+        hass.data[DATA_VIEW] = True
+
+    opts = entry.options or {}
+
+    # Initialize the GPT-4o TTS client; it opens its HTTP session on first use
+    ledger = UsageLedger(hass, entry.entry_id)
+    client = GPT4oClient(hass, entry, ledger=ledger)
+    if (profile := hass.data.get(DATA_PROFILE)) is not None:
+        # Entries reloaded while a profile runs stay in it
+        profile.attach(client)
+    hass.data[DOMAIN][entry.entry_id] = client
+    hass.data.setdefault(DATA_QUEUES, {})[entry.entry_id] = AnnouncementQueues(
+        hass, entry, client
+    )
+    earcons = None
+    if earcon_after := int(opts.get(CONF_EARCON_AFTER, DEFAULT_EARCON_AFTER)):
+        earcons = EarconMasker(
+            client,
+            opts.get(CONF_EARCON_TEXT, DEFAULT_EARCON_TEXT),
+            earcon_after,
+            lambda coro: entry.async_create_background_task(
+                hass, coro, f"{DOMAIN} acknowledgement"
+            ),
+        )
+        hass.data.setdefault(DATA_EARCONS, {})[entry.entry_id] = earcons
+    async_setup_services(hass)
+    async_setup_profile_service(hass)
+
+    tracker = hass.data.setdefault(DATA_USAGE, {}).setdefault(
+        entry.entry_id, UsageTracker()
+    )
+    warm_count = int(opts.get(CONF_CACHE_WARM, DEFAULT_CACHE_WARM))
+
+    async def _async_warm(now=None) -> None:
+        """Keep the hottest phrases rendered with the current settings."""
+        await client.async_warm_cache(tracker.top(warm_count, CACHE_WARM_MIN_COUNT))
+        if now is not None:
+            tracker.decay()
+
+    wyoming = None
+    if wyoming_port := int(opts.get(CONF_WYOMING_PORT, DEFAULT_WYOMING_PORT)):
+        wyoming = WyomingServer(client, _wyoming_host(hass, opts), wyoming_port)
+        # Runs after async_unload_entry drained the client
+        entry.async_on_unload(wyoming.async_stop)
+
+    async def _async_startup() -> None:
+        """Start serving, load the ledger and cache, and warm it, once booted."""
+        if wyoming is not None:
+            await wyoming.async_start()
+        await ledger.async_load()
+        if opts.get(CONF_CACHE, DEFAULT_CACHE):
+            await client.async_load_cache(
+                hass.config.path(STORAGE_DIR, CACHE_DIR, entry.entry_id),
+                int(opts.get(CONF_CACHE_SIZE, DEFAULT_CACHE_SIZE)) * 1024 * 1024,
+            )
+        if earcons is not None and client.audio_output != AUTO:
+            # Render the acknowledgement before it is first needed
+            earcons.prepare(None, client.audio_output)
+        if client.cache is None or not warm_count:
+            return
+        entry.async_on_unload(
+            async_track_time_interval(hass, _async_warm, CACHE_WARM_INTERVAL)
+        )
+        # Options may have changed on reload, so re-render right away too
+        await _async_warm()
 
-    # Initialize the GPT-4o TTS client
-    hass.data[DOMAIN][entry.entry_id] = GPT4oClient(hass, entry)
+    @callback
+    def _async_started(_hass: HomeAssistant) -> None:
+        entry.async_create_background_task(hass, _async_startup(), f"{DOMAIN}_startup")
+
+    # Runs immediately on reloads, after EVENT_HOMEASSISTANT_STARTED at boot
+    entry.async_on_unload(async_at_started(hass, _async_started))
+
+    @callback
+    def _async_clip_ready(
+        request: SynthesisRequest, seconds: float, cached: bool
+    ) -> None:
+        """Tell automations how long the clip about to play lasts."""
+        data = {
+            "entry_id": entry.entry_id,
+            "message": request.text,
+            "key": request.key,
+            "audio_format": request.response_format,
+            "duration": round(seconds, 3),
+            "cached": cached,
+        }
+        entry.async_create_background_task(
+            hass, _async_fire_clip(request.key, data), f"{DOMAIN}_clip"
+        )
+
+    async def _async_fire_clip(key: str, data: dict) -> None:
+        # The cache is checked in the executor; its lock may be held there
+        if await client.async_cached_key([key]):
+            data["url"] = async_clip_url(hass, entry.entry_id, key)
+        hass.bus.async_fire(EVENT_CLIP, data)
+
+    entry.async_on_unload(client.async_add_clip_listener(_async_clip_ready))
+
+    async def _async_stop(_event: Event) -> None:
+        """Let speech in flight finish and flush the caches before exiting."""
+        await client.async_close()
+
+    # Entries are not unloaded when Home Assistant stops
+    entry.async_on_unload(
+        hass.bus.async_listen_once(EVENT_HOMEASSISTANT_STOP, _async_stop)
+    )
+
+    if opts.get(CONF_RECORD_TRACE, DEFAULT_RECORD_TRACE):
+        recorder = TraceRecorder(
+            hass,
+            hass.config.path(f"{DOMAIN}.trace.{entry.entry_id}.jsonl"),
+            trace_salt(entry.data["api_key"]),
+        )
+        entry.async_on_unload(client.async_add_request_observer(recorder.record))
+        # Runs after the observer is removed; writes out what is buffered
+        entry.async_on_unload(recorder.async_close)
+
+    if opts.get(CONF_PREWARM, DEFAULT_PREWARM):
+
+        @callback
+        def _async_state_changed(event: Event) -> None:
+            """Pre-connect while STT and the conversation agent run."""
+            if _pipeline_starting(event.data["entity_id"], event.data.get("new_state")):
+                entry.async_create_background_task(
+                    hass, client.async_prewarm(), f"{DOMAIN}_prewarm"
+                )
+
+        entry.async_on_unload(
+            hass.bus.async_listen(EVENT_STATE_CHANGED, _async_state_changed)
+        )
 
     entry.async_on_unload(entry.add_update_listener(_async_update_listener))
 
@@ -32,6 +238,20 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Unload GPT-4o TTS config entry."""
     unload_ok = await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
     if unload_ok:
-        hass.data[DOMAIN].pop(entry.entry_id, None)
+        hass.data.get(DATA_EARCONS, {}).pop(entry.entry_id, None)
+        queues = hass.data.get(DATA_QUEUES, {}).pop(entry.entry_id, None)
+        if queues is not None:
+            queues.async_shutdown()
+        if not hass.data.get(DATA_QUEUES):
+            hass.services.async_remove(DOMAIN, SERVICE_ENQUEUE)
+            hass.services.async_remove(DOMAIN, SERVICE_PROFILE)
+        client = hass.data[DOMAIN].pop(entry.entry_id, None)
+        if client is not None:
+            await client.async_close()
     return unload_ok
 
+
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Forget usage history of a removed entry."""
+    hass.data.get(DATA_USAGE, {}).pop(entry.entry_id, None)
+    await UsageLedger(hass, entry.entry_id).async_remove()
@@ -0,0 +1,303 @@
+"""Announcement queue merging messages into one gapless stream per player."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import uuid
+from collections.abc import AsyncIterator, Callable, Coroutine
+from dataclasses import dataclass, field
+
+import voluptuous as vol
+from homeassistant.components.tts.media_source import generate_media_source_id
+from homeassistant.core import HomeAssistant, ServiceCall
+from homeassistant.exceptions import HomeAssistantError
+
+from .audio import continuation, duration_ms
+from .const import (
+    ATTR_BATCH,
+    ATTR_PRIORITY,
+    CONF_AUDIO_OUTPUT,
+    DATA_QUEUES,
+    DOMAIN,
+    SERVICE_ENQUEUE,
+)
+from .gpt4o import GPT4oClient
+from .usage import normalize_message
+
+_LOGGER = logging.getLogger(__name__)
+
+# Messages arriving this many seconds after the first join its batch
+QUEUE_WINDOW = 1.5
+# Formats whose complete clips can be joined into one stream.  Ogg Opus
+# clips cannot: each starts a new logical stream with its own headers.
+CONCAT_FORMATS = ("mp3", "wav", "pcm", "aac")
+CONCAT_FALLBACK_FORMAT = "mp3"
+# Give up on a batch the player has not started fetching after this long
+FETCH_TIMEOUT = 60
+
+ATTR_ENTITY_ID = "entity_id"
+ATTR_MESSAGE = "message"
+ATTR_OPTIONS = "options"
+ATTR_CONFIG_ENTRY_ID = "config_entry_id"
+
+
+def _entity_ids(value) -> list[str]:
+    if isinstance(value, str):
+        value = [part.strip() for part in value.split(",")]
+    return [vol.Match(r"^media_player\.\w+$")(entity_id) for entity_id in value]
+
+
+ENQUEUE_SCHEMA = vol.Schema(
+    {
+        vol.Required(ATTR_ENTITY_ID): _entity_ids,
+        vol.Required(ATTR_MESSAGE): vol.All(str, vol.Length(min=1)),
+        vol.Optional(ATTR_PRIORITY, default=False): bool,
+        vol.Optional(ATTR_OPTIONS, default={}): dict,
+        vol.Optional(ATTR_CONFIG_ENTRY_ID): str,
+    }
+)
+
+
+@dataclass
+class Announcement:
+    """One queued message; ``key`` identifies duplicates."""
+
+    message: str
+    options: dict
+    priority: bool = False
+    key: str = field(init=False)
+
+    def __post_init__(self) -> None:
+        self.key = json.dumps(
+            [normalize_message(self.message), self.options], sort_keys=True
+        )
+
+
+class Batch:
+    """Messages rendered in parallel and streamed back to back."""
+
+    def __init__(
+        self,
+        client: GPT4oClient,
+        items: list[Announcement],
+        audio_format: str,
+        create_task: Callable[[Coroutine], asyncio.Task],
+    ) -> None:
+        self.id = uuid.uuid4().hex
+        self.audio_format = audio_format
+        self.message = " ".join(item.message for item in items)
+        # Rendered while the player is told to fetch the batch
+        self._tasks = [
+            create_task(
+                client.get_tts_audio(
+                    item.message,
+                    {
+                        **item.options,
+                        CONF_AUDIO_OUTPUT: audio_format,
+                        ATTR_PRIORITY: item.priority,
+                    },
+                )
+            )
+            for item in items
+        ]
+        self.fetched = asyncio.Event()
+        self.streamed = asyncio.Event()
+        # Loop time the player started fetching, and seconds of audio sent
+        self.started = 0.0
+        self.duration = 0.0
+
+    async def stream(self) -> AsyncIterator[bytes]:
+        """Yield every clip in order as soon as it and its predecessors are done."""
+        loop = asyncio.get_running_loop()
+        self.started = loop.time()
+        self.fetched.set()
+        first = True
+        try:
+            for task in self._tasks:
+                audio_format, data = await task
+                if not data:
+                    continue
+                self.duration += duration_ms(data, audio_format) / 1000
+                yield continuation(data, audio_format, first)
+                first = False
+        finally:
+            self.streamed.set()
+
+    def cancel(self) -> None:
+        """Stop rendering clips nobody will fetch."""
+        for task in self._tasks:
+            task.cancel()
+
+
+class AnnouncementQueue:
+    """Pending messages for one media player.
+
+    The first message opens a short window; everything queued meanwhile is
+    played as one batch, priority messages first, once the previous batch
+    has finished playing.  A priority message closes the window at once.
+    """
+
+    def __init__(self, manager: AnnouncementQueues, target: str) -> None:
+        self._manager = manager
+        self._target = target
+        self._pending: list[Announcement] = []
+        self._urgent = asyncio.Event()
+        self._worker: asyncio.Task | None = None
+
+    def add(self, item: Announcement) -> bool:
+        """Queue ``item``; returns False if an identical one is already pending."""
+        for queued in self._pending:
+            if queued.key == item.key:
+                queued.priority |= item.priority
+                if item.priority:
+                    self._urgent.set()
+                return False
+        self._pending.append(item)
+        if item.priority:
+            self._urgent.set()
+        if self._worker is None or self._worker.done():
+            self._worker = self._manager.entry.async_create_background_task(
+                self._manager.hass, self._run(), f"{DOMAIN}_queue_{self._target}"
+            )
+        return True
+
+    async def _run(self) -> None:
+        while self._pending:
+            if not self._urgent.is_set():
+                try:
+                    await asyncio.wait_for(self._urgent.wait(), QUEUE_WINDOW)
+                except asyncio.TimeoutError:
+                    pass
+            # Stable sort: priority first, otherwise in arrival order
+            batch = sorted(self._pending, key=lambda item: not item.priority)
+            self._pending.clear()
+            self._urgent.clear()
+            try:
+                await self._manager.async_play(self._target, batch)
+            except HomeAssistantError as err:
+                _LOGGER.error("Error playing queued announcement: %s", err)
+
+    def cancel(self) -> None:
+        """Drop pending messages and stop the worker."""
+        self._pending.clear()
+        if self._worker is not None:
+            self._worker.cancel()
+
+
+class AnnouncementQueues:
+    """Per-player queues of one config entry and the batches being played."""
+
+    def __init__(self, hass: HomeAssistant, entry, client: GPT4oClient) -> None:
+        self.hass = hass
+        self.entry = entry
+        self._client = client
+        # Set by the TTS entity once it has an entity_id
+        self.engine: str | None = None
+        self._queues: dict[str, AnnouncementQueue] = {}
+        self._batches: dict[str, Batch] = {}
+
+    def enqueue(
+        self, targets: list[str], message: str, options: dict, priority: bool
+    ) -> None:
+        """Queue ``message`` for every media player in ``targets``."""
+        if self.engine is None:
+            raise HomeAssistantError("GPT-4o TTS entity is not ready yet")
+        for target in targets:
+            queue = self._queues.get(target)
+            if queue is None:
+                queue = self._queues[target] = AnnouncementQueue(self, target)
+            if not queue.add(Announcement(message, options, priority)):
+                _LOGGER.debug("Dropped duplicate announcement for %s", target)
+
+    def _audio_format(self, items: list[Announcement]) -> str:
+        audio_format = items[0].options.get(
+            CONF_AUDIO_OUTPUT, self._client.audio_output
+        )
+        if audio_format in CONCAT_FORMATS:
+            return audio_format
+        return CONCAT_FALLBACK_FORMAT
+
+    async def async_play(self, target: str, items: list[Announcement]) -> None:
+        """Render ``items`` in parallel and play them as one clip on ``target``."""
+        batch = Batch(
+            self._client,
+            items,
+            self._audio_format(items),
+            lambda coro: self.entry.async_create_background_task(
+                self.hass, coro, f"{DOMAIN}_batch"
+            ),
+        )
+        self._batches[batch.id] = batch
+        media_id = generate_media_source_id(
+            self.hass,
+            batch.message,
+            engine=self.engine,
+            options={ATTR_BATCH: batch.id},
+            cache=False,
+        )
+        try:
+            await self.hass.services.async_call(
+                "media_player",
+                "play_media",
+                {
+                    ATTR_ENTITY_ID: target,
+                    "media_content_id": media_id,
+                    "media_content_type": "music",
+                    "announce": True,
+                },
+                blocking=True,
+            )
+            await asyncio.wait_for(batch.fetched.wait(), FETCH_TIMEOUT)
+            await batch.streamed.wait()
+            # The clip durations say when the player will be done with it
+            loop = asyncio.get_running_loop()
+            await asyncio.sleep(
+                max(0.0, batch.started + batch.duration - loop.time())
+            )
+        except asyncio.TimeoutError:
+            _LOGGER.warning("%s never fetched its queued announcement", target)
+        finally:
+            batch.cancel()
+            self._batches.pop(batch.id, None)
+
+    def stream(self, batch_id: str) -> tuple[str, AsyncIterator[bytes]] | None:
+        """Return ``(format, audio)`` of a batch handed to a player, or None."""
+        batch = self._batches.get(batch_id)
+        if batch is None or batch.fetched.is_set():
+            return None
+        return batch.audio_format, batch.stream()
+
+    def async_shutdown(self) -> None:
+        """Cancel every queue and batch."""
+        for queue in self._queues.values():
+            queue.cancel()
+        for batch in self._batches.values():
+            batch.cancel()
+
+
+def async_setup_services(hass: HomeAssistant) -> None:
+    """Register the enqueue service once for all entries."""
+    if hass.services.has_service(DOMAIN, SERVICE_ENQUEUE):
+        return
+
+    async def _async_enqueue(call: ServiceCall) -> None:
+        managers = hass.data.get(DATA_QUEUES, {})
+        entry_id = call.data.get(ATTR_CONFIG_ENTRY_ID)
+        if entry_id is not None:
+            manager = managers.get(entry_id)
+        else:
+            manager = next(iter(managers.values()), None)
+        if manager is None:
+            raise HomeAssistantError("No loaded GPT-4o TTS entry to speak with")
+        manager.enqueue(
+            call.data[ATTR_ENTITY_ID],
+            call.data[ATTR_MESSAGE],
+            call.data[ATTR_OPTIONS],
+            call.data[ATTR_PRIORITY],
+        )
+
+    hass.services.async_register(
+        DOMAIN, SERVICE_ENQUEUE, _async_enqueue, schema=ENQUEUE_SCHEMA
+    )
@@ -0,0 +1,654 @@
+"""Audio framing helpers for GPT-4o TTS output.
+
+OpenAI returns ``pcm`` as raw 24 kHz 16-bit mono samples, ``wav`` as the same
+samples behind a RIFF header, ``mp3`` as MPEG Layer III frames, ``aac`` as ADTS
+frames and ``opus`` inside Ogg pages.  The splitters below walk those units
+without decoding anything so streams can be cut on unit boundaries.
+"""
+
+import sys
+from array import array
+from collections.abc import AsyncIterator
+
+PCM_SAMPLE_RATE = 24000
+PCM_SAMPLE_WIDTH = 2
+PCM_CHANNELS = 1
+
+# Assumed bitrate for formats without cheap framing (flac), in bytes per ms
+FALLBACK_BYTES_PER_MS = 24
+
+# 16-bit samples at or below this magnitude count as silence (about -50 dBFS)
+SILENCE_THRESHOLD = 100
+# Silence kept before and after speech so onsets and decays are not clipped
+SILENCE_PAD_MS = 30
+# Silent MP3 frames kept on each side; one also carries the decoder overlap
+SILENCE_PAD_FRAMES = 1
+# Formats whose silence can be found without decoding
+TRIMMABLE_FORMATS = ("pcm", "wav", "mp3")
+# Largest MP3 bit reservoir back-reference (MPEG-1), in bytes
+_MP3_MAX_RESERVOIR = 511
+# Samples compared per min()/max() call when scanning for speech
+_SCAN_BLOCK = 256
+
+# Layer III bitrates in kbit/s for MPEG-1 and MPEG-2/2.5
+_MP3_BITRATES = {
+    True: (0, 32, 40, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320),
+    False: (0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160),
+}
+# Keyed by the two version bits: 0 = MPEG-2.5, 2 = MPEG-2, 3 = MPEG-1
+_MP3_SAMPLE_RATES = {
+    0: (11025, 12000, 8000),
+    2: (22050, 24000, 16000),
+    3: (44100, 48000, 32000),
+}
+_ADTS_SAMPLE_RATES = (
+    96000, 88200, 64000, 48000, 44100, 32000, 24000,
+    22050, 16000, 12000, 11025, 8000, 7350,
+)
+
+
+def mp3_frame_info(buf, pos: int) -> tuple[int, int, int] | None:
+    """Return ``(length, samples, sample_rate)`` of a Layer III frame at ``pos``."""
+    if len(buf) - pos < 4:
+        return None
+    b0, b1, b2 = buf[pos], buf[pos + 1], buf[pos + 2]
+    if b0 != 0xFF or (b1 & 0xE0) != 0xE0:
+        return None
+    version = (b1 >> 3) & 0x03
+    layer = (b1 >> 1) & 0x03
+    bitrate_index = b2 >> 4
+    rate_index = (b2 >> 2) & 0x03
+    if version == 1 or layer != 1 or bitrate_index in (0, 15) or rate_index == 3:
+        return None
+    mpeg1 = version == 3
+    sample_rate = _MP3_SAMPLE_RATES[version][rate_index]
+    bitrate = _MP3_BITRATES[mpeg1][bitrate_index] * 1000
+    padding = (b2 >> 1) & 0x01
+    samples = 1152 if mpeg1 else 576
+    length = (samples // 8) * bitrate // sample_rate + padding
+    return length, samples, sample_rate
+
+
+def mp3_side_info(buf, pos: int) -> tuple[int, int, bool] | None:
+    """Return ``(main_data_begin, main_data_offset, silent)`` of a frame at ``pos``.
+
+    ``main_data_offset`` is where the frame's own main data starts.  A frame
+    is silent when no granule carries Huffman data (``part2_3_length`` 0),
+    which is how encoders write digital silence.
+    """
+    if mp3_frame_info(buf, pos) is None:
+        return None
+    mpeg1 = (buf[pos + 1] >> 3) & 0x03 == 3
+    crc = 0 if buf[pos + 1] & 0x01 else 2
+    channels = 1 if buf[pos + 3] >> 6 == 3 else 2
+    if mpeg1:
+        side = 17 if channels == 1 else 32
+        begin_bits, granules, granule_bits = 9, 2, 59
+        # private bits, then four scale factor selection bits per channel
+        offset = begin_bits + (5 if channels == 1 else 3) + 4 * channels
+    else:
+        side = 9 if channels == 1 else 17
+        begin_bits, granules, granule_bits = 8, 1, 63
+        offset = begin_bits + channels
+    start = pos + 4 + crc
+    if len(buf) < start + side:
+        return None
+    bits = int.from_bytes(buf[start : start + side], "big")
+    total = side * 8
+    main_data_begin = bits >> (total - begin_bits)
+    silent = True
+    for _ in range(granules * channels):
+        if (bits >> (total - offset - 12)) & 0xFFF:
+            silent = False
+            break
+        offset += granule_bits
+    return main_data_begin, start + side, silent
+
+
+def _mp3_vbr_header(buf, pos: int, main_data_offset: int) -> bool:
+    """Return True if the frame at ``pos`` is a Xing/Info/VBRI header frame."""
+    return bytes(buf[main_data_offset : main_data_offset + 4]) in (
+        b"Xing",
+        b"Info",
+    ) or bytes(buf[pos + 36 : pos + 40]) == b"VBRI"
+
+
+def id3_length(buf, pos: int) -> int | None:
+    """Return the size of an ID3v2 tag at ``pos``, or None."""
+    if len(buf) - pos < 10 or bytes(buf[pos : pos + 3]) != b"ID3":
+        return None
+    size = 0
+    for byte in buf[pos + 6 : pos + 10]:
+        size = (size << 7) | (byte & 0x7F)
+    footer = 10 if buf[pos + 5] & 0x10 else 0
+    return 10 + size + footer
+
+
+def adts_frame_info(buf, pos: int) -> tuple[int, int, int] | None:
+    """Return ``(length, samples, sample_rate)`` of an ADTS frame at ``pos``."""
+    if len(buf) - pos < 7:
+        return None
+    if buf[pos] != 0xFF or (buf[pos + 1] & 0xF6) != 0xF0:
+        return None
+    rate_index = (buf[pos + 2] >> 2) & 0x0F
+    if rate_index >= len(_ADTS_SAMPLE_RATES):
+        return None
+    length = (
+        ((buf[pos + 3] & 0x03) << 11) | (buf[pos + 4] << 3) | (buf[pos + 5] >> 5)
+    )
+    if length < 7:
+        return None
+    samples = 1024 * ((buf[pos + 6] & 0x03) + 1)
+    return length, samples, _ADTS_SAMPLE_RATES[rate_index]
+
+
+def ogg_page_info(buf, pos: int) -> tuple[int, int] | None:
+    """Return ``(length, granule_position)`` of a complete Ogg page at ``pos``."""
+    if len(buf) - pos < 27 or bytes(buf[pos : pos + 4]) != b"OggS":
+        return None
+    segments = buf[pos + 26]
+    if len(buf) - pos < 27 + segments:
+        return None
+    length = 27 + segments + sum(buf[pos + 27 : pos + 27 + segments])
+    granule = int.from_bytes(buf[pos + 6 : pos + 14], "little", signed=True)
+    return length, granule
+
+
+def wav_header_info(buf) -> tuple[int, int, int, int] | None:
+    """Return ``(header_length, sample_rate, channels, sample_width)``.
+
+    ``header_length`` is the offset of the first sample.  Returns None until
+    the ``data`` chunk header has been buffered.
+    """
+    if len(buf) < 12:
+        return None
+    if bytes(buf[0:4]) != b"RIFF" or bytes(buf[8:12]) != b"WAVE":
+        return 0, PCM_SAMPLE_RATE, PCM_CHANNELS, PCM_SAMPLE_WIDTH
+    pos = 12
+    rate, channels, width = PCM_SAMPLE_RATE, PCM_CHANNELS, PCM_SAMPLE_WIDTH
+    while len(buf) - pos >= 8:
+        chunk_id = bytes(buf[pos : pos + 4])
+        size = int.from_bytes(buf[pos + 4 : pos + 8], "little")
+        if chunk_id == b"data":
+            return pos + 8, rate, channels, width
+        if len(buf) - pos < 8 + size:
+            return None
+        if chunk_id == b"fmt " and size >= 16:
+            channels = int.from_bytes(buf[pos + 10 : pos + 12], "little")
+            rate = int.from_bytes(buf[pos + 12 : pos + 16], "little")
+            width = int.from_bytes(buf[pos + 22 : pos + 24], "little") // 8
+        pos += 8 + size + (size & 1)
+    return None
+
+
+class _Splitter:
+    """Find the next unit in a buffer; base class splits on fixed byte rates."""
+
+    def __init__(self, bytes_per_ms: float = FALLBACK_BYTES_PER_MS) -> None:
+        self.bytes_per_ms = bytes_per_ms
+        self.align = 1
+
+    def bytes_for(self, ms: float) -> int:
+        size = max(self.align, int(ms * self.bytes_per_ms))
+        return size - size % self.align
+
+    def unit(self, buf, pos: int, target_ms: float) -> tuple[int, float] | None:
+        """Return ``(length, duration_ms)`` of the next unit, None for more data."""
+        length = min(self.bytes_for(target_ms), len(buf) - pos)
+        length -= length % self.align
+        if length <= 0:
+            return None
+        return length, length / self.bytes_per_ms
+
+
+class _PcmSplitter(_Splitter):
+    def __init__(self) -> None:
+        super().__init__()
+        self.set_layout(PCM_SAMPLE_RATE, PCM_CHANNELS, PCM_SAMPLE_WIDTH)
+
+    def set_layout(self, rate: int, channels: int, width: int) -> None:
+        self.bytes_per_ms = rate * channels * width / 1000
+        self.align = max(1, channels * width)
+
+
+class _WavSplitter(_PcmSplitter):
+    def __init__(self) -> None:
+        super().__init__()
+        self._header_done = False
+
+    def unit(self, buf, pos, target_ms):
+        if not self._header_done:
+            info = wav_header_info(buf[pos:])
+            if info is None:
+                return None
+            header, rate, channels, width = info
+            self.set_layout(rate, channels, width)
+            self._header_done = True
+            if header:
+                return header, 0.0
+        return super().unit(buf, pos, target_ms)
+
+
+class _Mp3Splitter(_Splitter):
+    def unit(self, buf, pos, target_ms):
+        tag = id3_length(buf, pos)
+        if tag is not None:
+            return (tag, 0.0) if len(buf) - pos >= tag else None
+        info = mp3_frame_info(buf, pos)
+        if info is not None:
+            length, samples, rate = info
+            if len(buf) - pos < length:
+                return None
+            return length, samples * 1000 / rate
+        return _resync(buf, pos, 0xE0)
+
+
+class _AdtsSplitter(_Splitter):
+    def unit(self, buf, pos, target_ms):
+        info = adts_frame_info(buf, pos)
+        if info is not None:
+            length, samples, rate = info
+            if len(buf) - pos < length:
+                return None
+            return length, samples * 1000 / rate
+        return _resync(buf, pos, 0xF0)
+
+
+class _OggSplitter(_Splitter):
+    def __init__(self) -> None:
+        super().__init__()
+        self._granule = 0
+
+    def unit(self, buf, pos, target_ms):
+        if len(buf) - pos >= 4 and bytes(buf[pos : pos + 4]) != b"OggS":
+            found = bytes(buf).find(b"OggS", pos + 1)
+            return (found - pos if found != -1 else len(buf) - pos), 0.0
+        info = ogg_page_info(buf, pos)
+        if info is None or len(buf) - pos < info[0]:
+            return None
+        length, granule = info
+        # Opus granule positions always count 48 kHz samples
+        duration = max(0, granule - self._granule) / 48 if granule > 0 else 0.0
+        if granule > 0:
+            self._granule = granule
+        return length, duration
+
+
+def _resync(buf, pos: int, mask: int) -> tuple[int, float] | None:
+    """Skip bytes up to the next candidate sync word."""
+    for idx in range(pos + 1, len(buf) - 1):
+        if buf[idx] == 0xFF and (buf[idx + 1] & mask) == mask:
+            return idx - pos, 0.0
+    if len(buf) - pos < 4:
+        return None
+    # Keep the last byte in case it starts a sync word
+    return len(buf) - pos - 1, 0.0
+
+
+def splitter_for(audio_format: str) -> _Splitter:
+    """Return a unit splitter for ``audio_format``."""
+    if audio_format == "pcm":
+        return _PcmSplitter()
+    if audio_format == "wav":
+        return _WavSplitter()
+    if audio_format == "mp3":
+        return _Mp3Splitter()
+    if audio_format == "aac":
+        return _AdtsSplitter()
+    if audio_format == "opus":
+        return _OggSplitter()
+    return _Splitter()
+
+
+class Rechunker:
+    """Regroup an audio byte stream into whole units of a target duration.
+
+    The first chunk is emitted as soon as ``first_ms`` of audio is buffered
+    so playback can start quickly; later chunks carry ``chunk_ms`` to keep
+    per-chunk overhead down.  Bytes that are not part of a recognised unit
+    are passed through with the surrounding audio.
+    """
+
+    def __init__(self, audio_format: str, first_ms: float, chunk_ms: float) -> None:
+        self._splitter = splitter_for(audio_format)
+        self._first_ms = first_ms
+        self._chunk_ms = chunk_ms
+        self._target = first_ms
+        self._buf = bytearray()
+        self._pos = 0
+        self._ms = 0.0
+        # Audio duration of every recognised unit seen so far
+        self.total_ms = 0.0
+
+    def feed(self, data: bytes) -> list[bytes]:
+        """Buffer ``data`` and return any chunks that are complete."""
+        self._buf += data
+        out = []
+        while True:
+            unit = self._splitter.unit(self._buf, self._pos, self._target - self._ms)
+            if unit is None:
+                break
+            self._pos += unit[0]
+            self._ms += unit[1]
+            self.total_ms += unit[1]
+            if self._ms >= self._target:
+                out.append(bytes(self._buf[: self._pos]))
+                del self._buf[: self._pos]
+                self._pos = 0
+                self._ms = 0.0
+                self._target = self._chunk_ms
+        return out
+
+    def flush(self) -> bytes:
+        """Return whatever is still buffered."""
+        data = bytes(self._buf)
+        self._buf.clear()
+        self._pos = 0
+        self._ms = 0.0
+        return data
+
+    async def stream(self, chunks: AsyncIterator[bytes]) -> AsyncIterator[bytes]:
+        """Yield ``chunks`` regrouped; ``total_ms`` is final once exhausted."""
+        try:
+            async for data in chunks:
+                for chunk in self.feed(data):
+                    yield chunk
+        finally:
+            aclose = getattr(chunks, "aclose", None)
+            if aclose is not None:
+                await aclose()
+        tail = self.flush()
+        if tail:
+            yield tail
+
+
+def duration_ms(data: bytes, audio_format: str) -> float:
+    """Return the playing time of a complete clip in milliseconds."""
+    # A target no clip reaches, so every unit is walked and none emitted
+    rechunker = Rechunker(audio_format, 1e12, 1e12)
+    rechunker.feed(data)
+    return rechunker.total_ms
+
+
+def _samples(data) -> array:
+    """Return little-endian 16-bit ``data`` as native signed integers."""
+    samples = array("h", data)
+    if sys.byteorder == "big":
+        samples.byteswap()
+    return samples
+
+
+def _find_loud(samples: array, reverse: bool = False) -> int | None:
+    """Return the index of the first (or last) sample above the threshold."""
+    count = len(samples)
+    if reverse:
+        starts = range((count - 1) // _SCAN_BLOCK * _SCAN_BLOCK, -1, -_SCAN_BLOCK)
+    else:
+        starts = range(0, count, _SCAN_BLOCK)
+    for start in starts:
+        block = samples[start : start + _SCAN_BLOCK]
+        if max(block) <= SILENCE_THRESHOLD and min(block) >= -SILENCE_THRESHOLD:
+            continue
+        indexes = range(len(block) - 1, -1, -1) if reverse else range(len(block))
+        for idx in indexes:
+            if abs(block[idx]) > SILENCE_THRESHOLD:
+                return start + idx
+    return None
+
+
+def _pcm_bounds(data, rate: int, channels: int) -> tuple[int, int] | None:
+    """Return the padded byte range of 16-bit ``data`` holding sound, or None."""
+    frame = channels * PCM_SAMPLE_WIDTH
+    usable = len(data) - len(data) % frame
+    samples = _samples(data[:usable])
+    first = _find_loud(samples)
+    if first is None:
+        return None
+    last = _find_loud(samples, reverse=True)
+    pad = int(rate * SILENCE_PAD_MS / 1000)
+    start = max(0, first // channels - pad) * frame
+    stop = min(usable // frame, last // channels + 1 + pad) * frame
+    return start, stop
+
+
+def _trim_wav(data: bytes) -> bytes:
+    info = wav_header_info(data)
+    if info is None:
+        return data
+    header, rate, channels, width = info
+    if width != PCM_SAMPLE_WIDTH:
+        return data
+    body = data[header:]
+    if header:
+        size = int.from_bytes(data[header - 4 : header], "little")
+        # Streamed headers carry a placeholder size; trust only real ones
+        if size < len(body):
+            body = body[:size]
+    bounds = _pcm_bounds(body, rate, channels)
+    if bounds is None:
+        return data
+    body = body[bounds[0] : bounds[1]]
+    if not header:
+        return body
+    head = bytearray(data[:header])
+    head[4:8] = (header + len(body) - 8).to_bytes(4, "little")
+    head[header - 4 : header] = len(body).to_bytes(4, "little")
+    return bytes(head) + body
+
+
+def _mp3_reservoir_start(frames: list, first: int) -> int:
+    """Return the first frame holding main data that frame ``first`` uses."""
+    need = frames[first][2]
+    idx = first
+    while need > 0 and idx > 0:
+        idx -= 1
+        need -= frames[idx][3]
+    return idx
+
+
+def _trim_mp3(data: bytes) -> bytes:
+    splitter = _Mp3Splitter()
+    # (start, end, main_data_begin, main_data_bytes, silent) per audio frame
+    frames = []
+    prefix = None
+    pos = 0
+    while (unit := splitter.unit(data, pos, 0)) is not None:
+        length, ms = unit
+        side = mp3_side_info(data, pos) if ms else None
+        if side is not None:
+            main_data_begin, main_data, silent = side
+            if not frames and _mp3_vbr_header(data, pos, main_data):
+                # Its frame count would be stale after trimming
+                prefix = pos
+            else:
+                end = pos + length
+                frames.append((pos, end, main_data_begin, end - main_data, silent))
+        pos += length
+    loud = [idx for idx, frame in enumerate(frames) if not frame[4]]
+    if not loud:
+        return data
+    first = min(
+        loud[0] - SILENCE_PAD_FRAMES, _mp3_reservoir_start(frames, loud[0])
+    )
+    first = max(0, first)
+    last = min(len(frames) - 1, loud[-1] + SILENCE_PAD_FRAMES)
+    if first == 0 and last == len(frames) - 1:
+        return data
+    head = data[: frames[0][0] if prefix is None else prefix]
+    return head + data[frames[first][0] : frames[last][1]] + data[frames[-1][1] :]
+
+
+def continuation(data: bytes, audio_format: str, first: bool) -> bytes:
+    """Return a complete clip ready to be appended to a concatenated stream.
+
+    The first WAV clip's sizes become placeholders because the stream's
+    length is unknown; later clips lose their WAV header or ID3 tag so the
+    decoder sees one continuous stream.
+    """
+    if audio_format == "wav":
+        info = wav_header_info(data)
+        if info is None or not info[0]:
+            return data
+        header = info[0]
+        if not first:
+            return data[header:]
+        head = bytearray(data[:header])
+        head[4:8] = head[header - 4 : header] = b"\xff\xff\xff\xff"
+        return bytes(head) + data[header:]
+    if audio_format == "mp3" and not first:
+        tag = id3_length(data, 0)
+        if tag is not None:
+            return data[tag:]
+    return data
+
+
+def trim_silence(data: bytes, audio_format: str) -> bytes:
+    """Return a complete clip without its leading and trailing silence.
+
+    PCM and WAV are cut to the sample, MP3 to the frame.  Other formats and
+    clips that are silent throughout are returned unchanged.
+    """
+    if audio_format == "pcm":
+        bounds = _pcm_bounds(data, PCM_SAMPLE_RATE, PCM_CHANNELS)
+        return data if bounds is None else data[bounds[0] : bounds[1]]
+    if audio_format == "wav":
+        return _trim_wav(data)
+    if audio_format == "mp3":
+        return _trim_mp3(data)
+    return data
+
+
+class LeadingSilenceTrimmer:
+    """Drop the silence a stream starts with before it is chunked.
+
+    Audio is held back only until the first sound arrives, then passed
+    through untouched; trailing silence can only be cut once a clip is
+    complete (see :func:`trim_silence`).  Streamed WAV headers keep their
+    placeholder sizes.
+    """
+
+    def __init__(self, audio_format: str) -> None:
+        self._format = audio_format
+        self._buf = bytearray()
+        self._done = audio_format not in TRIMMABLE_FORMATS
+        self._header_done = audio_format != "wav"
+        self._rate, self._channels = PCM_SAMPLE_RATE, PCM_CHANNELS
+        # PCM bytes already searched; MP3 walk position and held frames
+        self._scanned = 0
+        self._pos = 0
+        self._frames: list[tuple[int, int, int, int, bool]] = []
+        self._splitter = _Mp3Splitter()
+
+    def feed(self, data: bytes) -> bytes:
+        """Return the part of ``data`` that can be passed on now."""
+        if self._done:
+            return data
+        self._buf += data
+        out = b""
+        if not self._header_done:
+            info = wav_header_info(self._buf)
+            if info is None:
+                return b""
+            header, self._rate, self._channels, width = info
+            out = bytes(self._buf[:header])
+            del self._buf[:header]
+            self._header_done = True
+            if width != PCM_SAMPLE_WIDTH:
+                return out + self.flush()
+        if self._format == "mp3":
+            return out + self._feed_mp3()
+        return out + self._feed_pcm()
+
+    def _release(self, start: int) -> bytes:
+        data = bytes(self._buf[start:])
+        self._buf.clear()
+        self._done = True
+        return data
+
+    def _feed_pcm(self) -> bytes:
+        frame = self._channels * PCM_SAMPLE_WIDTH
+        usable = len(self._buf) - len(self._buf) % frame
+        loud = _find_loud(_samples(self._buf[self._scanned : usable]))
+        pad = int(self._rate * SILENCE_PAD_MS / 1000) * frame
+        if loud is not None:
+            start = self._scanned + loud // self._channels * frame
+            return self._release(max(0, start - pad))
+        # Keep only the padding in front of whatever comes next
+        drop = max(0, usable - pad)
+        del self._buf[:drop]
+        self._scanned = usable - drop
+        return b""
+
+    def _feed_mp3(self) -> bytes:
+        out = b""
+        while (unit := self._splitter.unit(self._buf, self._pos, 0)) is not None:
+            length, ms = unit
+            side = mp3_side_info(self._buf, self._pos) if ms else None
+            if side is None or (
+                not self._frames and _mp3_vbr_header(self._buf, self._pos, side[1])
+            ):
+                if not self._frames:
+                    # Tags and headers in front of the audio go out as is
+                    out += bytes(self._buf[: self._pos + length])
+                    del self._buf[: self._pos + length]
+                    self._pos = 0
+                    continue
+                side = (0, self._pos + length, True)
+            main_data_begin, main_data, silent = side
+            end = self._pos + length
+            self._frames.append(
+                (self._pos, end, main_data_begin, end - main_data, silent)
+            )
+            self._pos = end
+            if not silent:
+                idx = len(self._frames) - 1
+                first = min(
+                    idx - SILENCE_PAD_FRAMES,
+                    _mp3_reservoir_start(self._frames, idx),
+                )
+                return out + self._release(self._frames[max(0, first)][0])
+            self._drop_mp3_frames()
+        return out
+
+    def _drop_mp3_frames(self) -> None:
+        """Forget held frames that no later frame can still need."""
+        drop = 0
+        held = sum(frame[3] for frame in self._frames[1:])
+        while (
+            len(self._frames) - drop > SILENCE_PAD_FRAMES + 1
+            and held >= _MP3_MAX_RESERVOIR
+        ):
+            drop += 1
+            held -= self._frames[drop][3]
+        if not drop:
+            return
+        cut = self._frames[drop][0]
+        del self._buf[:cut]
+        self._pos -= cut
+        self._frames = [
+            (start - cut, end - cut, begin, size, silent)
+            for start, end, begin, size, silent in self._frames[drop:]
+        ]
+
+    def flush(self) -> bytes:
+        """Return what is still held, e.g. a clip that is silent throughout."""
+        return self._release(0)
+
+
+async def trim_leading_silence(
+    chunks: AsyncIterator[bytes], audio_format: str
+) -> AsyncIterator[bytes]:
+    """Yield ``chunks`` with the leading silence removed."""
+    trimmer = LeadingSilenceTrimmer(audio_format)
+    try:
+        async for data in chunks:
+            data = trimmer.feed(data)
+            if data:
+                yield data
+    finally:
+        aclose = getattr(chunks, "aclose", None)
+        if aclose is not None:
+            await aclose()
+    tail = trimmer.flush()
+    if tail:
+        yield tail
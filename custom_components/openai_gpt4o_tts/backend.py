@@ -0,0 +1,124 @@
+"""Shared second-level cache backends for rendered clips.
+
+The local segment store stays the first level.  A backend here sits behind
+it so several Home Assistant instances speaking the same phrases with the
+same settings render each one only once.
+
+The HTTP protocol is deliberately small so any key/value service can
+implement it:
+
+* ``GET {base}/{key}`` returns the audio with an ``X-Audio-Format`` header,
+  or 404 when the key is unknown.
+* ``PUT {base}/{key}`` stores the body under ``key``; the format is sent in
+  ``X-Audio-Format``.  Any 2xx status means stored.
+
+Keys are hashes of the synthesis parameters, never of the API key.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from abc import ABC, abstractmethod
+from collections.abc import Callable
+
+from aiohttp import ClientError, ClientSession, ClientTimeout
+
+_LOGGER = logging.getLogger(__name__)
+
+FORMAT_HEADER = "X-Audio-Format"
+# Lookups sit in front of every synthesis, so a shared cache that does not
+# answer within 250 ms is treated as a miss; a hit may take a second to send
+LOOKUP_TIMEOUT = ClientTimeout(total=1, connect=0.25, sock_read=0.25)
+# Uploads run in the background and may take longer
+UPLOAD_TIMEOUT = ClientTimeout(total=2)
+# Uploads waiting for the backend; more are dropped rather than queued
+WRITE_BEHIND_LIMIT = 32
+
+
+class CacheBackend(ABC):
+    """Asynchronous key/value store for ``(format, audio)`` clips."""
+
+    @abstractmethod
+    async def async_get(self, key: str) -> tuple[str, bytes] | None:
+        """Return the clip stored under ``key``, or None."""
+
+    @abstractmethod
+    async def async_put(self, key: str, audio_format: str, data: bytes) -> None:
+        """Store a clip under ``key``."""
+
+    async def async_close(self) -> None:
+        """Release any resources held by the backend."""
+
+
+class HttpCacheBackend(CacheBackend):
+    """Backend speaking the GET/PUT protocol described above."""
+
+    def __init__(self, base_url: str, get_session: Callable[[], ClientSession]):
+        self._base_url = base_url.rstrip("/")
+        self._get_session = get_session
+
+    async def async_get(self, key: str) -> tuple[str, bytes] | None:
+        try:
+            async with self._get_session().get(
+                f"{self._base_url}/{key}", timeout=LOOKUP_TIMEOUT
+            ) as resp:
+                if resp.status != 200 or FORMAT_HEADER not in resp.headers:
+                    return None
+                return resp.headers[FORMAT_HEADER], await resp.read()
+        except (ClientError, asyncio.TimeoutError) as err:
+            _LOGGER.debug("Shared GPT-4o TTS cache lookup failed: %s", err)
+            return None
+
+    async def async_put(self, key: str, audio_format: str, data: bytes) -> None:
+        async with self._get_session().put(
+            f"{self._base_url}/{key}",
+            data=data,
+            headers={FORMAT_HEADER: audio_format},
+            timeout=UPLOAD_TIMEOUT,
+        ) as resp:
+            resp.raise_for_status()
+
+
+class WriteBehind:
+    """Upload clips to a backend in the background, one at a time.
+
+    Playback never waits for the shared cache.  When the backend falls
+    behind, new uploads are dropped; another instance will render and
+    share the clip later.
+    """
+
+    def __init__(self, backend: CacheBackend, limit: int = WRITE_BEHIND_LIMIT):
+        self._backend = backend
+        self._queue: asyncio.Queue[tuple[str, str, bytes]] = asyncio.Queue(limit)
+        self._worker: asyncio.Task | None = None
+        self.dropped = 0
+
+    def enqueue(self, key: str, audio_format: str, data: bytes) -> None:
+        """Schedule an upload; returns immediately."""
+        try:
+            self._queue.put_nowait((key, audio_format, data))
+        except asyncio.QueueFull:
+            self.dropped += 1
+            return
+        if self._worker is None or self._worker.done():
+            self._worker = asyncio.get_running_loop().create_task(self._run())
+
+    async def _run(self) -> None:
+        while not self._queue.empty():
+            key, audio_format, data = self._queue.get_nowait()
+            try:
+                await self._backend.async_put(key, audio_format, data)
+            except (ClientError, asyncio.TimeoutError) as err:
+                _LOGGER.debug("Shared GPT-4o TTS cache upload failed: %s", err)
+            finally:
+                self._queue.task_done()
+
+    async def async_flush(self, timeout: float) -> None:
+        """Wait up to ``timeout`` seconds for pending uploads, then stop."""
+        if self._worker is None:
+            return
+        try:
+            await asyncio.wait_for(asyncio.shield(self._worker), timeout)
+        except asyncio.TimeoutError:
+            self._worker.cancel()
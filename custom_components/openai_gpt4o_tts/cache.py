@@ -0,0 +1,565 @@
+"""Packed append-only segment store for cached TTS audio.
+
+Clips are appended to a small number of large segment files instead of one
+file per clip, which keeps write amplification and inode usage low on
+SD-card backed installs.  The index has two parts:
+
+* ``index.bin`` - an immutable table of fixed-width records sorted by key
+  digest.  It is memory mapped and binary searched, so opening it costs the
+  same for ten entries as for a hundred thousand.
+* ``journal.bin`` - an append-only log of puts and deletes made since the
+  table was written.  It is replayed into a dict on open and folded back into
+  the table whenever the store is compacted.
+
+Reads are served from ``mmap`` views of the segments and never copy the
+audio until the consumer does.  All methods are blocking and must run in the
+executor.
+"""
+
+import logging
+import mmap
+import os
+import struct
+import threading
+from collections.abc import Iterator
+from typing import BinaryIO, NamedTuple
+
+_LOGGER = logging.getLogger(__name__)
+
+INDEX_FILE = "index.bin"
+JOURNAL_FILE = "journal.bin"
+SEGMENT_SUFFIX = ".seg"
+
+# Seal a segment and start a new one once it grows past this size
+DEFAULT_SEGMENT_SIZE = 16 * 1024 * 1024
+# Smaller caches use smaller segments: only sealed segments can be evicted
+MIN_SEGMENTS = 8
+MIN_SEGMENT_SIZE = 64 * 1024
+# Rewrite a sealed segment once this fraction of it belongs to dead clips
+DEFAULT_COMPACT_RATIO = 0.5
+# ...but never bother for less than this many dead bytes
+COMPACT_MIN_DEAD_BYTES = 1024 * 1024
+# Fold the journal into the sorted table once it holds this many records
+JOURNAL_LIMIT = 4096
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+# Size of the memoryview slices yielded by ``iter_chunks``
+READ_CHUNK_SIZE = 32 * 1024
+
+_INDEX_MAGIC = b"G4TTSIDX"
+_INDEX_VERSION = 1
+# magic, version, record count, next segment id, segment table length
+_HEADER = struct.Struct("<8sIIII")
+# segment id, live bytes
+_SEGMENT = struct.Struct("<IQ")
+# digest, segment, offset, length, flags, format, duration
+_RECORD = struct.Struct("<16sIIIB8sf")
+_FLAG_TOMBSTONE = 0x01
+
+# (segment, offset, length, format, duration)
+_Entry = tuple[int, int, int, str, float]
+
+
+class CachedClip(NamedTuple):
+    """Audio returned from the store; ``data`` is a view into the segment."""
+
+    audio_format: str
+    data: memoryview
+    duration: float
+
+
+class ClipFile(NamedTuple):
+    """An open segment file and where a clip lives in it."""
+
+    file: BinaryIO
+    offset: int
+    length: int
+    audio_format: str
+    etag: str
+
+
+def iter_chunks(data: memoryview, size: int = READ_CHUNK_SIZE) -> Iterator[memoryview]:
+    """Yield zero-copy slices of ``data``."""
+    for start in range(0, len(data), size):
+        yield data[start : start + size]
+
+
+def segment_size_for(max_bytes: int) -> int:
+    """Return a segment size that lets eviction hold ``max_bytes``."""
+    return max(MIN_SEGMENT_SIZE, min(DEFAULT_SEGMENT_SIZE, max_bytes // MIN_SEGMENTS))
+
+
+def _decode(record: tuple) -> _Entry:
+    _digest, seg, off, length, _flags, fmt, dur = record
+    return seg, off, length, fmt.rstrip(b"\0").decode(), dur
+
+
+class SegmentStore:
+    """Append-only packed clip store with a binary index."""
+
+    def __init__(
+        self,
+        path: str,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        segment_size: int = DEFAULT_SEGMENT_SIZE,
+        compact_ratio: float = DEFAULT_COMPACT_RATIO,
+    ) -> None:
+        self.path = path
+        self.max_bytes = max_bytes
+        self.segment_size = segment_size
+        self.compact_ratio = compact_ratio
+
+        self._lock = threading.RLock()
+        self._base: mmap.mmap | None = None
+        self._base_start = 0
+        self._base_count = 0
+        # digest -> entry, or None for a delete newer than the sorted table
+        self._journal: dict[bytes, _Entry | None] = {}
+        self._journal_file = None
+        # Records journaled while a compaction is copying data
+        self._pending: list[tuple[bytes, _Entry | None]] | None = None
+        self._segment_sizes: dict[int, int] = {}
+        self._segment_live: dict[int, int] = {}
+        self._maps: dict[int, mmap.mmap] = {}
+        self._retired: list[mmap.mmap] = []
+        self._active = 0
+        self._seg_file = None
+        self._compacting = False
+
+        os.makedirs(path, exist_ok=True)
+        self._load()
+
+    # -- persistence -----------------------------------------------------
+
+    def _file(self, name: str) -> str:
+        return os.path.join(self.path, name)
+
+    def _segment_path(self, segment: int) -> str:
+        return self._file(f"{segment:08d}{SEGMENT_SUFFIX}")
+
+    def _load(self) -> None:
+        """Map the sorted table, replay the journal and stat the segments."""
+        next_segment = 0
+        try:
+            with open(self._file(INDEX_FILE), "rb") as fobj:
+                base = mmap.mmap(fobj.fileno(), 0, access=mmap.ACCESS_READ)
+        except (FileNotFoundError, ValueError):
+            base = None
+        if base is not None:
+            magic, version, count, next_segment, nseg = (
+                _HEADER.unpack_from(base)
+                if len(base) >= _HEADER.size
+                else (b"", 0, 0, 0, 0)
+            )
+            if magic != _INDEX_MAGIC or version != _INDEX_VERSION:
+                _LOGGER.warning("Discarding incompatible TTS cache index in %s", self.path)
+                base.close()
+                next_segment = 0
+            else:
+                self._base = base
+                self._base_count = count
+                self._base_start = _HEADER.size + nseg * _SEGMENT.size
+                for seg, live in _SEGMENT.iter_unpack(
+                    base[_HEADER.size : self._base_start]
+                ):
+                    self._segment_live[seg] = live
+
+        for name in os.listdir(self.path):
+            if name.endswith(SEGMENT_SUFFIX):
+                try:
+                    seg = int(name[: -len(SEGMENT_SUFFIX)])
+                except ValueError:
+                    continue
+                self._segment_sizes[seg] = os.path.getsize(self._file(name))
+
+        try:
+            with open(self._file(JOURNAL_FILE), "rb") as fobj:
+                journal = fobj.read()
+        except FileNotFoundError:
+            journal = b""
+        # A torn final record from a crash is ignored
+        usable = len(journal) - len(journal) % _RECORD.size
+        for record in _RECORD.iter_unpack(journal[:usable]):
+            entry = None if record[4] & _FLAG_TOMBSTONE else _decode(record)
+            self._apply(record[0], entry)
+            if entry is not None:
+                next_segment = max(next_segment, entry[0])
+
+        for seg in list(self._segment_live):
+            if seg not in self._segment_sizes:
+                del self._segment_live[seg]
+
+        # Segment ids are never reused so stale entries cannot resurrect
+        self._active = max([next_segment, *self._segment_sizes])
+        if self._segment_sizes.get(self._active, 0) >= self.segment_size:
+            self._active += 1
+        self._segment_sizes.setdefault(self._active, 0)
+        self._journal_file = open(self._file(JOURNAL_FILE), "ab")
+
+    def _base_lookup(self, digest: bytes) -> _Entry | None:
+        """Binary search the sorted table for ``digest``."""
+        base, start, size = self._base, self._base_start, _RECORD.size
+        lo, hi = 0, self._base_count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            pos = start + mid * size
+            probe = base[pos : pos + 16]
+            if probe < digest:
+                lo = mid + 1
+            elif probe > digest:
+                hi = mid
+            else:
+                return _decode(_RECORD.unpack_from(base, pos))
+        return None
+
+    def _lookup(self, digest: bytes) -> _Entry | None:
+        if digest in self._journal:
+            return self._journal[digest]
+        if self._base is None:
+            return None
+        return self._base_lookup(digest)
+
+    def _apply(self, digest: bytes, entry: _Entry | None) -> None:
+        """Record ``entry`` for ``digest`` in memory and fix live counters."""
+        old = self._lookup(digest)
+        if old is not None and old[0] in self._segment_live:
+            self._segment_live[old[0]] -= old[2]
+        if entry is not None:
+            self._segment_live[entry[0]] = self._segment_live.get(entry[0], 0) + entry[2]
+        self._journal[digest] = entry
+
+    def _journal_write(self, digest: bytes, entry: _Entry | None) -> None:
+        self._apply(digest, entry)
+        if self._pending is not None:
+            self._pending.append((digest, entry))
+        if entry is None:
+            record = _RECORD.pack(digest, 0, 0, 0, _FLAG_TOMBSTONE, b"", 0.0)
+        else:
+            seg, off, length, fmt, dur = entry
+            record = _RECORD.pack(digest, seg, off, length, 0, fmt.encode(), dur)
+        self._journal_file.write(record)
+        self._journal_file.flush()
+
+    def _rotate(self) -> None:
+        """Seal the active segment and start writing a new one."""
+        if self._seg_file is not None:
+            self._seg_file.close()
+            self._seg_file = None
+        self._active += 1
+        self._segment_sizes[self._active] = 0
+
+    def _map(self, segment: int, end: int) -> mmap.mmap:
+        """Return a read-only map of ``segment`` covering at least ``end``."""
+        mapped = self._maps.get(segment)
+        if mapped is not None and len(mapped) >= end:
+            return mapped
+        if mapped is not None:
+            # The active segment grew; keep the old map alive for readers
+            self._retired.append(mapped)
+            self._release_retired()
+        with open(self._segment_path(segment), "rb") as fobj:
+            mapped = mmap.mmap(fobj.fileno(), 0, access=mmap.ACCESS_READ)
+        self._maps[segment] = mapped
+        return mapped
+
+    def _drop_segment(self, segment: int) -> None:
+        """Forget ``segment`` and delete its file; its entries become misses."""
+        self._segment_sizes.pop(segment, None)
+        self._segment_live.pop(segment, None)
+        mapped = self._maps.pop(segment, None)
+        if mapped is not None:
+            self._retired.append(mapped)
+        try:
+            os.remove(self._segment_path(segment))
+        except FileNotFoundError:
+            pass
+
+    def _release_retired(self) -> None:
+        """Close retired maps that no reader still references."""
+        still_used = []
+        for mapped in self._retired:
+            try:
+                mapped.close()
+            except BufferError:
+                still_used.append(mapped)
+        self._retired = still_used
+
+    @staticmethod
+    def _merge(base, start: int, count: int, journal: dict) -> dict[bytes, _Entry]:
+        """Merge a sorted table and a journal into ``digest -> entry``."""
+        merged = {}
+        if base is not None:
+            merged = {
+                record[0]: _decode(record)
+                for record in _RECORD.iter_unpack(
+                    base[start : start + count * _RECORD.size]
+                )
+            }
+        for digest, entry in journal.items():
+            if entry is None:
+                merged.pop(digest, None)
+            else:
+                merged[digest] = entry
+        return merged
+
+    # -- public API ------------------------------------------------------
+
+    def __contains__(self, key: str) -> bool:
+        with self._lock:
+            entry = self._lookup(bytes.fromhex(key))
+            return entry is not None and entry[0] in self._segment_sizes
+
+    def __len__(self) -> int:
+        return len(self.keys())
+
+    @property
+    def live_bytes(self) -> int:
+        """Return the number of bytes held by live clips."""
+        with self._lock:
+            return sum(self._segment_live.values())
+
+    @property
+    def dead_ratio(self) -> float:
+        """Return the fraction of segment bytes that belong to dead clips."""
+        with self._lock:
+            total = sum(self._segment_sizes.values())
+            if not total:
+                return 0.0
+            return 1.0 - self.live_bytes / total
+
+    @property
+    def needs_compaction(self) -> bool:
+        """Return True when dead bytes or the journal warrant a compaction."""
+        with self._lock:
+            if self._compacting:
+                return False
+            if len(self._journal) >= JOURNAL_LIMIT:
+                return True
+            dead = sum(self._segment_sizes.values()) - self.live_bytes
+            return (
+                dead >= COMPACT_MIN_DEAD_BYTES
+                and self.dead_ratio > self.compact_ratio
+            )
+
+    def keys(self) -> list[str]:
+        """Return every cached key; this scans the whole index."""
+        with self._lock:
+            merged = self._merge(
+                self._base, self._base_start, self._base_count, self._journal
+            )
+            return [
+                digest.hex()
+                for digest, entry in merged.items()
+                if entry[0] in self._segment_sizes
+            ]
+
+    def get(self, key: str) -> CachedClip | None:
+        """Return the cached clip for ``key`` or None."""
+        with self._lock:
+            entry = self._lookup(bytes.fromhex(key))
+            if entry is None:
+                return None
+            seg, off, length, fmt, dur = entry
+            # Missing segments were evicted; short ones were torn by a crash
+            if off + length > self._segment_sizes.get(seg, -1):
+                return None
+            if not length:
+                return CachedClip(fmt, memoryview(b""), dur)
+            mapped = self._map(seg, off + length)
+        return CachedClip(fmt, memoryview(mapped)[off : off + length], dur)
+
+    def open_clip(self, key: str) -> ClipFile | None:
+        """Open the segment holding ``key`` for ``sendfile``-style serving.
+
+        The caller owns the returned file.  It stays readable even if the
+        segment is evicted or compacted away while it is being served.
+        """
+        with self._lock:
+            entry = self._lookup(bytes.fromhex(key))
+            if entry is None:
+                return None
+            seg, off, length, fmt, _dur = entry
+            if off + length > self._segment_sizes.get(seg, -1):
+                return None
+            fobj = open(self._segment_path(seg), "rb")
+        # Locations are never reused, so they identify the exact bytes
+        return ClipFile(fobj, off, length, fmt, f"{key}-{seg:x}-{off:x}")
+
+    def put(self, key: str, audio_format: str, data: bytes, duration: float = 0.0) -> None:
+        """Append ``data`` to the active segment and index it under ``key``."""
+        digest = bytes.fromhex(key)
+        with self._lock:
+            if self._segment_sizes[self._active] >= self.segment_size:
+                self._rotate()
+            if self._seg_file is None:
+                self._seg_file = open(self._segment_path(self._active), "ab")
+            offset = self._segment_sizes[self._active]
+            self._seg_file.write(data)
+            self._seg_file.flush()
+            self._segment_sizes[self._active] = offset + len(data)
+            self._journal_write(
+                digest, (self._active, offset, len(data), audio_format, float(duration))
+            )
+            self._evict()
+
+    def delete(self, key: str) -> bool:
+        """Drop ``key`` from the index; its bytes become dead."""
+        digest = bytes.fromhex(key)
+        with self._lock:
+            if self._lookup(digest) is None:
+                return False
+            self._journal_write(digest, None)
+            return True
+
+    def _evict(self) -> None:
+        """Drop the oldest sealed segments until under ``max_bytes``."""
+        while sum(self._segment_sizes.values()) > self.max_bytes:
+            sealed = [seg for seg in self._segment_sizes if seg < self._active]
+            if not sealed or self._compacting:
+                return
+            self._drop_segment(min(sealed))
+
+    def compact(self) -> None:
+        """Rewrite mostly-dead sealed segments and fold in the journal.
+
+        The bulk copy runs without holding the lock: segments below the
+        compaction target are sealed and immutable, and changes made while
+        copying are journaled again on top of the new table.
+        """
+        with self._lock:
+            if self._compacting:
+                return
+            self._compacting = True
+            self._pending = []
+            base, start, count = self._base, self._base_start, self._base_count
+            journal = dict(self._journal)
+            victims = {
+                seg
+                for seg, size in self._segment_sizes.items()
+                if size - self._segment_live.get(seg, 0) > size * self.compact_ratio
+            }
+            target = None
+            if victims:
+                # Live clips are copied into ``target``; new puts go to the
+                # segment after it so everything below ``target`` is frozen
+                target = self._active + 1
+                self._rotate()
+                self._rotate()
+
+        try:
+            merged = self._merge(base, start, count, journal)
+            offset = 0
+            if target is not None:
+                offset = self._copy_live(merged, victims, target)
+
+            with self._lock:
+                pending, self._pending = self._pending, None
+                for digest, entry in pending:
+                    if entry is None:
+                        merged.pop(digest, None)
+                    else:
+                        merged[digest] = entry
+                if offset:
+                    self._segment_sizes[target] = offset
+                elif target is not None:
+                    # Every victim was dead; leave no empty segment behind
+                    self._drop_segment(target)
+                for seg in victims:
+                    self._drop_segment(seg)
+                self._write_table(
+                    {
+                        digest: entry
+                        for digest, entry in merged.items()
+                        if entry[0] in self._segment_sizes
+                    }
+                )
+                self._journal = {}
+                self._journal_file.close()
+                self._journal_file = open(self._file(JOURNAL_FILE), "wb")
+                # Changes made during the copy are already in the new table;
+                # journal them again only so a crash cannot lose them
+                for digest, entry in pending:
+                    self._journal_write(digest, entry)
+                self._release_retired()
+        finally:
+            self._pending = None
+            self._compacting = False
+
+    def _copy_live(
+        self, merged: dict[bytes, _Entry], victims: set[int], target: int
+    ) -> int:
+        """Copy the live clips of ``victims`` into ``target``; return its size.
+
+        Runs without the lock; ``merged`` is updated to the new locations.
+        """
+        offset = 0
+        with open(self._segment_path(target), "wb") as out:
+            for digest, (seg, off, length, fmt, dur) in merged.items():
+                if seg not in victims:
+                    continue
+                with self._lock:
+                    if off + length > self._segment_sizes.get(seg, -1):
+                        continue
+                    view = self._map(seg, off + length)
+                out.write(view[off : off + length])
+                merged[digest] = (target, offset, length, fmt, dur)
+                offset += length
+            out.flush()
+            os.fsync(out.fileno())
+        return offset
+
+    def _write_table(self, merged: dict[bytes, _Entry]) -> None:
+        """Atomically replace the sorted table and remap it."""
+        live: dict[int, int] = dict.fromkeys(self._segment_sizes, 0)
+        for seg, _off, length, _fmt, _dur in merged.values():
+            live[seg] += length
+        tmp_path = self._file(INDEX_FILE + ".tmp")
+        with open(tmp_path, "wb") as fobj:
+            fobj.write(
+                _HEADER.pack(
+                    _INDEX_MAGIC, _INDEX_VERSION, len(merged), self._active, len(live)
+                )
+            )
+            fobj.write(b"".join(_SEGMENT.pack(seg, size) for seg, size in live.items()))
+            fobj.write(
+                b"".join(
+                    _RECORD.pack(digest, seg, off, length, 0, fmt.encode(), dur)
+                    for digest, (seg, off, length, fmt, dur) in sorted(merged.items())
+                )
+            )
+            fobj.flush()
+            os.fsync(fobj.fileno())
+        os.replace(tmp_path, self._file(INDEX_FILE))
+
+        if self._base is not None:
+            self._retired.append(self._base)
+        self._base = None
+        self._base_count = 0
+        with open(self._file(INDEX_FILE), "rb") as fobj:
+            self._base = mmap.mmap(fobj.fileno(), 0, access=mmap.ACCESS_READ)
+        self._base_count = len(merged)
+        self._base_start = _HEADER.size + len(live) * _SEGMENT.size
+        self._segment_live = live
+
+    def flush(self) -> None:
+        """Flush pending writes to disk."""
+        with self._lock:
+            for fobj in (self._seg_file, self._journal_file):
+                if fobj is not None:
+                    fobj.flush()
+                    os.fsync(fobj.fileno())
+
+    def close(self) -> None:
+        """Flush and release all file handles and maps."""
+        with self._lock:
+            self.flush()
+            for fobj in (self._seg_file, self._journal_file):
+                if fobj is not None:
+                    fobj.close()
+            self._seg_file = None
+            self._journal_file = None
+            self._retired.extend(self._maps.values())
+            self._maps.clear()
+            if self._base is not None:
+                self._retired.append(self._base)
+                self._base = None
+            self._release_retired()
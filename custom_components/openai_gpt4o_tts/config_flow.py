@@ -22,6 +22,7 @@ from .const import (
     OPENAI_TTS_MODELS,
     OPENAI_AUDIO_FORMATS,
     OPENAI_STREAM_FORMATS,
+    AUTO,
     CONF_PLAYBACK_SPEED,
     DEFAULT_PLAYBACK_SPEED,
     CONF_MODEL,
@@ -30,6 +31,40 @@ from .const import (
     DEFAULT_MODEL,
     DEFAULT_AUDIO_OUTPUT,
     DEFAULT_STREAM_FORMAT,
+    CONF_CACHE,
+    CONF_CACHE_SIZE,
+    DEFAULT_CACHE,
+    DEFAULT_CACHE_SIZE,
+    CONF_CACHE_WARM,
+    DEFAULT_CACHE_WARM,
+    CONF_READ_AHEAD_HIGH,
+    CONF_READ_AHEAD_LOW,
+    DEFAULT_READ_AHEAD_HIGH,
+    DEFAULT_READ_AHEAD_LOW,
+    CONF_PREWARM,
+    CONF_SHARED_CACHE_URL,
+    CONF_DAILY_CHAR_BUDGET,
+    CONF_LATENCY_SLO,
+    CONF_TRIM_SILENCE,
+    CONF_RECORD_TRACE,
+    CONF_DRAIN_TIMEOUT,
+    CONF_WYOMING_HOST,
+    CONF_WYOMING_PORT,
+    CONF_ENDPOINTS,
+    CONF_EARCON_AFTER,
+    CONF_EARCON_TEXT,
+    DEFAULT_PREWARM,
+    DEFAULT_SHARED_CACHE_URL,
+    DEFAULT_DAILY_CHAR_BUDGET,
+    DEFAULT_LATENCY_SLO,
+    DEFAULT_TRIM_SILENCE,
+    DEFAULT_RECORD_TRACE,
+    DEFAULT_DRAIN_TIMEOUT,
+    DEFAULT_WYOMING_HOST,
+    DEFAULT_WYOMING_PORT,
+    DEFAULT_ENDPOINTS,
+    DEFAULT_EARCON_AFTER,
+    DEFAULT_EARCON_TEXT,
 )
 
 _LOGGER = logging.getLogger(__name__)
@@ -80,6 +115,53 @@ class OpenAIGPT4oConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                 CONF_PLAYBACK_SPEED: float(
                     user_input.get(CONF_PLAYBACK_SPEED, DEFAULT_PLAYBACK_SPEED)
                 ),
+                CONF_CACHE: user_input.get(CONF_CACHE, DEFAULT_CACHE),
+                CONF_CACHE_SIZE: int(
+                    user_input.get(CONF_CACHE_SIZE, DEFAULT_CACHE_SIZE)
+                ),
+                CONF_CACHE_WARM: int(
+                    user_input.get(CONF_CACHE_WARM, DEFAULT_CACHE_WARM)
+                ),
+                CONF_READ_AHEAD_HIGH: int(
+                    user_input.get(CONF_READ_AHEAD_HIGH, DEFAULT_READ_AHEAD_HIGH)
+                ),
+                CONF_READ_AHEAD_LOW: int(
+                    user_input.get(CONF_READ_AHEAD_LOW, DEFAULT_READ_AHEAD_LOW)
+                ),
+                CONF_PREWARM: user_input.get(CONF_PREWARM, DEFAULT_PREWARM),
+                CONF_SHARED_CACHE_URL: user_input.get(
+                    CONF_SHARED_CACHE_URL, DEFAULT_SHARED_CACHE_URL
+                ).strip(),
+                CONF_DAILY_CHAR_BUDGET: int(
+                    user_input.get(CONF_DAILY_CHAR_BUDGET, DEFAULT_DAILY_CHAR_BUDGET)
+                ),
+                CONF_LATENCY_SLO: int(
+                    user_input.get(CONF_LATENCY_SLO, DEFAULT_LATENCY_SLO)
+                ),
+                CONF_TRIM_SILENCE: user_input.get(
+                    CONF_TRIM_SILENCE, DEFAULT_TRIM_SILENCE
+                ),
+                CONF_RECORD_TRACE: user_input.get(
+                    CONF_RECORD_TRACE, DEFAULT_RECORD_TRACE
+                ),
+                CONF_DRAIN_TIMEOUT: int(
+                    user_input.get(CONF_DRAIN_TIMEOUT, DEFAULT_DRAIN_TIMEOUT)
+                ),
+                CONF_WYOMING_PORT: int(
+                    user_input.get(CONF_WYOMING_PORT, DEFAULT_WYOMING_PORT)
+                ),
+                CONF_WYOMING_HOST: user_input.get(
+                    CONF_WYOMING_HOST, DEFAULT_WYOMING_HOST
+                ).strip(),
+                CONF_ENDPOINTS: user_input.get(
+                    CONF_ENDPOINTS, DEFAULT_ENDPOINTS
+                ).strip(),
+                CONF_EARCON_AFTER: int(
+                    user_input.get(CONF_EARCON_AFTER, DEFAULT_EARCON_AFTER)
+                ),
+                CONF_EARCON_TEXT: user_input.get(
+                    CONF_EARCON_TEXT, DEFAULT_EARCON_TEXT
+                ),
                 "affect_personality": affect,
                 "tone": tone,
                 "pronunciation": pron,
@@ -106,14 +188,53 @@ class OpenAIGPT4oConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                     OPENAI_TTS_MODELS
                 ),
                 vol.Optional(CONF_AUDIO_OUTPUT, default=DEFAULT_AUDIO_OUTPUT): vol.In(
-                    OPENAI_AUDIO_FORMATS
+                    [*OPENAI_AUDIO_FORMATS, AUTO]
                 ),
                 vol.Optional(CONF_STREAM_FORMAT, default=DEFAULT_STREAM_FORMAT): vol.In(
-                    OPENAI_STREAM_FORMATS
+                    [*OPENAI_STREAM_FORMATS, AUTO]
                 ),
                 vol.Optional(
                     CONF_PLAYBACK_SPEED, default=DEFAULT_PLAYBACK_SPEED
                 ): vol.All(vol.Coerce(float), vol.Range(min=0.25, max=4.0)),
+                vol.Optional(CONF_CACHE, default=DEFAULT_CACHE): bool,
+                vol.Optional(CONF_CACHE_SIZE, default=DEFAULT_CACHE_SIZE): vol.All(
+                    vol.Coerce(int), vol.Range(min=1, max=4096)
+                ),
+                vol.Optional(CONF_CACHE_WARM, default=DEFAULT_CACHE_WARM): vol.All(
+                    vol.Coerce(int), vol.Range(min=0, max=200)
+                ),
+                vol.Optional(
+                    CONF_READ_AHEAD_HIGH, default=DEFAULT_READ_AHEAD_HIGH
+                ): vol.All(vol.Coerce(int), vol.Range(min=16, max=16384)),
+                vol.Optional(
+                    CONF_READ_AHEAD_LOW, default=DEFAULT_READ_AHEAD_LOW
+                ): vol.All(vol.Coerce(int), vol.Range(min=0, max=16384)),
+                vol.Optional(CONF_PREWARM, default=DEFAULT_PREWARM): bool,
+                vol.Optional(
+                    CONF_SHARED_CACHE_URL, default=DEFAULT_SHARED_CACHE_URL
+                ): str,
+                vol.Optional(
+                    CONF_DAILY_CHAR_BUDGET, default=DEFAULT_DAILY_CHAR_BUDGET
+                ): vol.All(vol.Coerce(int), vol.Range(min=0, max=10_000_000)),
+                vol.Optional(
+                    CONF_LATENCY_SLO, default=DEFAULT_LATENCY_SLO
+                ): vol.All(vol.Coerce(int), vol.Range(min=0, max=60000)),
+                vol.Optional(CONF_TRIM_SILENCE, default=DEFAULT_TRIM_SILENCE): bool,
+                vol.Optional(CONF_RECORD_TRACE, default=DEFAULT_RECORD_TRACE): bool,
+                vol.Optional(
+                    CONF_DRAIN_TIMEOUT, default=DEFAULT_DRAIN_TIMEOUT
+                ): vol.All(vol.Coerce(int), vol.Range(min=0, max=120)),
+                vol.Optional(
+                    CONF_WYOMING_PORT, default=DEFAULT_WYOMING_PORT
+                ): vol.All(vol.Coerce(int), vol.Range(min=0, max=65535)),
+                vol.Optional(CONF_WYOMING_HOST, default=DEFAULT_WYOMING_HOST): str,
+                vol.Optional(CONF_ENDPOINTS, default=DEFAULT_ENDPOINTS): str,
+                vol.Optional(
+                    CONF_EARCON_AFTER, default=DEFAULT_EARCON_AFTER
+                ): vol.All(vol.Coerce(int), vol.Range(min=0, max=5000)),
+                vol.Optional(CONF_EARCON_TEXT, default=DEFAULT_EARCON_TEXT): vol.All(
+                    str, vol.Length(min=1, max=200)
+                ),
                 vol.Optional("affect_personality", default=DEFAULT_AFFECT): vol.All(
                     str, vol.Length(min=5, max=500)
                 ),
@@ -170,15 +291,85 @@ class OpenAIGPT4oOptionsFlowHandler(config_entries.OptionsFlow):
                 vol.Optional(
                     CONF_AUDIO_OUTPUT,
                     default=existing.get(CONF_AUDIO_OUTPUT, DEFAULT_AUDIO_OUTPUT),
-                ): vol.In(OPENAI_AUDIO_FORMATS),
+                ): vol.In([*OPENAI_AUDIO_FORMATS, AUTO]),
                 vol.Optional(
                     CONF_STREAM_FORMAT,
                     default=existing.get(CONF_STREAM_FORMAT, DEFAULT_STREAM_FORMAT),
-                ): vol.In(OPENAI_STREAM_FORMATS),
+                ): vol.In([*OPENAI_STREAM_FORMATS, AUTO]),
                 vol.Optional(
                     CONF_PLAYBACK_SPEED,
                     default=existing.get(CONF_PLAYBACK_SPEED, DEFAULT_PLAYBACK_SPEED),
                 ): vol.All(vol.Coerce(float), vol.Range(min=0.25, max=4.0)),
+                vol.Optional(
+                    CONF_CACHE, default=existing.get(CONF_CACHE, DEFAULT_CACHE)
+                ): bool,
+                vol.Optional(
+                    CONF_CACHE_SIZE,
+                    default=existing.get(CONF_CACHE_SIZE, DEFAULT_CACHE_SIZE),
+                ): vol.All(vol.Coerce(int), vol.Range(min=1, max=4096)),
+                vol.Optional(
+                    CONF_CACHE_WARM,
+                    default=existing.get(CONF_CACHE_WARM, DEFAULT_CACHE_WARM),
+                ): vol.All(vol.Coerce(int), vol.Range(min=0, max=200)),
+                vol.Optional(
+                    CONF_READ_AHEAD_HIGH,
+                    default=existing.get(CONF_READ_AHEAD_HIGH, DEFAULT_READ_AHEAD_HIGH),
+                ): vol.All(vol.Coerce(int), vol.Range(min=16, max=16384)),
+                vol.Optional(
+                    CONF_READ_AHEAD_LOW,
+                    default=existing.get(CONF_READ_AHEAD_LOW, DEFAULT_READ_AHEAD_LOW),
+                ): vol.All(vol.Coerce(int), vol.Range(min=0, max=16384)),
+                vol.Optional(
+                    CONF_PREWARM, default=existing.get(CONF_PREWARM, DEFAULT_PREWARM)
+                ): bool,
+                vol.Optional(
+                    CONF_SHARED_CACHE_URL,
+                    default=existing.get(
+                        CONF_SHARED_CACHE_URL, DEFAULT_SHARED_CACHE_URL
+                    ),
+                ): str,
+                vol.Optional(
+                    CONF_DAILY_CHAR_BUDGET,
+                    default=existing.get(
+                        CONF_DAILY_CHAR_BUDGET, DEFAULT_DAILY_CHAR_BUDGET
+                    ),
+                ): vol.All(vol.Coerce(int), vol.Range(min=0, max=10_000_000)),
+                vol.Optional(
+                    CONF_LATENCY_SLO,
+                    default=existing.get(CONF_LATENCY_SLO, DEFAULT_LATENCY_SLO),
+                ): vol.All(vol.Coerce(int), vol.Range(min=0, max=60000)),
+                vol.Optional(
+                    CONF_TRIM_SILENCE,
+                    default=existing.get(CONF_TRIM_SILENCE, DEFAULT_TRIM_SILENCE),
+                ): bool,
+                vol.Optional(
+                    CONF_RECORD_TRACE,
+                    default=existing.get(CONF_RECORD_TRACE, DEFAULT_RECORD_TRACE),
+                ): bool,
+                vol.Optional(
+                    CONF_DRAIN_TIMEOUT,
+                    default=existing.get(CONF_DRAIN_TIMEOUT, DEFAULT_DRAIN_TIMEOUT),
+                ): vol.All(vol.Coerce(int), vol.Range(min=0, max=120)),
+                vol.Optional(
+                    CONF_WYOMING_PORT,
+                    default=existing.get(CONF_WYOMING_PORT, DEFAULT_WYOMING_PORT),
+                ): vol.All(vol.Coerce(int), vol.Range(min=0, max=65535)),
+                vol.Optional(
+                    CONF_WYOMING_HOST,
+                    default=existing.get(CONF_WYOMING_HOST, DEFAULT_WYOMING_HOST),
+                ): str,
+                vol.Optional(
+                    CONF_ENDPOINTS,
+                    default=existing.get(CONF_ENDPOINTS, DEFAULT_ENDPOINTS),
+                ): str,
+                vol.Optional(
+                    CONF_EARCON_AFTER,
+                    default=existing.get(CONF_EARCON_AFTER, DEFAULT_EARCON_AFTER),
+                ): vol.All(vol.Coerce(int), vol.Range(min=0, max=5000)),
+                vol.Optional(
+                    CONF_EARCON_TEXT,
+                    default=existing.get(CONF_EARCON_TEXT, DEFAULT_EARCON_TEXT),
+                ): vol.All(str, vol.Length(min=1, max=200)),
                 vol.Optional(
                     "affect_personality",
                     default=existing.get("affect_personality", DEFAULT_AFFECT),
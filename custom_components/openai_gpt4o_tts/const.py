@@ -1,7 +1,9 @@
 """Constants for OpenAI GPT-4o Mini TTS integration."""
 
+from datetime import timedelta
+
 DOMAIN = "openai_gpt4o_tts"
-PLATFORMS = ["tts"]
+PLATFORMS = ["tts", "sensor"]
 
 # Configuration keys
 CONF_API_KEY = "api_key"
@@ -12,6 +14,25 @@ CONF_PLAYBACK_SPEED = "playback_speed"
 CONF_MODEL = "model"
 CONF_AUDIO_OUTPUT = "audio_output"
 CONF_STREAM_FORMAT = "stream_format"
+CONF_CACHE = "cache_audio"
+CONF_CACHE_SIZE = "cache_size_mb"
+CONF_CACHE_WARM = "cache_warm_count"
+CONF_FIRST_CHUNK_MS = "first_chunk_ms"
+CONF_CHUNK_MS = "chunk_ms"
+CONF_READ_AHEAD_HIGH = "read_ahead_high_kb"
+CONF_READ_AHEAD_LOW = "read_ahead_low_kb"
+CONF_PREWARM = "prewarm_connection"
+CONF_SHARED_CACHE_URL = "shared_cache_url"
+CONF_DAILY_CHAR_BUDGET = "daily_character_budget"
+CONF_LATENCY_SLO = "latency_slo_ms"
+CONF_TRIM_SILENCE = "trim_silence"
+CONF_RECORD_TRACE = "record_trace"
+CONF_DRAIN_TIMEOUT = "drain_timeout"
+CONF_WYOMING_PORT = "wyoming_port"
+CONF_WYOMING_HOST = "wyoming_host"
+CONF_ENDPOINTS = "endpoints"
+CONF_EARCON_AFTER = "earcon_after_ms"
+CONF_EARCON_TEXT = "earcon_text"
 
 # Default settings
 DEFAULT_VOICE = "sage"
@@ -20,6 +41,65 @@ DEFAULT_PLAYBACK_SPEED = 1.0
 DEFAULT_MODEL = "gpt-4o-mini-tts"
 DEFAULT_AUDIO_OUTPUT = "mp3"
 DEFAULT_STREAM_FORMAT = "audio"
+DEFAULT_CACHE = False
+DEFAULT_CACHE_SIZE = 256
+DEFAULT_CACHE_WARM = 20
+DEFAULT_READ_AHEAD_HIGH = 512
+DEFAULT_READ_AHEAD_LOW = 128
+DEFAULT_PREWARM = False
+DEFAULT_SHARED_CACHE_URL = ""
+DEFAULT_DAILY_CHAR_BUDGET = 0
+DEFAULT_LATENCY_SLO = 0
+DEFAULT_TRIM_SILENCE = True
+DEFAULT_RECORD_TRACE = False
+# Seconds in-flight requests get to finish on unload or shutdown
+DEFAULT_DRAIN_TIMEOUT = 10
+# 0 disables the Wyoming server; 10200 is Wyoming's usual TTS port
+DEFAULT_WYOMING_PORT = 0
+# Wyoming has no authentication; empty listens on Home Assistant's LAN
+# address only, "0.0.0.0" on every interface
+DEFAULT_WYOMING_HOST = ""
+# Empty uses OpenAI's own endpoint
+DEFAULT_ENDPOINTS = ""
+# 0 never plays an acknowledgement before slow speech
+DEFAULT_EARCON_AFTER = 0
+DEFAULT_EARCON_TEXT = "One moment."
+
+# How often hot phrases are decayed and missing ones re-rendered
+CACHE_WARM_INTERVAL = timedelta(minutes=30)
+# Phrases must have been requested at least this often (after decay)
+CACHE_WARM_MIN_COUNT = 2.0
+
+# Streamed audio is regrouped into whole frames/pages/samples per format:
+# (first chunk ms, steady chunk ms).  A small first chunk starts playback
+# quickly; larger later chunks keep per-chunk overhead down.
+CHUNK_PROFILES = {
+    "mp3": (100, 500),
+    "opus": (60, 400),
+    "aac": (100, 500),
+    "flac": (100, 500),
+    "wav": (40, 200),
+    "pcm": (40, 200),
+}
+
+# hass.data key for usage trackers; they outlive reloads of their entry
+DATA_USAGE = f"{DOMAIN}_usage"
+# hass.data key for announcement queues, keyed by entry
+DATA_QUEUES = f"{DOMAIN}_queues"
+# hass.data key for acknowledgement maskers, keyed by entry
+DATA_EARCONS = f"{DOMAIN}_earcons"
+# hass.data flag set once the clip view is registered
+DATA_VIEW = f"{DOMAIN}_view"
+# hass.data key for the profile session currently running, if any
+DATA_PROFILE = f"{DOMAIN}_profile"
+
+# Fired with the duration of every clip handed to a player
+EVENT_CLIP = f"{DOMAIN}_clip"
+# Fired with the report path when a profile run ends
+EVENT_PROFILE = f"{DOMAIN}_profile"
+
+# Directory (under .storage) holding the packed audio cache
+CACHE_DIR = f"{DOMAIN}_cache"
 
 # Default multi-field instruction settings
 DEFAULT_AFFECT = (
@@ -51,6 +131,17 @@ OPENAI_TTS_VOICES = [
 OPENAI_TTS_MODELS = ["tts-1", "tts-1-hd", "gpt-4o-mini-tts"]
 OPENAI_AUDIO_FORMATS = ["mp3", "opus", "aac", "flac", "wav", "pcm"]
 OPENAI_STREAM_FORMATS = ["audio", "sse"]
+# Let the client pick the format or stream mode with the lowest latency
+AUTO = "auto"
+# Option Home Assistant sets when it will convert audio for the player
+ATTR_PREFERRED_FORMAT = "preferred_format"
+# Per-call option exempting an announcement from budget downgrades
+ATTR_PRIORITY = "priority"
+# Option carrying the id of a queued batch of announcements to stream
+ATTR_BATCH = "queue_batch"
+
+SERVICE_ENQUEUE = "enqueue"
+SERVICE_PROFILE = "profile"
 
 # Full Whisper‑level language support (ISO‑639‑1 codes)
 SUPPORTED_LANGUAGES = [
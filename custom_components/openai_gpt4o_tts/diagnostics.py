@@ -0,0 +1,24 @@
+"""Diagnostics support for OpenAI GPT-4o Mini TTS."""
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+
+from .const import CONF_API_KEY, CONF_ENDPOINTS, CONF_SHARED_CACHE_URL, DOMAIN
+
+# Endpoints may carry their own API keys, and cache URLs credentials
+TO_REDACT = {CONF_API_KEY, CONF_ENDPOINTS, CONF_SHARED_CACHE_URL}
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> dict:
+    """Return diagnostics for a config entry."""
+    client = hass.data.get(DOMAIN, {}).get(entry.entry_id)
+    return {
+        "data": async_redact_data(dict(entry.data), TO_REDACT),
+        "options": async_redact_data(dict(entry.options), TO_REDACT),
+        "metrics": client.metrics.as_dict() if client is not None else None,
+        "format_selection": client.selector.as_dict() if client is not None else None,
+        "endpoints": client.router.as_dict() if client is not None else None,
+    }
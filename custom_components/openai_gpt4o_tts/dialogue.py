@@ -0,0 +1,120 @@
+"""Multi-voice dialogue scripts rendered in parallel and played in order."""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import re
+from collections.abc import AsyncIterator
+from dataclasses import dataclass
+
+from .announce import CONCAT_FALLBACK_FORMAT, CONCAT_FORMATS
+from .audio import continuation
+from .const import CONF_AUDIO_OUTPUT, CONF_INSTRUCTIONS, CONF_VOICE, OPENAI_TTS_VOICES
+from .gpt4o import GPT4oClient
+
+# Lines rendered at once besides the one playing; the rest wait their turn
+DIALOGUE_CONCURRENCY = 4
+
+# "voice (instructions): text", the instructions being optional
+_LINE = re.compile(
+    r"^\s*(?P<voice>[A-Za-z]+)\s*(?:\((?P<instructions>[^)]*)\))?\s*:\s*(?P<text>\S.*)$"
+)
+
+
+@dataclass(frozen=True, slots=True)
+class DialogueLine:
+    """One line of a script, spoken by ``voice``."""
+
+    voice: str
+    instructions: str | None
+    text: str
+
+
+def parse_dialogue(message: str) -> list[DialogueLine] | None:
+    """Return the lines of a dialogue script, or None for ordinary text.
+
+    A script has at least two lines, each ``voice (instructions): text``
+    with a known voice, e.g. ``nova (bright and upbeat): Good morning!``.
+    """
+    lines = []
+    for raw in message.splitlines():
+        if not raw.strip():
+            continue
+        match = _LINE.match(raw)
+        if match is None or match["voice"].lower() not in OPENAI_TTS_VOICES:
+            return None
+        instructions = (match["instructions"] or "").strip() or None
+        lines.append(
+            DialogueLine(match["voice"].lower(), instructions, match["text"].strip())
+        )
+    return lines if len(lines) >= 2 else None
+
+
+def line_options(line: DialogueLine, options: dict, audio_format: str) -> dict:
+    """Return the per-call options that speak ``line``."""
+    merged = {**options, CONF_VOICE: line.voice, CONF_AUDIO_OUTPUT: audio_format}
+    if line.instructions is not None:
+        merged[CONF_INSTRUCTIONS] = line.instructions
+    return merged
+
+
+class Dialogue:
+    """Script lines synthesized concurrently and streamed back to back.
+
+    The first line is streamed as it is generated so playback starts right
+    away; later lines are rendered in the meantime as complete (cached,
+    trimmed) clips and appended sample-exactly once their turn comes.
+    """
+
+    def __init__(
+        self, client: GPT4oClient, lines: list[DialogueLine], options: dict
+    ) -> None:
+        self._client = client
+        requested = options.get(CONF_AUDIO_OUTPUT, client.audio_output)
+        self.audio_format = (
+            requested if requested in CONCAT_FORMATS else CONCAT_FALLBACK_FORMAT
+        )
+        self._lines = [
+            (line.text, line_options(line, options, self.audio_format))
+            for line in lines
+        ]
+        self._slots = asyncio.Semaphore(DIALOGUE_CONCURRENCY)
+        self._tasks: list[asyncio.Task] = []
+
+    async def _render(self, text: str, options: dict):
+        async with self._slots:
+            return await self._client.get_tts_audio(text, options)
+
+    async def stream(self) -> AsyncIterator[bytes]:
+        """Yield the whole dialogue in script order.
+
+        Later lines start rendering here, so a dialogue that is never
+        streamed costs nothing.
+        """
+        first = True
+        self._tasks = [
+            asyncio.create_task(self._render(text, line_opts))
+            for text, line_opts in self._lines[1:]
+        ]
+        try:
+            text, options = self._lines[0]
+            audio_format, chunks = await self._client.stream_tts_audio(text, options)
+            if chunks is not None:
+                async with contextlib.aclosing(chunks):
+                    async for chunk in chunks:
+                        yield continuation(chunk, audio_format, True) if first else chunk
+                        first = False
+            for task in self._tasks:
+                audio_format, data = await task
+                if not data:
+                    continue
+                yield continuation(data, audio_format, first)
+                first = False
+        finally:
+            self.cancel()
+
+    def cancel(self) -> None:
+        """Stop rendering lines nobody will hear."""
+        for task in self._tasks:
+            task.cancel()
@@ -0,0 +1,113 @@
+"""Mask slow starts with a short cached acknowledgement."""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import logging
+from collections.abc import AsyncIterator, Callable, Coroutine
+
+from .announce import CONCAT_FORMATS
+from .audio import continuation
+from .const import (
+    CONF_AUDIO_OUTPUT,
+    CONF_INSTRUCTIONS,
+    CONF_MODEL,
+    CONF_PLAYBACK_SPEED,
+    CONF_STREAM_FORMAT,
+    CONF_VOICE,
+)
+from .gpt4o import GPT4oClient
+
+_LOGGER = logging.getLogger(__name__)
+
+# Options that change how the acknowledgement sounds
+EARCON_OPTION_KEYS = (CONF_VOICE, CONF_MODEL, CONF_INSTRUCTIONS, CONF_PLAYBACK_SPEED)
+
+
+class EarconMasker:
+    """Play a pre-rendered acknowledgement when speech is slow to start.
+
+    Acknowledgements are rendered once per voice and format, through the
+    client and its cache, and kept in memory so they start instantly.  One
+    that is not ready yet is rendered in the background for next time.
+    """
+
+    def __init__(
+        self,
+        client: GPT4oClient,
+        text: str,
+        threshold_ms: float,
+        create_task: Callable[[Coroutine], asyncio.Task],
+    ) -> None:
+        self._client = client
+        self._text = text
+        self._threshold = threshold_ms / 1000
+        self._create_task = create_task
+        self._earcons: dict[str, bytes] = {}
+        self._rendering: set[str] = set()
+
+    def _options(self, options: dict | None, audio_format: str) -> dict:
+        earcon_options = {
+            key: value
+            for key, value in (options or {}).items()
+            if key in EARCON_OPTION_KEYS
+        }
+        # A fixed transport keeps "auto" selection out of the lookup
+        earcon_options[CONF_AUDIO_OUTPUT] = audio_format
+        earcon_options[CONF_STREAM_FORMAT] = "audio"
+        return earcon_options
+
+    def prepare(self, options: dict | None, audio_format: str) -> bytes | None:
+        """Return the acknowledgement for ``options``, rendering it if missing."""
+        if audio_format not in CONCAT_FORMATS:
+            return None
+        earcon_options = self._options(options, audio_format)
+        key = self._client.build_request(self._text, earcon_options).key
+        earcon = self._earcons.get(key)
+        if earcon is None and key not in self._rendering:
+            self._rendering.add(key)
+            self._create_task(self._async_render(key, earcon_options))
+        return earcon
+
+    async def _async_render(self, key: str, options: dict) -> None:
+        try:
+            # Not played now, so no clip event or ledger entry for it
+            audio_format, data = await self._client.get_tts_audio(
+                self._text, options, report=False
+            )
+        finally:
+            self._rendering.discard(key)
+        if data and audio_format == options[CONF_AUDIO_OUTPUT]:
+            self._earcons[key] = data
+        else:
+            _LOGGER.debug("Could not render the GPT-4o TTS acknowledgement")
+
+    async def mask(
+        self, chunks: AsyncIterator[bytes], audio_format: str, options: dict | None
+    ) -> AsyncIterator[bytes]:
+        """Yield ``chunks``, led by the acknowledgement if they are late."""
+        earcon = self.prepare(options, audio_format)
+        first = asyncio.ensure_future(anext(chunks))
+        try:
+            late = False
+            if earcon is not None:
+                await asyncio.wait((first,), timeout=self._threshold)
+                late = not first.done()
+            if late:
+                self._client.metrics.masked_requests += 1
+                yield continuation(earcon, audio_format, True)
+            try:
+                chunk = await first
+            except StopAsyncIteration:
+                return
+            # After the acknowledgement, the speech continues its stream
+            yield continuation(chunk, audio_format, False) if late else chunk
+            async for chunk in chunks:
+                yield chunk
+        finally:
+            if not first.done():
+                first.cancel()
+                with contextlib.suppress(asyncio.CancelledError, StopAsyncIteration):
+                    await first
+            await chunks.aclose()
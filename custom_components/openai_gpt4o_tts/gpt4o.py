@@ -3,32 +3,82 @@
 import asyncio
 import base64
 import binascii
+import contextlib
 import json
 import logging
 import re
-from aiohttp import ClientError, ClientResponse, ClientSession, ClientTimeout
+from collections.abc import Callable
+
+from aiohttp import (
+    ClientConnectionError,
+    ClientError,
+    ClientResponse,
+    ClientSession,
+    ClientTimeout,
+)
 
 from .const import (
+    ATTR_PREFERRED_FORMAT,
+    AUTO,
+    OPENAI_STREAM_FORMATS,
     CONF_INSTRUCTIONS,
     CONF_PLAYBACK_SPEED,
     CONF_VOICE,
     CONF_MODEL,
     CONF_AUDIO_OUTPUT,
     CONF_STREAM_FORMAT,
+    CONF_SHARED_CACHE_URL,
+    CONF_DAILY_CHAR_BUDGET,
+    CONF_LATENCY_SLO,
+    CONF_TRIM_SILENCE,
+    CONF_DRAIN_TIMEOUT,
+    CONF_ENDPOINTS,
+    DEFAULT_DAILY_CHAR_BUDGET,
+    DEFAULT_DRAIN_TIMEOUT,
+    DEFAULT_LATENCY_SLO,
+    DEFAULT_TRIM_SILENCE,
+    CONF_READ_AHEAD_HIGH,
+    CONF_READ_AHEAD_LOW,
+    DEFAULT_READ_AHEAD_HIGH,
+    DEFAULT_READ_AHEAD_LOW,
     DEFAULT_PLAYBACK_SPEED,
-    DEFAULT_VOICE,
     DEFAULT_MODEL,
     DEFAULT_AUDIO_OUTPUT,
     DEFAULT_STREAM_FORMAT,
 )
+from .audio import Rechunker, duration_ms, trim_leading_silence, trim_silence
+from .backend import CacheBackend, HttpCacheBackend, WriteBehind
+from .cache import CachedClip, SegmentStore, iter_chunks, segment_size_for
+from .ledger import BudgetPolicy, UsageLedger
+from .metrics import ClientMetrics, RequestTiming
+from .request import SynthesisRequest
+from .routing import CLIENT_ERRORS, EndpointRouter, parse_endpoints
+from .selection import (
+    AUTO_FALLBACK_FORMAT,
+    AUTO_FORMATS,
+    RAW_ONLY_MODELS,
+    FormatSelector,
+)
+from .stream import StreamTee
 
 _LOGGER = logging.getLogger(__name__)
 
 # Request timeout for the OpenAI API in seconds
 REQUEST_TIMEOUT = 30
 
-# API endpoint for speech generation
+# API endpoint for speech generation, used unless others are configured
 OPENAI_TTS_ENDPOINT = "https://api.openai.com/v1/audio/speech"
+# Endpoints tried for one request when the ones before fail without audio
+FAILOVER_ATTEMPTS = 2
+
+# aiohttp closes idle pooled connections after this many seconds
+KEEPALIVE_SECONDS = 15
+# Pending shared-cache uploads get this long to finish on unload
+SHARED_FLUSH_TIMEOUT = 5
+# Skip pre-connecting when the pool was used more recently than this
+PREWARM_MIN_INTERVAL = 5
+# Requests aborted after the drain timeout get this long to unwind
+ABORT_TIMEOUT = 2
 
 # Regex to detect API keys so they can be masked in logs. Keys may include
 # prefixes like ``sk-proj-`` or ``sk-svcacct-`` so we allow hyphens in the
@@ -55,9 +105,19 @@ async def _log_api_error(resp: ClientResponse) -> None:
 class GPT4oClient:
     """Handles direct calls to OpenAI's /v1/audio/speech for GPT-4o TTS."""
 
-    def __init__(self, hass, entry):
+    def __init__(
+        self,
+        hass,
+        entry,
+        cache: SegmentStore | None = None,
+        shared: CacheBackend | None = None,
+        ledger: UsageLedger | None = None,
+    ):
         self.hass = hass
         self.entry = entry
+        self.cache = cache
+        self._cache_opening: asyncio.Future | None = None
+        self._compaction = None
 
         # Always set your API key
         self._api_key = entry.data["api_key"]
@@ -83,6 +143,184 @@ class GPT4oClient:
         self._stream_format = opts.get(
             CONF_STREAM_FORMAT, entry.data.get(CONF_STREAM_FORMAT, DEFAULT_STREAM_FORMAT)
         )
+        self._defaults = {
+            CONF_MODEL: self._model,
+            CONF_VOICE: self._voice,
+            CONF_INSTRUCTIONS: self._instructions,
+            CONF_AUDIO_OUTPUT: self._audio_output,
+            CONF_PLAYBACK_SPEED: self._playback_speed,
+            CONF_STREAM_FORMAT: self._stream_format,
+        }
+        self._read_ahead_high = 1024 * int(
+            opts.get(CONF_READ_AHEAD_HIGH, DEFAULT_READ_AHEAD_HIGH)
+        )
+        self._read_ahead_low = 1024 * int(
+            opts.get(CONF_READ_AHEAD_LOW, DEFAULT_READ_AHEAD_LOW)
+        )
+        self.metrics = ClientMetrics()
+        shared_url = opts.get(CONF_SHARED_CACHE_URL)
+        if shared is None and shared_url:
+            shared = HttpCacheBackend(shared_url, self._get_session)
+        self.shared = shared
+        self._write_behind = WriteBehind(shared) if shared is not None else None
+        self.ledger = ledger
+        self.policy = None
+        if ledger is not None:
+            self.policy = BudgetPolicy(
+                ledger,
+                int(opts.get(CONF_DAILY_CHAR_BUDGET, DEFAULT_DAILY_CHAR_BUDGET)),
+                int(opts.get(CONF_LATENCY_SLO, DEFAULT_LATENCY_SLO)),
+            )
+        self.selector = FormatSelector()
+        self.router = EndpointRouter(
+            parse_endpoints(opts.get(CONF_ENDPOINTS), OPENAI_TTS_ENDPOINT)
+        )
+        self._trim_silence = opts.get(CONF_TRIM_SILENCE, DEFAULT_TRIM_SILENCE)
+        self._clip_listeners: list[Callable[[SynthesisRequest, float, bool], None]] = []
+        self._request_observers: list[
+            Callable[[SynthesisRequest, RequestTiming], None]
+        ] = []
+        self._drain_timeout = float(
+            opts.get(CONF_DRAIN_TIMEOUT, DEFAULT_DRAIN_TIMEOUT)
+        )
+        # Requests in flight; closing waits for them up to the drain timeout
+        self._inflight = 0
+        self._drained = asyncio.Event()
+        self._drained.set()
+        self._closing = False
+        self._aborting = False
+        self._closed: asyncio.Task | None = None
+        self._responses: set[ClientResponse] = set()
+        # Streams in progress by request key, followed by readers of the same
+        self._tees: dict[str, StreamTee] = {}
+        self._session: ClientSession | None = None
+        # Loop time until which a pooled connection is probably still open
+        self._warm_until = 0.0
+        self._last_activity = 0.0
+
+    def _get_session(self) -> ClientSession:
+        """Return the pooled HTTP session, creating it on first use."""
+        if self._aborting or self._closed is not None and self._closed.done():
+            raise ClientConnectionError("GPT-4o TTS client is closed")
+        if self._session is None or self._session.closed:
+            self._session = ClientSession(timeout=ClientTimeout(total=REQUEST_TIMEOUT))
+        return self._session
+
+    async def async_prewarm(self) -> None:
+        """Open or refresh a pooled connection to the speech endpoint.
+
+        Called while the Assist pipeline is still running speech-to-text so
+        the TTS request that follows skips DNS, TCP and TLS setup.
+        """
+        loop = asyncio.get_running_loop()
+        if self._closing or loop.time() - self._last_activity < PREWARM_MIN_INTERVAL:
+            return
+        self._last_activity = loop.time()
+        endpoints = self.router.rank(self._model, self._voice)
+        if not endpoints:
+            return
+        try:
+            # Any response will do; the point is the pooled connection
+            async with self._get_session().head(endpoints[0].url) as resp:
+                await resp.read()
+        except (ClientError, asyncio.TimeoutError) as err:
+            _LOGGER.debug("GPT-4o TTS pre-connect failed: %s", err)
+            return
+        self._warm_until = loop.time() + KEEPALIVE_SECONDS
+        self.metrics.prewarms += 1
+
+    def async_add_clip_listener(
+        self, listener: Callable[[SynthesisRequest, float, bool], None]
+    ) -> Callable[[], None]:
+        """Call ``listener(request, seconds, cached)`` for every clip served.
+
+        Returns an unsubscriber.  Streamed clips are reported once they have
+        been received completely.
+        """
+        self._clip_listeners.append(listener)
+        return lambda: self._clip_listeners.remove(listener)
+
+    def _clip_ready(
+        self, request: SynthesisRequest, seconds: float, cached: bool
+    ) -> None:
+        for listener in list(self._clip_listeners):
+            listener(request, seconds, cached)
+
+    def async_add_request_observer(
+        self, observer: Callable[[SynthesisRequest, RequestTiming], None]
+    ) -> Callable[[], None]:
+        """Call ``observer(request, timing)`` once each get or stream is done.
+
+        Returns an unsubscriber.  Requests are only timed while an observer
+        is set, so the hot path pays nothing otherwise.
+        """
+        self._request_observers.append(observer)
+        return lambda: self._request_observers.remove(observer)
+
+    def _observe(self, request: SynthesisRequest, timing: RequestTiming) -> None:
+        for observer in list(self._request_observers):
+            observer(request, timing)
+
+    def _begin(self) -> bool:
+        """Count a new request as in flight; False once closing."""
+        if self._closing:
+            _LOGGER.debug("GPT-4o TTS is unloading; refusing new request")
+            return False
+        self._inflight += 1
+        self._drained.clear()
+        return True
+
+    def _end(self) -> None:
+        self._inflight -= 1
+        if not self._inflight:
+            self._drained.set()
+
+    async def _iter_in_flight(self, chunks):
+        """Pass ``chunks`` through, counting the stream until it is done.
+
+        Counted from the first read, so a stream closed unstarted, which
+        never runs this body, is never counted either.
+        """
+        if not self._begin():
+            await chunks.aclose()
+            return
+        try:
+            async with contextlib.aclosing(chunks):
+                async for chunk in chunks:
+                    if self._aborting:
+                        # Past the drain deadline; the player keeps what it has
+                        return
+                    yield chunk
+        finally:
+            self._end()
+
+    async def _iter_observed(
+        self, request: SynthesisRequest, chunks, started: float
+    ):
+        """Pass ``chunks`` through and report their timing when done."""
+        loop = asyncio.get_running_loop()
+        first_audio_ms = None
+        size = 0
+        outcome = "cancelled"
+        try:
+            async with contextlib.aclosing(chunks):
+                async for chunk in chunks:
+                    if first_audio_ms is None:
+                        first_audio_ms = (loop.time() - started) * 1000
+                    size += len(chunk)
+                    yield chunk
+            outcome = "ok" if size else "error"
+        finally:
+            self._observe(
+                request,
+                RequestTiming(
+                    "stream",
+                    first_audio_ms,
+                    (loop.time() - started) * 1000,
+                    size,
+                    outcome,
+                ),
+            )
 
     @property
     def stream_format(self) -> str:
@@ -132,57 +370,464 @@ class GPT4oClient:
         """Return the default audio output format."""
         return self._audio_output
 
-    async def iter_tts_audio(self, text: str, options: dict | None = None):
-        """Asynchronously yield audio chunks from the API."""
-        if options is None:
-            options = {}
-
-        voice = options.get("voice", self._voice) or DEFAULT_VOICE
-        instructions = options.get("instructions", self._instructions) or ""
-        audio_format = options.get("audio_output", self._audio_output)
-        model = options.get(CONF_MODEL, self._model)
-        stream_format = options.get(CONF_STREAM_FORMAT, self._stream_format)
-
-        headers = {
-            "Authorization": f"Bearer {self._api_key}",
-            "Content-Type": "application/json",
-        }
-        payload = {
-            "model": model,
-            "voice": voice,
-            "input": text,
-            "instructions": instructions,
-            "response_format": audio_format,
-            "speed": float(options.get(CONF_PLAYBACK_SPEED, self._playback_speed)),
-            "stream_format": stream_format,
-        }
+    def build_request(self, text: str, options: dict | None = None) -> SynthesisRequest:
+        """Resolve per-call options against the entry defaults."""
+        options = options or {}
+        auto = self._auto_candidates(options)
+        if auto is not None:
+            formats, modes, preferred = auto
+            audio_format, stream_mode = self.selector.choose(formats, modes, preferred)
+            options = {
+                **options,
+                CONF_AUDIO_OUTPUT: audio_format,
+                CONF_STREAM_FORMAT: stream_mode,
+            }
+        return SynthesisRequest.resolve(text, options, self._defaults)
+
+    def _auto_candidates(
+        self, options: dict
+    ) -> tuple[tuple[str, ...], tuple[str, ...], str | None] | None:
+        """Return the formats, modes and preferred format "auto" picks from."""
+        audio_format = options.get(CONF_AUDIO_OUTPUT, self._audio_output)
+        stream_mode = options.get(CONF_STREAM_FORMAT, self._stream_format)
+        if AUTO not in (audio_format, stream_mode):
+            return None
+        preferred = options.get(ATTR_PREFERRED_FORMAT)
+        if audio_format != AUTO:
+            formats = (audio_format,)
+        elif preferred is not None:
+            # Home Assistant converts to the preferred format if needed
+            formats = AUTO_FORMATS
+        else:
+            formats = (AUTO_FALLBACK_FORMAT,)
+        if stream_mode != AUTO:
+            modes = (stream_mode,)
+        elif options.get(CONF_MODEL, self._model) in RAW_ONLY_MODELS:
+            modes = ("audio",)
+        else:
+            modes = tuple(OPENAI_STREAM_FORMATS)
+        return formats, modes, preferred
+
+    async def _async_build_request(
+        self, text: str, options: dict | None
+    ) -> SynthesisRequest:
+        """Build a request, letting "auto" reuse audio rendered in any format.
+
+        Audio cached or streaming right now in one of the candidate formats
+        is used as is, so a phrase is not rendered once per format.
+        """
+        options = options or {}
+        auto = self._auto_candidates(options)
+        if auto is not None and len(auto[0]) > 1:
+            formats, modes, preferred = auto
+            formats = tuple(sorted(formats, key=lambda fmt: fmt != preferred))
+            keys = [
+                SynthesisRequest.resolve(
+                    text, {**options, CONF_AUDIO_OUTPUT: fmt}, self._defaults
+                ).key
+                for fmt in formats
+            ]
+            key = next((key for key in keys if key in self._tees), None)
+            if key is None:
+                key = await self.async_cached_key(keys)
+            if key is not None:
+                # Served without a request, so the mode makes no difference
+                options = {
+                    **options,
+                    CONF_AUDIO_OUTPUT: formats[keys.index(key)],
+                    CONF_STREAM_FORMAT: modes[0],
+                }
+        return self.build_request(text, options)
 
-        timeout = ClientTimeout(total=REQUEST_TIMEOUT)
-        async with ClientSession(timeout=timeout) as session:
-            async with session.post(
-                OPENAI_TTS_ENDPOINT,
-                headers=headers,
-                json=payload,
-            ) as resp:
-                if resp.status >= 400:
+    async def async_cached_key(self, keys: list[str]) -> str | None:
+        """Return the first of ``keys`` in the local cache, or None.
+
+        Checked in the executor: the store's lock may be held there by a
+        write or a compaction.
+        """
+        if self.cache is None:
+            return None
+        cache = self.cache
+        return await self.hass.async_add_executor_job(
+            lambda: next((key for key in keys if key in cache), None)
+        )
+
+    @contextlib.asynccontextmanager
+    async def _async_post(self, request: SynthesisRequest):
+        """Send ``request`` to the best endpoint, failing over to the next.
+
+        Yields the endpoint, its open response and when it was sent, or None
+        when no endpoint accepted the request.
+        """
+        endpoints = self.router.route(request.model, request.voice)
+        if not endpoints:
+            _LOGGER.error(
+                "No GPT-4o TTS endpoint serves model %s with voice %s",
+                request.model,
+                request.voice,
+            )
+            yield None
+            return
+        session = self._get_session()
+        loop = asyncio.get_running_loop()
+        attempts = endpoints[:FAILOVER_ATTEMPTS]
+        answered = False
+        for endpoint in attempts:
+            headers = {"Content-Type": "application/json"}
+            if api_key := endpoint.authorization(self._api_key):
+                headers["Authorization"] = f"Bearer {api_key}"
+            sent = loop.time()
+            try:
+                async with session.post(
+                    endpoint.url, headers=headers, data=request.body
+                ) as resp:
+                    if resp.status < 400:
+                        answered = True
+                        yield endpoint, resp, sent
+                        return
                     await _log_api_error(resp)
-                    return
-                if stream_format == "sse":
-                    async for chunk in self._iter_sse_audio(resp):
+            except (ClientError, asyncio.TimeoutError) as err:
+                # Errors while reading audio belong to the caller
+                if answered or self._aborting:
+                    raise
+                self.router.record_failure(endpoint)
+                if endpoint is attempts[-1]:
+                    raise
+                _LOGGER.warning(
+                    "GPT-4o TTS endpoint %s failed, trying the next: %s",
+                    endpoint.url,
+                    err,
+                )
+                continue
+            if resp.status in CLIENT_ERRORS:
+                # Any endpoint would refuse it
+                break
+            self.router.record_failure(endpoint)
+        yield None
+
+    async def iter_tts_audio(self, request: SynthesisRequest):
+        """Asynchronously yield audio chunks from the API."""
+        loop = asyncio.get_running_loop()
+        started = self._last_activity = loop.time()
+        warm = started < self._warm_until
+        async with self._async_post(request) as posted:
+            if posted is None:
+                return
+            endpoint, resp, sent = posted
+            if request.stream_format == "sse":
+                source = self._iter_sse_audio(resp)
+            else:
+                source = resp.content.iter_chunked(8192)
+            if self._trim_silence:
+                source = trim_leading_silence(source, request.response_format)
+            rechunker = Rechunker(
+                request.response_format, request.first_chunk_ms, request.chunk_ms
+            )
+            received = 0
+            ttfb_ms = 0.0
+            # Closed on unload past the drain deadline, waking the read
+            self._responses.add(resp)
+            try:
+                async with contextlib.aclosing(rechunker.stream(source)) as chunks:
+                    async for chunk in chunks:
+                        if not received:
+                            now = loop.time()
+                            ttfb_ms = (now - started) * 1000
+                            # tts-1 fallbacks are faster than what was asked for
+                            self.router.record_success(
+                                endpoint,
+                                None if request.downgraded else (now - sent) * 1000,
+                            )
+                            self.metrics.record_ttfb(ttfb_ms, warm)
+                            if self.policy is not None:
+                                self.policy.observe(request.model, ttfb_ms)
+                        received += len(chunk)
                         yield chunk
-                else:
-                    async for chunk in resp.content.iter_chunked(8192):
-                        if chunk:
-                            yield chunk
+            except (GeneratorExit, asyncio.CancelledError):
+                # Drop the half-read connection rather than draining it
+                resp.close()
+                self.metrics.cancelled_streams += 1
+                self.metrics.cancelled_bytes += received
+                raise
+            except (ClientError, asyncio.TimeoutError):
+                if not received:
+                    self.router.record_failure(endpoint)
+                raise
+            finally:
+                self._responses.discard(resp)
+                # OpenAI bills the input whether or not it was listened to
+                if self.ledger is not None:
+                    self.ledger.record(request, rechunker.total_ms / 1000)
+            self._warm_until = loop.time() + KEEPALIVE_SECONDS
+            if received and not request.downgraded:
+                self.selector.record(
+                    request.response_format,
+                    request.stream_format,
+                    ttfb_ms,
+                    received,
+                    loop.time() - started,
+                )
 
-    async def get_tts_audio(self, text: str, options: dict | None = None):
-        """Generate TTS audio from GPT-4o using direct HTTP calls."""
+    async def async_load_cache(self, path: str, max_bytes: int) -> None:
+        """Open the audio cache; requests made meanwhile bypass it."""
+        self._cache_opening = self.hass.async_add_executor_job(
+            SegmentStore, path, max_bytes, segment_size_for(max_bytes)
+        )
+        try:
+            # Shielded so an unload mid-open can still close the store
+            self.cache = await asyncio.shield(self._cache_opening)
+        except OSError as err:
+            _LOGGER.warning("Error opening GPT-4o TTS audio cache: %s", err)
+
+    async def _async_cache_get(self, key: str) -> CachedClip | None:
+        """Look ``key`` up locally, then in the shared cache."""
+        clip = await self._async_local_get(key)
+        if clip is not None or self.shared is None:
+            return clip
+        found = await self.shared.async_get(key)
+        if found is None:
+            self.metrics.shared_misses += 1
+            return None
+        self.metrics.shared_hits += 1
+        audio_format, data = found
+        duration = await self._async_cache_put(key, audio_format, data, share=False)
+        return CachedClip(audio_format, memoryview(data), duration)
+
+    async def _async_local_get(self, key: str) -> CachedClip | None:
+        """Look ``key`` up in the local audio cache, if one is configured."""
+        if self.cache is None:
+            return None
+        try:
+            return await self.hass.async_add_executor_job(self.cache.get, key)
+        except OSError as err:
+            _LOGGER.warning("Error reading GPT-4o TTS audio cache: %s", err)
+            return None
+
+    async def _async_cache_put(
+        self, key: str, audio_format: str, data: bytes, share: bool = True
+    ) -> float:
+        """Store a complete clip and return its duration in seconds.
+
+        Compaction, if due, is started in the background.
+        """
+        duration = duration_ms(data, audio_format) / 1000
+        if share and self._write_behind is not None:
+            self._write_behind.enqueue(key, audio_format, data)
+        if self.cache is None:
+            return duration
         try:
-            audio_chunks = [chunk async for chunk in self.iter_tts_audio(text, options)]
+            due = await self.hass.async_add_executor_job(
+                self._cache_put, key, audio_format, data, duration
+            )
+        except OSError as err:
+            _LOGGER.warning("Error writing GPT-4o TTS audio cache: %s", err)
+            return duration
+        if due and (self._compaction is None or self._compaction.done()):
+            self._compaction = self.hass.async_add_executor_job(self._compact_cache)
+        return duration
+
+    async def _async_lookup(
+        self, request: SynthesisRequest, report: bool = True
+    ) -> tuple[SynthesisRequest, CachedClip | None]:
+        """Apply the budget policy and find the request's audio in the caches.
+
+        Cached premium audio is served even when over budget; the fallback
+        request is only used, and looked up, when it is not cached.  Hits
+        are only recorded in the ledger if ``report`` is True.
+        """
+        clip = await self._async_cache_get(request.key)
+        if clip is None and self.policy is not None:
+            fallback = self.policy.downgrade(request)
+            if fallback is not None:
+                request = fallback
+                clip = await self._async_cache_get(request.key)
+        if clip is not None and report and self.ledger is not None:
+            self.ledger.record_hit(request, clip.duration)
+        return request, clip
+
+    def _cache_put(
+        self, key: str, audio_format: str, data: bytes, duration: float
+    ) -> bool:
+        """Store a clip and return whether compaction is due; runs in the executor."""
+        self.cache.put(key, audio_format, data, duration)
+        return self.cache.needs_compaction
+
+    def _compact_cache(self) -> None:
+        """Compact the audio cache; runs in the executor."""
+        try:
+            self.cache.compact()
+        except OSError as err:
+            _LOGGER.warning("Error compacting GPT-4o TTS audio cache: %s", err)
+
+    async def _iter_cached(self, clip: CachedClip):
+        """Yield zero-copy chunks of a cached clip."""
+        for chunk in iter_chunks(clip.data):
+            yield chunk
+
+    async def _iter_measured(self, request: SynthesisRequest, tee: StreamTee):
+        """Yield the request's audio into ``tee``, caching it once complete.
+
+        Runs in the tee's producer.  A tee keeping the whole stream is
+        shared: readers of the same audio follow it as it arrives.  Only a
+        stream that ends normally has its duration reported and is written
+        to the cache, trimmed like a clip fetched whole.
+        """
+        # Chunks are whole units, so each is walked once and then dropped
+        meter = Rechunker(request.response_format, 1e12, 1e12)
+        shared = tee.keep and self._tees.setdefault(request.key, tee) is tee
+        try:
+            async with contextlib.aclosing(self.iter_tts_audio(request)) as chunks:
+                async for chunk in chunks:
+                    meter.feed(chunk)
+                    meter.flush()
+                    yield chunk
+            if not meter.total_ms:
+                return
+            tee.duration = meter.total_ms / 1000
+            self._clip_ready(request, tee.duration, False)
+            if tee.keep:
+                # The last chunk is buffered by the time the source resumes
+                data = tee.data()
+                if self._trim_silence:
+                    data = trim_silence(data, request.response_format)
+                await self._async_cache_put(
+                    request.key, request.response_format, data
+                )
+        finally:
+            if shared:
+                del self._tees[request.key]
+
+    async def _iter_tailed(self, request: SynthesisRequest, tee: StreamTee):
+        """Follow another stream of the same audio; render it if that never started.
+
+        The shared stream keeps running while any reader is left, so it
+        only ends early on an upstream error, which is raised here too.
+        """
+        received = False
+        async for chunk in tee.reader():
+            received = True
+            yield chunk
+        if received:
+            if self.ledger is not None:
+                self.ledger.record_hit(request, tee.duration)
+            self._clip_ready(request, tee.duration, True)
+            return
+        async with contextlib.aclosing(self._iter_stream(request)) as chunks:
+            async for chunk in chunks:
+                yield chunk
+
+    def _iter_stream(self, request: SynthesisRequest):
+        """Return a reader of a new upstream stream for ``request``.
+
+        The whole stream is only kept when a cache will store it, which
+        also lets concurrent readers of the same audio share it.
+        """
+        tee = StreamTee(
+            self._read_ahead_high,
+            self._read_ahead_low,
+            self.cache is not None or self._write_behind is not None,
+            self.metrics,
+        )
+        tee.attach(self._iter_measured(request, tee))
+        return tee.reader()
+
+    async def async_warm_cache(self, phrases: list[tuple[str, dict]]) -> int:
+        """Render phrases missing from the cache and return how many were."""
+        if self.cache is None:
+            return 0
+        rendered = 0
+        for message, options in phrases:
+            if self._closing:
+                break
+            request = self.build_request(message, options)
+            if await self.async_cached_key([request.key]):
+                continue
+            _fmt, data = await self._async_get_audio(request, report=False)
+            if data:
+                rendered += 1
+        if rendered:
+            _LOGGER.debug("Warmed %s phrases into the GPT-4o TTS cache", rendered)
+        return rendered
+
+    async def get_tts_audio(
+        self, text: str, options: dict | None = None, report: bool = True
+    ):
+        """Generate TTS audio from GPT-4o using direct HTTP calls.
+
+        ``report`` is False for audio nobody will play right away, e.g. the
+        acknowledgement rendered ahead of time.
+        """
+        if not self._begin():
+            return None, None
+        try:
+            request = await self._async_build_request(text, options)
+            if not report:
+                return await self._async_get_audio(request, report=False)
+            return await self._async_get_observed(request)
+        finally:
+            self._end()
+
+    async def _async_get_observed(self, request: SynthesisRequest):
+        """Return ``(format, audio)``, timing it for any request observers."""
+        if not self._request_observers:
+            return await self._async_get_audio(request)
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        data = None
+        outcome = "cancelled"
+        try:
+            audio_format, data = await self._async_get_audio(request)
+            outcome = "ok" if data else "error"
+            return audio_format, data
+        finally:
+            total_ms = (loop.time() - started) * 1000
+            self._observe(
+                request,
+                RequestTiming(
+                    "get",
+                    total_ms if data else None,
+                    total_ms,
+                    len(data or b""),
+                    outcome,
+                ),
+            )
+
+    async def _async_get_audio(self, request: SynthesisRequest, report: bool = True):
+        """Return ``(format, audio)`` for ``request``, from the cache if possible.
+
+        ``report`` is False for clips nobody will play, e.g. cache warming.
+        """
+        request, clip = await self._async_lookup(request, report)
+        if clip is not None:
+            if report:
+                self._clip_ready(request, clip.duration, True)
+            return clip.audio_format, bytes(clip.data)
+        tee = self._tees.get(request.key)
+        if tee is not None:
+            # The same audio is streaming right now; wait for it
+            self.metrics.tailed_requests += 1
+            data = await tee.wait()
+            if data:
+                if self._trim_silence:
+                    data = trim_silence(data, request.response_format)
+                if report:
+                    if self.ledger is not None:
+                        self.ledger.record_hit(request, tee.duration)
+                    self._clip_ready(request, tee.duration, True)
+                return request.response_format, data
+        try:
+            audio_chunks = [chunk async for chunk in self.iter_tts_audio(request)]
             if not audio_chunks:
                 return None, None
-            audio_format = options.get("audio_output", self._audio_output) if options else self._audio_output
-            return audio_format, b"".join(audio_chunks)
+            data = b"".join(audio_chunks)
+            if self._trim_silence:
+                data = trim_silence(data, request.response_format)
+            duration = await self._async_cache_put(
+                request.key, request.response_format, data
+            )
+            if report:
+                self._clip_ready(request, duration, False)
+            return request.response_format, data
         except asyncio.TimeoutError:
             _LOGGER.error(
                 "GPT-4o TTS request timed out after %s seconds", REQUEST_TIMEOUT
@@ -195,11 +840,95 @@ class GPT4oClient:
 
     async def stream_tts_audio(self, text: str, options: dict | None = None):
         """Return async iterator for TTS audio without joining chunks."""
-        if options is None:
-            options = {}
-        audio_format = options.get("audio_output", self._audio_output)
+        if not self._begin():
+            return None, None
+        try:
+            audio_format, chunks = await self._async_open_observed(
+                await self._async_build_request(text, options)
+            )
+        finally:
+            # The stream itself is counted once it is read
+            self._end()
+        if chunks is None:
+            return audio_format, chunks
+        return audio_format, self._iter_in_flight(chunks)
+
+    async def _async_open_observed(self, request: SynthesisRequest):
+        """Open a stream, timing it for any request observers."""
+        if not self._request_observers:
+            return await self._async_open_stream(request)
+        started = asyncio.get_running_loop().time()
+        audio_format, chunks = await self._async_open_stream(request)
+        if chunks is None:
+            self._observe(request, RequestTiming("stream", None, 0.0, 0, "error"))
+            return audio_format, chunks
+        return audio_format, self._iter_observed(request, chunks, started)
+
+    async def _async_open_stream(self, request: SynthesisRequest):
+        """Return ``(format, chunks)`` from the cache or a new upstream stream."""
+        request, clip = await self._async_lookup(request)
+        if clip is not None:
+            self._clip_ready(request, clip.duration, True)
+            return clip.audio_format, self._iter_cached(clip)
+        tee = self._tees.get(request.key)
+        if tee is not None:
+            self.metrics.tailed_requests += 1
+            return request.response_format, self._iter_tailed(request, tee)
         try:
-            return audio_format, self.iter_tts_audio(text, options)
+            return request.response_format, self._iter_stream(request)
         except Exception as err:  # pragma: no cover - unexpected errors
             _LOGGER.error("Error starting GPT-4o TTS stream: %s", err)
             return None, None
+
+    async def async_close(self) -> None:
+        """Drain in-flight requests, then close the session and the caches.
+
+        New requests are refused right away.  Requests still running after
+        the drain timeout are aborted by closing the HTTP session.  Safe to
+        call again, e.g. on unload after Home Assistant stopped.
+        """
+        if self._closed is None:
+            self._closed = asyncio.get_running_loop().create_task(
+                self._async_close()
+            )
+        await asyncio.shield(self._closed)
+
+    async def _async_close(self) -> None:
+        self._closing = True
+        if self._inflight:
+            _LOGGER.debug(
+                "Waiting for %s GPT-4o TTS requests to finish", self._inflight
+            )
+            try:
+                await asyncio.wait_for(self._drained.wait(), self._drain_timeout)
+            except asyncio.TimeoutError:
+                _LOGGER.warning(
+                    "Aborting %s GPT-4o TTS requests still running after %s s",
+                    self._inflight,
+                    self._drain_timeout,
+                )
+                self._aborting = True
+                # Closing the session alone does not wake pending reads
+                for resp in list(self._responses):
+                    resp.close()
+                if self._session is not None:
+                    await self._session.close()
+                with contextlib.suppress(asyncio.TimeoutError):
+                    await asyncio.wait_for(self._drained.wait(), ABORT_TIMEOUT)
+        if self._write_behind is not None:
+            await self._write_behind.async_flush(SHARED_FLUSH_TIMEOUT)
+        if self.shared is not None:
+            await self.shared.async_close()
+        if self.ledger is not None:
+            await self.ledger.async_save()
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+        if self.cache is None and self._cache_opening is not None:
+            with contextlib.suppress(OSError):
+                self.cache = await self._cache_opening
+        if self.cache is None:
+            return
+        if self._compaction is not None:
+            await self._compaction
+        await self.hass.async_add_executor_job(self.cache.close)
@@ -0,0 +1,221 @@
+"""Persisted usage ledger and the budget policy built on top of it."""
+
+from __future__ import annotations
+
+import dataclasses
+import logging
+from collections.abc import Callable
+from datetime import timedelta
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.storage import Store
+from homeassistant.util import dt as dt_util
+
+from .const import DOMAIN
+from .metrics import ewma
+from .request import SynthesisRequest
+
+_LOGGER = logging.getLogger(__name__)
+
+STORAGE_VERSION = 1
+# Batch ledger writes; a synthesis every few seconds must not hit the disk
+SAVE_DELAY = 60
+# Days of history kept in storage
+RETAIN_DAYS = 31
+COUNTERS = (
+    "requests",
+    "characters",
+    "audio_seconds",
+    "cache_hits",
+    "characters_saved",
+    "audio_seconds_saved",
+    "downgraded",
+)
+
+# Model the policy downgrades from, and the cheaper, faster one it uses
+PREMIUM_MODEL = "gpt-4o-mini-tts"
+FALLBACK_MODEL = "tts-1"
+# While latency forces downgrades, every Nth request still measures premium
+LATENCY_RECHECK = 10
+
+
+def _today() -> str:
+    return dt_util.now().date().isoformat()
+
+
+class UsageLedger:
+    """Per-day usage counters keyed by ``model/voice``.
+
+    Counters are kept in memory and written through a delayed ``Store``
+    save.  Nothing is read from disk until :meth:`async_load`; counts
+    recorded before that are merged into the loaded history.
+    """
+
+    def __init__(self, hass: HomeAssistant, entry_id: str) -> None:
+        self._store: Store = Store(
+            hass, STORAGE_VERSION, f"{DOMAIN}.{entry_id}.ledger"
+        )
+        # day -> "model/voice" -> counter -> value
+        self._days: dict[str, dict[str, dict[str, float]]] = {}
+        self._listeners: list[Callable[[], None]] = []
+        # Saving before the history is loaded would overwrite it
+        self._loaded = False
+
+    async def async_load(self) -> None:
+        """Merge the stored history into the in-memory counters."""
+        stored = await self._store.async_load() or {}
+        for day, buckets in stored.get("days", {}).items():
+            for name, counters in buckets.items():
+                bucket = self._days.setdefault(day, {}).setdefault(
+                    name, dict.fromkeys(COUNTERS, 0)
+                )
+                for counter, value in counters.items():
+                    bucket[counter] = bucket.get(counter, 0) + value
+        self._loaded = True
+        self._prune()
+        self._store.async_delay_save(self._data_to_save, SAVE_DELAY)
+        self._notify()
+
+    async def async_save(self) -> None:
+        """Write the ledger now instead of after the save delay."""
+        if not self._loaded:
+            return
+        await self._store.async_save(self._data_to_save())
+
+    async def async_remove(self) -> None:
+        """Delete the stored ledger."""
+        await self._store.async_remove()
+
+    @callback
+    def async_add_listener(self, update: Callable[[], None]) -> Callable[[], None]:
+        """Call ``update`` whenever a counter changes; returns an unsubscriber."""
+        self._listeners.append(update)
+        return lambda: self._listeners.remove(update)
+
+    def _data_to_save(self) -> dict:
+        return {"days": self._days}
+
+    def _prune(self) -> None:
+        oldest = (dt_util.now().date() - timedelta(days=RETAIN_DAYS - 1)).isoformat()
+        for day in [day for day in self._days if day < oldest]:
+            del self._days[day]
+
+    def _notify(self) -> None:
+        for update in list(self._listeners):
+            update()
+
+    def _add(self, model: str, voice: str, **values: float) -> None:
+        day = _today()
+        if day not in self._days:
+            self._days[day] = {}
+            self._prune()
+        bucket = self._days[day].setdefault(
+            f"{model}/{voice}", dict.fromkeys(COUNTERS, 0)
+        )
+        for counter, value in values.items():
+            bucket[counter] += value
+        if self._loaded:
+            self._store.async_delay_save(self._data_to_save, SAVE_DELAY)
+        self._notify()
+
+    @callback
+    def record(self, request: SynthesisRequest, audio_seconds: float) -> None:
+        """Count one request sent to OpenAI."""
+        self._add(
+            request.model,
+            request.voice,
+            requests=1,
+            characters=len(request.text),
+            audio_seconds=audio_seconds,
+            downgraded=int(request.downgraded),
+        )
+
+    @callback
+    def record_hit(self, request: SynthesisRequest, audio_seconds: float) -> None:
+        """Count one request answered from a cache instead of OpenAI."""
+        self._add(
+            request.model,
+            request.voice,
+            cache_hits=1,
+            characters_saved=len(request.text),
+            audio_seconds_saved=audio_seconds,
+        )
+
+    def _sum(self, days, model: str | None) -> dict[str, float]:
+        totals = dict.fromkeys(COUNTERS, 0)
+        for buckets in days:
+            for name, counters in buckets.items():
+                if model is not None and name.split("/", 1)[0] != model:
+                    continue
+                for counter in COUNTERS:
+                    totals[counter] += counters.get(counter, 0)
+        return totals
+
+    def today(self, model: str | None = None) -> dict[str, float]:
+        """Return today's counters, optionally for one model only."""
+        return self._sum([self._days.get(_today(), {})], model)
+
+    def totals(self) -> dict[str, float]:
+        """Return the counters summed over the retained history."""
+        return self._sum(self._days.values(), None)
+
+    def breakdown(self) -> dict[str, dict[str, float]]:
+        """Return today's counters per ``model/voice``."""
+        return {
+            name: dict(counters)
+            for name, counters in self._days.get(_today(), {}).items()
+        }
+
+
+class BudgetPolicy:
+    """Route non-priority requests to a cheaper model when limits are hit.
+
+    A request is downgraded when today's premium-model characters plus its
+    own would exceed ``daily_characters``, or when the premium model's
+    time to first audio is above ``latency_slo_ms``.  A limit of 0 is off.
+    """
+
+    def __init__(
+        self, ledger: UsageLedger, daily_characters: int = 0, latency_slo_ms: int = 0
+    ) -> None:
+        self._ledger = ledger
+        self._daily_characters = daily_characters
+        self._latency_slo_ms = latency_slo_ms
+        self._latency: dict[str, float] = {}
+        self._slow_requests = 0
+
+    def observe(self, model: str, ttfb_ms: float) -> None:
+        """Fold one measured time to first audio into the model's average."""
+        self._latency[model] = ewma(self._latency.get(model), ttfb_ms)
+
+    def _reason(self, request: SynthesisRequest) -> str | None:
+        if request.priority or request.model != PREMIUM_MODEL:
+            return None
+        if self._daily_characters:
+            used = self._ledger.today(PREMIUM_MODEL)["characters"]
+            if used + len(request.text) > self._daily_characters:
+                return "budget"
+        latency = self._latency.get(PREMIUM_MODEL)
+        if self._latency_slo_ms and latency is not None:
+            if latency > self._latency_slo_ms:
+                self._slow_requests += 1
+                if self._slow_requests % LATENCY_RECHECK:
+                    return "latency"
+        return None
+
+    def downgrade(self, request: SynthesisRequest) -> SynthesisRequest | None:
+        """Return the fallback request to send instead, or None."""
+        reason = self._reason(request)
+        if reason is None:
+            return None
+        _LOGGER.debug(
+            "Using %s instead of %s (%s)", FALLBACK_MODEL, request.model, reason
+        )
+        # tts-1 ignores instructions and cannot stream SSE
+        return dataclasses.replace(
+            request,
+            model=FALLBACK_MODEL,
+            instructions="",
+            stream_format="audio",
+            downgraded=True,
+        )
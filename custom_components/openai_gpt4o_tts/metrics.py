@@ -0,0 +1,77 @@
+"""Runtime counters for the GPT-4o TTS client."""
+
+from dataclasses import asdict, dataclass
+
+# Weight of the newest sample in exponentially weighted averages
+EWMA_ALPHA = 0.2
+
+
+def ewma(current: float | None, sample: float, alpha: float = EWMA_ALPHA) -> float:
+    """Fold ``sample`` into the running average ``current``."""
+    if current is None:
+        return sample
+    return current + alpha * (sample - current)
+
+
+@dataclass
+class ClientMetrics:
+    """Counters describing how audio moved through the client."""
+
+    # Producer waited because the read-ahead buffer hit its high watermark
+    producer_stalls: int = 0
+    producer_stall_seconds: float = 0.0
+    # Consumer waited on an empty buffer after the first chunk arrived
+    consumer_stalls: int = 0
+    consumer_stall_seconds: float = 0.0
+    peak_buffered_bytes: int = 0
+    # Streams closed or cancelled before the upstream response finished
+    cancelled_streams: int = 0
+    cancelled_bytes: int = 0
+    # Time to first audio byte, split by whether a pooled connection was
+    # likely open (recent request or pre-connect) when the request started
+    prewarms: int = 0
+    cold_requests: int = 0
+    warm_requests: int = 0
+    ttfb_cold_ms: float | None = None
+    ttfb_warm_ms: float | None = None
+    # Local cache misses answered, or not, by the shared cache backend
+    shared_hits: int = 0
+    shared_misses: int = 0
+    # Requests that followed another stream of the same audio in progress
+    tailed_requests: int = 0
+    # Streams led by an acknowledgement because their audio was late
+    masked_requests: int = 0
+
+    def record_ttfb(self, ttfb_ms: float, warm: bool) -> None:
+        """Record the time to first audio of one request."""
+        if warm:
+            self.warm_requests += 1
+            self.ttfb_warm_ms = ewma(self.ttfb_warm_ms, ttfb_ms)
+        else:
+            self.cold_requests += 1
+            self.ttfb_cold_ms = ewma(self.ttfb_cold_ms, ttfb_ms)
+
+    @property
+    def ttfb_improvement_ms(self) -> float | None:
+        """Return how much faster warm requests reach first audio."""
+        if self.ttfb_cold_ms is None or self.ttfb_warm_ms is None:
+            return None
+        return self.ttfb_cold_ms - self.ttfb_warm_ms
+
+    def as_dict(self) -> dict:
+        """Return the counters as a plain dict for diagnostics."""
+        data = asdict(self)
+        data["ttfb_improvement_ms"] = self.ttfb_improvement_ms
+        return data
+
+
+@dataclass(slots=True)
+class RequestTiming:
+    """Wall-clock timing of one get or stream request, seen by its caller."""
+
+    kind: str
+    first_audio_ms: float | None
+    total_ms: float
+    size: int
+    # "ok", "error" (no audio) or "cancelled"
+    outcome: str
@@ -0,0 +1,222 @@
+"""On-demand profiling of the TTS hot path."""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import cProfile
+import io
+import logging
+import os
+import pstats
+import time
+from collections.abc import Callable
+
+import voluptuous as vol
+from homeassistant.core import HomeAssistant, ServiceCall
+from homeassistant.exceptions import HomeAssistantError
+
+from .const import DATA_PROFILE, DOMAIN, EVENT_PROFILE, SERVICE_PROFILE
+from .gpt4o import GPT4oClient
+from .metrics import RequestTiming
+from .request import SynthesisRequest
+
+_LOGGER = logging.getLogger(__name__)
+
+DEFAULT_PROFILE_SECONDS = 60
+MAX_PROFILE_SECONDS = 3600
+# Rows of each pstats table in the text report
+REPORT_ROWS = 40
+
+ATTR_DURATION = "duration"
+ATTR_REQUESTS = "requests"
+
+PROFILE_SCHEMA = vol.Schema(
+    {
+        vol.Optional(ATTR_DURATION, default=DEFAULT_PROFILE_SECONDS): vol.All(
+            vol.Coerce(float), vol.Range(min=1, max=MAX_PROFILE_SECONDS)
+        ),
+        vol.Optional(ATTR_REQUESTS): vol.All(vol.Coerce(int), vol.Range(min=1)),
+    }
+)
+
+_PACKAGE_DIR = os.path.dirname(__file__)
+
+
+def _own(func: tuple[str, int, str]) -> bool:
+    return func[0].startswith(_PACKAGE_DIR + os.sep)
+
+
+def _package_stats(profile: cProfile.Profile) -> pstats.Stats:
+    """Return the stats of this integration's functions only.
+
+    The profiler sees everything the event loop runs, i.e. all of Home
+    Assistant.  Calls from elsewhere are dropped too, so the stats stay
+    consistent for pstats and snakeviz.
+    """
+    stats = pstats.Stats()
+    stats.stats = {
+        func: (cc, nc, tt, ct, {c: t for c, t in callers.items() if _own(c)})
+        for func, (cc, nc, tt, ct, callers) in pstats.Stats(profile).stats.items()
+        if _own(func)
+    }
+    stats.get_top_level_stats()
+    return stats
+
+
+def _percentile(values: list[float], fraction: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+class ProfileSession:
+    """cProfile on the event loop plus timings of each TTS request.
+
+    The profiler slows down everything running on the loop while it is on,
+    not just this integration; the report only keeps this integration's
+    functions.  Clients only call into a session while one is attached, so
+    profiling costs nothing but an ``is None`` check when it is off.
+    """
+
+    def __init__(self, max_requests: int | None = None) -> None:
+        self.max_requests = max_requests
+        # Text length, audio format and timing of each request
+        self.timings: list[tuple[int, str, RequestTiming]] = []
+        self._unsubscribers: list[Callable[[], None]] = []
+        self.done = asyncio.Event()
+        self._profile = cProfile.Profile()
+        self._started = 0.0
+        self.elapsed = 0.0
+
+    def start(self) -> None:
+        """Start profiling the calling thread, i.e. the event loop."""
+        try:
+            self._profile.enable()
+        except ValueError as err:
+            raise HomeAssistantError(f"Cannot start profiling: {err}") from err
+        self._started = time.perf_counter()
+
+    def stop(self) -> None:
+        """Stop profiling; safe to call twice."""
+        while self._unsubscribers:
+            self._unsubscribers.pop()()
+        if self._started and not self.elapsed:
+            self._profile.disable()
+            self.elapsed = time.perf_counter() - self._started
+
+    def attach(self, client: GPT4oClient) -> None:
+        """Time the requests ``client`` serves until the session stops."""
+        self._unsubscribers.append(client.async_add_request_observer(self.record))
+
+    def record(self, request: SynthesisRequest, timing: RequestTiming) -> None:
+        """Add a finished request; end the session once enough were seen."""
+        self.timings.append((len(request.text), request.response_format, timing))
+        if self.max_requests and len(self.timings) >= self.max_requests:
+            self.done.set()
+
+    def report(self) -> str:
+        """Return the request timings and pstats tables as text."""
+        out = io.StringIO()
+        out.write(
+            f"GPT-4o TTS profile: {self.elapsed:.1f} s, "
+            f"{len(self.timings)} requests\n\n"
+        )
+        if self.timings:
+            out.write(
+                "kind    chars format outcome   first_audio_ms total_ms    bytes\n"
+            )
+            for chars, audio_format, timing in self.timings:
+                first = (
+                    "-" if timing.first_audio_ms is None
+                    else f"{timing.first_audio_ms:.1f}"
+                )
+                out.write(
+                    f"{timing.kind:<7} {chars:>5} {audio_format:<6} "
+                    f"{timing.outcome:<9} {first:>14} {timing.total_ms:>8.1f} "
+                    f"{timing.size:>8}\n"
+                )
+            for label, values in (
+                ("first audio", [
+                    timing.first_audio_ms for _c, _f, timing in self.timings
+                    if timing.first_audio_ms is not None
+                ]),
+                ("total", [timing.total_ms for _c, _f, timing in self.timings]),
+            ):
+                if values:
+                    out.write(
+                        f"{label}: p50 {_percentile(values, 0.5):.1f} ms, "
+                        f"p95 {_percentile(values, 0.95):.1f} ms, "
+                        f"max {max(values):.1f} ms\n"
+                    )
+            out.write("\n")
+        stats = _package_stats(self._profile)
+        stats.stream = out
+        out.write("Integration functions by cumulative time:\n")
+        stats.sort_stats(pstats.SortKey.CUMULATIVE).print_stats(REPORT_ROWS)
+        out.write("Integration functions by internal time:\n")
+        stats.sort_stats(pstats.SortKey.TIME).print_stats(REPORT_ROWS)
+        return out.getvalue()
+
+    def write(self, base_path: str) -> str:
+        """Write ``<base>.prof`` for pstats/snakeviz and ``<base>.txt``."""
+        _package_stats(self._profile).dump_stats(f"{base_path}.prof")
+        with open(f"{base_path}.txt", "w", encoding="utf-8") as report:
+            report.write(self.report())
+        return f"{base_path}.txt"
+
+
+def async_start_profile(
+    hass: HomeAssistant, max_requests: int | None = None
+) -> ProfileSession:
+    """Start profiling every loaded client."""
+    if hass.data.get(DATA_PROFILE) is not None:
+        raise HomeAssistantError("A GPT-4o TTS profile is already running")
+    session = ProfileSession(max_requests)
+    session.start()
+    hass.data[DATA_PROFILE] = session
+    for client in hass.data.get(DOMAIN, {}).values():
+        session.attach(client)
+    return session
+
+
+async def async_finish_profile(
+    hass: HomeAssistant, session: ProfileSession, duration: float
+) -> str:
+    """Stop ``session`` after ``duration`` or its request count; write it out."""
+    try:
+        with contextlib.suppress(asyncio.TimeoutError):
+            await asyncio.wait_for(session.done.wait(), duration)
+    finally:
+        session.stop()
+        hass.data.pop(DATA_PROFILE, None)
+    base_path = hass.config.path(
+        f"{DOMAIN}.profile.{time.strftime('%Y%m%d-%H%M%S')}"
+    )
+    path = await hass.async_add_executor_job(session.write, base_path)
+    _LOGGER.info(
+        "GPT-4o TTS profile of %s requests written to %s", len(session.timings), path
+    )
+    hass.bus.async_fire(
+        EVENT_PROFILE, {"path": path, "requests": len(session.timings)}
+    )
+    return path
+
+
+def async_setup_profile_service(hass: HomeAssistant) -> None:
+    """Register the profile service once for all entries."""
+    if hass.services.has_service(DOMAIN, SERVICE_PROFILE):
+        return
+
+    async def _async_profile(call: ServiceCall) -> None:
+        if not hass.data.get(DOMAIN):
+            raise HomeAssistantError("No loaded GPT-4o TTS entry to profile")
+        session = async_start_profile(hass, call.data.get(ATTR_REQUESTS))
+        # Runs for up to an hour, so the service call returns right away
+        hass.async_create_background_task(
+            async_finish_profile(hass, session, call.data[ATTR_DURATION]),
+            f"{DOMAIN}_profile",
+        )
+
+    hass.services.async_register(
+        DOMAIN, SERVICE_PROFILE, _async_profile, schema=PROFILE_SCHEMA
+    )
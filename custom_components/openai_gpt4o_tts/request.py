@@ -0,0 +1,107 @@
+"""Resolved, immutable description of one speech synthesis call."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+from dataclasses import dataclass, field
+
+from .const import (
+    ATTR_PRIORITY,
+    CHUNK_PROFILES,
+    CONF_AUDIO_OUTPUT,
+    CONF_CHUNK_MS,
+    CONF_FIRST_CHUNK_MS,
+    CONF_INSTRUCTIONS,
+    CONF_MODEL,
+    CONF_PLAYBACK_SPEED,
+    CONF_STREAM_FORMAT,
+    CONF_VOICE,
+    DEFAULT_VOICE,
+)
+
+
+@dataclass(frozen=True, slots=True)
+class SynthesisRequest:
+    """A TTS call with every option resolved against the entry defaults.
+
+    ``key`` identifies the audio the request produces and is shared by the
+    cache and metrics; ``body`` is the JSON sent to OpenAI, serialized once.
+    """
+
+    text: str
+    model: str
+    voice: str
+    instructions: str
+    response_format: str
+    speed: float
+    stream_format: str
+    first_chunk_ms: float
+    chunk_ms: float
+    # Neither changes the audio, so neither is part of ``key``
+    priority: bool = field(default=False, compare=False)
+    downgraded: bool = field(default=False, compare=False)
+    key: str = field(init=False, repr=False, compare=False)
+    _body: bytes | None = field(default=None, init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        # The transport framing and chunking do not change the audio bytes
+        material = json.dumps(
+            {
+                "input": self.text,
+                "instructions": self.instructions,
+                "model": self.model,
+                "response_format": self.response_format,
+                "speed": self.speed,
+                "voice": self.voice,
+            },
+            sort_keys=True,
+        )
+        object.__setattr__(
+            self,
+            "key",
+            hashlib.blake2b(material.encode(), digest_size=16).hexdigest(),
+        )
+
+    @classmethod
+    def resolve(
+        cls, text: str, options: dict | None, defaults: dict
+    ) -> SynthesisRequest:
+        """Build a request from per-call ``options`` over entry ``defaults``."""
+        merged = {**defaults, **(options or {})}
+        response_format = merged[CONF_AUDIO_OUTPUT]
+        first_ms, chunk_ms = CHUNK_PROFILES.get(
+            response_format, CHUNK_PROFILES["mp3"]
+        )
+        return cls(
+            text=text,
+            model=merged[CONF_MODEL],
+            voice=merged.get(CONF_VOICE) or DEFAULT_VOICE,
+            instructions=merged.get(CONF_INSTRUCTIONS) or "",
+            response_format=response_format,
+            speed=float(merged[CONF_PLAYBACK_SPEED]),
+            stream_format=merged[CONF_STREAM_FORMAT],
+            first_chunk_ms=float(merged.get(CONF_FIRST_CHUNK_MS, first_ms)),
+            chunk_ms=float(merged.get(CONF_CHUNK_MS, chunk_ms)),
+            priority=bool(merged.get(ATTR_PRIORITY, False)),
+        )
+
+    @property
+    def payload(self) -> dict:
+        """Return the request body as a dict."""
+        return {
+            "model": self.model,
+            "voice": self.voice,
+            "input": self.text,
+            "instructions": self.instructions,
+            "response_format": self.response_format,
+            "speed": self.speed,
+            "stream_format": self.stream_format,
+        }
+
+    @property
+    def body(self) -> bytes:
+        """Return the serialized request body, encoding it on first use."""
+        if self._body is None:
+            object.__setattr__(self, "_body", json.dumps(self.payload).encode())
+        return self._body
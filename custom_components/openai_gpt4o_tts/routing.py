@@ -0,0 +1,213 @@
+"""Route requests across OpenAI-compatible speech endpoints by latency."""
+
+from __future__ import annotations
+
+import logging
+import time
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from urllib.parse import urlsplit
+
+from .metrics import ewma
+from .selection import PROBE_EVERY
+
+_LOGGER = logging.getLogger(__name__)
+
+# A failed request counts as this much extra latency, scaled by the
+# endpoint's recent error rate
+ERROR_PENALTY_MS = 2000.0
+# Endpoints are skipped for this long after a failure, doubling with every
+# further failure in a row
+BACKOFF_SECONDS = 5.0
+MAX_BACKOFF_SECONDS = 300.0
+# Statuses caused by the request itself; they say nothing about the endpoint
+CLIENT_ERRORS = (400, 413, 422)
+# The only host the entry's OpenAI API key is sent to unless an endpoint
+# opts in with ``openai_key``
+OPENAI_HOST = "api.openai.com"
+
+
+@dataclass
+class Endpoint:
+    """One speech endpoint, what it serves and how it has been doing."""
+
+    url: str
+    # The endpoint's own key, sent instead of the entry's
+    api_key: str | None = field(default=None, repr=False)
+    # Whether the entry's OpenAI key may be sent to a host other than OpenAI
+    openai_key: bool = False
+    # None serves every model or voice
+    models: tuple[str, ...] | None = None
+    voices: tuple[str, ...] | None = None
+    ttfb_ms: float | None = None
+    error_rate: float = 0.0
+    requests: int = 0
+    errors: int = 0
+    # Failures in a row, and the clock time before which to avoid it
+    failures: int = 0
+    retry_at: float = 0.0
+    selected: int = 0
+    # Selection counter value when the last request finished
+    last_sample: int = 0
+
+    def serves(self, model: str, voice: str | None) -> bool:
+        """Return whether the endpoint offers ``model`` and ``voice``."""
+        if self.models is not None and model not in self.models:
+            return False
+        return self.voices is None or voice is None or voice in self.voices
+
+    def authorization(self, openai_key: str) -> str | None:
+        """Return the key to send, or None to send no Authorization header.
+
+        The entry's ``openai_key`` only goes to OpenAI itself, or to an
+        endpoint configured to receive it.
+        """
+        if self.api_key:
+            return self.api_key
+        url = urlsplit(self.url)
+        if self.openai_key or (url.scheme == "https" and url.hostname == OPENAI_HOST):
+            return openai_key
+        return None
+
+    @property
+    def score(self) -> float:
+        """Expected time to first audio, penalized by recent errors."""
+        return self.ttfb_ms + self.error_rate * ERROR_PENALTY_MS
+
+    def as_dict(self) -> dict:
+        """Return the endpoint's state for diagnostics, without its key."""
+        return {
+            "models": list(self.models) if self.models is not None else None,
+            "voices": list(self.voices) if self.voices is not None else None,
+            "ttfb_ms": self.ttfb_ms,
+            "error_rate": self.error_rate,
+            "requests": self.requests,
+            "errors": self.errors,
+            "failures": self.failures,
+            "selected": self.selected,
+        }
+
+
+def parse_endpoints(text: str | None, default: str) -> list[Endpoint]:
+    """Parse the endpoints option; ``default`` alone when it is empty.
+
+    Endpoints are separated by newlines or ``;``.  Each is a URL optionally
+    followed by ``models=a,b``, ``voices=x,y`` and ``key=...``, e.g.
+    ``http://tts.local:8000/v1/audio/speech models=tts-1 voices=alloy,nova``.
+    A bare ``openai_key`` lets the entry's OpenAI key be sent to it.
+    """
+    endpoints = []
+    for spec in (text or "").replace(";", "\n").splitlines():
+        if not spec.strip():
+            continue
+        url, *params = spec.split()
+        if not url.startswith(("http://", "https://")):
+            _LOGGER.warning("Ignoring GPT-4o TTS endpoint %r: not an HTTP URL", url)
+            continue
+        endpoint = Endpoint(url)
+        for param in params:
+            name, _, value = param.partition("=")
+            if name == "key":
+                endpoint.api_key = value
+            elif param == "openai_key":
+                endpoint.openai_key = True
+            elif name in ("models", "voices"):
+                setattr(endpoint, name, tuple(filter(None, value.split(","))))
+            else:
+                _LOGGER.warning(
+                    "Ignoring unknown GPT-4o TTS endpoint option %r", param
+                )
+        endpoints.append(endpoint)
+    # Nothing configured: OpenAI itself
+    return endpoints or [Endpoint(default, openai_key=True)]
+
+
+class EndpointRouter:
+    """Rank endpoints for each request from passive live-traffic checks.
+
+    Endpoints that have never answered are tried first.  After that the
+    lowest EWMA time to first audio wins, penalized by the endpoint's recent
+    error rate, and every ``probe_every`` routes the endpoint measured
+    longest ago leads instead so a recovered one gets noticed.  Failing
+    endpoints back off exponentially and are only used when every endpoint
+    able to serve the request is backing off.
+    """
+
+    def __init__(
+        self,
+        endpoints: list[Endpoint],
+        probe_every: int = PROBE_EVERY,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.endpoints = endpoints
+        self._probe_every = probe_every
+        self._clock = clock
+        self._selections = 0
+
+    def rank(self, model: str, voice: str | None) -> list[Endpoint]:
+        """Return the endpoints serving ``model``/``voice``, best first."""
+        capable = [
+            endpoint for endpoint in self.endpoints if endpoint.serves(model, voice)
+        ]
+        now = self._clock()
+        healthy = [endpoint for endpoint in capable if endpoint.retry_at <= now]
+        untried = [
+            endpoint
+            for endpoint in healthy
+            if not (endpoint.selected or endpoint.requests)
+        ]
+        measured = sorted(
+            (endpoint for endpoint in healthy if endpoint.ttfb_ms is not None),
+            key=lambda endpoint: endpoint.score,
+        )
+        if len(measured) > 1 and self._selections % self._probe_every == 0:
+            stalest = min(measured, key=lambda endpoint: endpoint.last_sample)
+            measured.remove(stalest)
+            measured.insert(0, stalest)
+        # Tried but never answered yet, e.g. still in flight
+        pending = [
+            endpoint
+            for endpoint in healthy
+            if endpoint.ttfb_ms is None and endpoint not in untried
+        ]
+        backing_off = sorted(
+            (endpoint for endpoint in capable if endpoint.retry_at > now),
+            key=lambda endpoint: endpoint.retry_at,
+        )
+        return untried + measured + pending + backing_off
+
+    def route(self, model: str, voice: str | None) -> list[Endpoint]:
+        """Rank endpoints for the next request and count the one picked."""
+        self._selections += 1
+        ranked = self.rank(model, voice)
+        if ranked:
+            ranked[0].selected += 1
+        return ranked
+
+    def record_success(self, endpoint: Endpoint, ttfb_ms: float | None) -> None:
+        """Fold one request that delivered audio in.
+
+        ``ttfb_ms`` is None when the request's latency says nothing about the
+        endpoint's usual traffic; it then only counts towards its health.
+        """
+        endpoint.requests += 1
+        if ttfb_ms is not None:
+            endpoint.ttfb_ms = ewma(endpoint.ttfb_ms, ttfb_ms)
+            endpoint.last_sample = self._selections
+        endpoint.error_rate = ewma(endpoint.error_rate, 0.0)
+        endpoint.failures = 0
+        endpoint.retry_at = 0.0
+
+    def record_failure(self, endpoint: Endpoint) -> None:
+        """Fold one failed request in and back the endpoint off."""
+        endpoint.requests += 1
+        endpoint.errors += 1
+        endpoint.error_rate = ewma(endpoint.error_rate, 1.0)
+        endpoint.failures += 1
+        endpoint.last_sample = self._selections
+        backoff = BACKOFF_SECONDS * 2 ** (endpoint.failures - 1)
+        endpoint.retry_at = self._clock() + min(backoff, MAX_BACKOFF_SECONDS)
+
+    def as_dict(self) -> dict:
+        """Return per-endpoint statistics for diagnostics."""
+        return {endpoint.url: endpoint.as_dict() for endpoint in self.endpoints}
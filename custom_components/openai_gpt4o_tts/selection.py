@@ -0,0 +1,104 @@
+"""Pick the audio format and stream mode with the lowest observed latency."""
+
+from __future__ import annotations
+
+from dataclasses import asdict, dataclass
+
+from .metrics import ewma
+
+# Formats "auto" may pick.  Raw pcm has no header, so neither media players
+# nor Home Assistant's ffmpeg conversion can identify it.
+AUTO_FORMATS = ("wav", "mp3", "aac", "opus", "flac")
+# Without a preferred format nothing converts the audio, so "auto" only
+# uses the format every media player can play
+AUTO_FALLBACK_FORMAT = "mp3"
+# Models that only support raw audio streaming
+RAW_ONLY_MODELS = ("tts-1", "tts-1-hd")
+# Re-measure the stalest combination once every this many selections
+PROBE_EVERY = 20
+# Estimated cost of Home Assistant converting to the player's format
+TRANSCODE_PENALTY_MS = 150.0
+
+
+@dataclass
+class FormatStats:
+    """Latency and throughput observed for one (format, stream mode) pair."""
+
+    ttfb_ms: float | None = None
+    bytes_per_second: float | None = None
+    samples: int = 0
+    selected: int = 0
+    # Selection counter value when the last sample arrived
+    last_sample: int = 0
+
+
+class FormatSelector:
+    """Choose among (format, mode) pairs from live request measurements.
+
+    Combinations that were never measured are tried first; after that the
+    lowest expected time to first audio wins.  Every ``probe_every`` picks
+    the combination measured longest ago is used instead, so a pair that was
+    slow once is not excluded forever.
+    """
+
+    def __init__(self, probe_every: int = PROBE_EVERY) -> None:
+        self._probe_every = probe_every
+        self._stats: dict[tuple[str, str], FormatStats] = {}
+        self._selections = 0
+
+    def record(
+        self,
+        audio_format: str,
+        stream_mode: str,
+        ttfb_ms: float,
+        nbytes: int,
+        seconds: float,
+    ) -> None:
+        """Fold the measurements of one finished request in."""
+        stats = self._stats.setdefault((audio_format, stream_mode), FormatStats())
+        stats.ttfb_ms = ewma(stats.ttfb_ms, ttfb_ms)
+        if seconds > 0:
+            stats.bytes_per_second = ewma(stats.bytes_per_second, nbytes / seconds)
+        stats.samples += 1
+        stats.last_sample = self._selections
+
+    def _score(self, pair: tuple[str, str], preferred: str | None) -> float:
+        score = self._stats[pair].ttfb_ms
+        if preferred is not None and pair[0] != preferred:
+            score += TRANSCODE_PENALTY_MS
+        return score
+
+    def choose(
+        self,
+        formats: tuple[str, ...] = AUTO_FORMATS,
+        modes: tuple[str, ...] = ("audio", "sse"),
+        preferred: str | None = None,
+    ) -> tuple[str, str]:
+        """Return the ``(format, mode)`` pair to use for the next request."""
+        self._selections += 1
+        # Measure the player's own format first; it needs no conversion
+        formats = sorted(formats, key=lambda fmt: fmt != preferred)
+        pairs = [(fmt, mode) for fmt in formats for mode in modes]
+        pair = self._pick(pairs, preferred)
+        self._stats.setdefault(pair, FormatStats()).selected += 1
+        return pair
+
+    def _pick(self, pairs: list[tuple[str, str]], preferred: str | None):
+        for pair in pairs:
+            stats = self._stats.get(pair)
+            if stats is None or not (stats.selected or stats.samples):
+                return pair
+        # Pairs that were tried but never produced audio are skipped
+        measured = [pair for pair in pairs if self._stats[pair].ttfb_ms is not None]
+        if not measured:
+            return pairs[0]
+        if self._selections % self._probe_every == 0:
+            return min(measured, key=lambda pair: self._stats[pair].last_sample)
+        return min(measured, key=lambda pair: self._score(pair, preferred))
+
+    def as_dict(self) -> dict:
+        """Return the per-pair statistics for diagnostics."""
+        return {
+            f"{fmt}/{mode}": asdict(stats)
+            for (fmt, mode), stats in self._stats.items()
+        }
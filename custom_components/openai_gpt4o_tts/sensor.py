@@ -0,0 +1,86 @@
+"""Usage and savings sensors for OpenAI GPT-4o Mini TTS."""
+
+from homeassistant.components.sensor import SensorEntity, SensorStateClass
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import UnitOfTime
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.entity_platform import AddEntitiesCallback
+from homeassistant.helpers.event import async_track_time_change
+
+from .const import DOMAIN
+from .ledger import RETAIN_DAYS, UsageLedger
+
+# (ledger counter, name, unit)
+SENSORS = (
+    ("requests", "Requests today", None),
+    ("characters", "Characters today", "characters"),
+    ("audio_seconds", "Audio today", UnitOfTime.SECONDS),
+    ("cache_hits", "Cache hits today", None),
+    ("characters_saved", "Characters saved today", "characters"),
+    ("audio_seconds_saved", "Audio saved today", UnitOfTime.SECONDS),
+    ("downgraded", "Downgraded requests today", None),
+)
+
+
+async def async_setup_entry(
+    hass: HomeAssistant,
+    config_entry: ConfigEntry,
+    async_add_entities: AddEntitiesCallback,
+) -> None:
+    """Set up usage sensors from a config entry."""
+    ledger = hass.data[DOMAIN][config_entry.entry_id].ledger
+    async_add_entities(
+        UsageSensor(config_entry, ledger, counter, name, unit)
+        for counter, name, unit in SENSORS
+    )
+
+
+class UsageSensor(SensorEntity):
+    """One of today's ledger counters; resets at local midnight."""
+
+    _attr_should_poll = False
+    _attr_state_class = SensorStateClass.TOTAL_INCREASING
+
+    def __init__(
+        self,
+        config_entry: ConfigEntry,
+        ledger: UsageLedger,
+        counter: str,
+        name: str,
+        unit: str | None,
+    ) -> None:
+        self._ledger = ledger
+        self._counter = counter
+        self._attr_name = f"OpenAI GPT‑4o TTS {name}"
+        self._attr_unique_id = f"{config_entry.entry_id}-{counter}"
+        self._attr_native_unit_of_measurement = unit
+
+    async def async_added_to_hass(self) -> None:
+        """Update whenever the ledger records something, and at midnight."""
+        self.async_on_remove(self._ledger.async_add_listener(self.async_write_ha_state))
+        self.async_on_remove(
+            async_track_time_change(
+                self.hass, self._async_midnight, hour=0, minute=0, second=0
+            )
+        )
+
+    @callback
+    def _async_midnight(self, now) -> None:
+        self.async_write_ha_state()
+
+    @property
+    def native_value(self) -> float:
+        """Return today's value of the counter."""
+        return round(self._ledger.today()[self._counter], 1)
+
+    @property
+    def extra_state_attributes(self) -> dict:
+        """Per model/voice split for today and the retained-history total."""
+        total = self._ledger.totals()[self._counter]
+        return {
+            "by_model_voice": {
+                name: round(counters[self._counter], 1)
+                for name, counters in self._ledger.breakdown().items()
+            },
+            f"last_{RETAIN_DAYS}_days": round(total, 1),
+        }
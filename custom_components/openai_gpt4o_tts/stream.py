@@ -0,0 +1,181 @@
+"""Read-ahead buffering between the OpenAI response and the TTS consumers."""
+
+import asyncio
+from collections import deque
+from collections.abc import AsyncIterator
+
+from .metrics import ClientMetrics
+
+
+class StreamTee:
+    """One upstream stream, read ahead and shared by any number of readers.
+
+    The source is drained by a producer task the tee owns, started by the
+    first read.  It pauses once ``high_water`` bytes are buffered ahead of
+    the slowest reader and resumes when that reader is down to
+    ``low_water``, so the network is read in bursts instead of one chunk per
+    pull.  A reader leaving early does not stop it for the others; the
+    source is only closed once every reader has left.
+
+    With ``keep`` every chunk stays buffered, so readers may join at any
+    time and replay what arrived so far.  Otherwise chunks are dropped once
+    all readers have them, and only readers joining before that can follow.
+    """
+
+    def __init__(
+        self,
+        high_water: int,
+        low_water: int,
+        keep: bool = False,
+        metrics: ClientMetrics | None = None,
+    ) -> None:
+        self.high_water = high_water
+        self.low_water = min(low_water, high_water)
+        self.keep = keep
+        # Set by the source, for readers of a complete stream
+        self.duration = 0.0
+        self._metrics = metrics or ClientMetrics()
+        self._source: AsyncIterator[bytes] | None = None
+        self._producer: asyncio.Task | None = None
+        self._chunks: deque[bytes] = deque()
+        # Stream index and byte offset of the oldest buffered chunk
+        self._first = 0
+        self._first_offset = 0
+        self._produced = 0
+        # Bytes read so far, per reader
+        self._readers: dict[object, int] = {}
+        self._changed = asyncio.Event()
+        self._writable = asyncio.Event()
+        self._writable.set()
+        self._done = False
+        self._cancelled = False
+        self._complete = False
+        self._error: BaseException | None = None
+
+    @property
+    def complete(self) -> bool:
+        """Return whether the source ended normally."""
+        return self._complete
+
+    @property
+    def buffered(self) -> int:
+        """Return the number of bytes the slowest reader has yet to read."""
+        if not self._readers:
+            return 0
+        return self._produced - min(self._readers.values())
+
+    def attach(self, source: AsyncIterator[bytes]) -> None:
+        """Set the stream to drain once the first reader starts."""
+        self._source = source
+
+    def _wake(self) -> None:
+        # Readers wait on the event current when they ran dry
+        self._changed.set()
+        self._changed = asyncio.Event()
+
+    def _advanced(self) -> None:
+        """Drop chunks every reader has and resume a paused producer."""
+        if not self.keep and self._readers:
+            slowest = min(self._readers.values())
+            while self._chunks and self._first_offset + len(self._chunks[0]) <= slowest:
+                self._first_offset += len(self._chunks.popleft())
+                self._first += 1
+        if self.buffered <= self.low_water:
+            self._writable.set()
+
+    async def _put(self, chunk: bytes) -> None:
+        """Buffer ``chunk``, waiting while readers are too far behind."""
+        if self.buffered >= self.high_water:
+            self._writable.clear()
+            loop = asyncio.get_running_loop()
+            start = loop.time()
+            self._metrics.producer_stalls += 1
+            await self._writable.wait()
+            self._metrics.producer_stall_seconds += loop.time() - start
+        self._chunks.append(chunk)
+        self._produced += len(chunk)
+        if self.buffered > self._metrics.peak_buffered_bytes:
+            self._metrics.peak_buffered_bytes = self.buffered
+        self._wake()
+
+    async def _produce(self) -> None:
+        try:
+            async for chunk in self._source:
+                await self._put(chunk)
+        except asyncio.CancelledError:
+            raise
+        except Exception as err:  # noqa: BLE001 - re-raised in the readers
+            self._error = err
+        else:
+            self._complete = True
+        finally:
+            aclose = getattr(self._source, "aclose", None)
+            try:
+                if aclose is not None:
+                    await aclose()
+            finally:
+                self._done = True
+                self._wake()
+
+    async def reader(self) -> AsyncIterator[bytes]:
+        """Yield every chunk from the start, re-raising the source's error.
+
+        Yields nothing if every earlier reader had already left, and raises
+        RuntimeError if the start of the stream was already dropped.
+        """
+        if self._cancelled:
+            return
+        if self._first:
+            raise RuntimeError("The start of the stream was already dropped")
+        token = object()
+        self._readers[token] = 0
+        if self._producer is None:
+            self._producer = asyncio.get_running_loop().create_task(
+                self._produce()
+            )
+        index = 0
+        try:
+            while True:
+                while index < self._first + len(self._chunks):
+                    chunk = self._chunks[index - self._first]
+                    index += 1
+                    self._readers[token] += len(chunk)
+                    self._advanced()
+                    yield chunk
+                if self._done:
+                    if self._error is not None:
+                        raise self._error
+                    if not self._complete:
+                        raise RuntimeError("The stream was cut short")
+                    return
+                changed = self._changed
+                if index:
+                    loop = asyncio.get_running_loop()
+                    start = loop.time()
+                    self._metrics.consumer_stalls += 1
+                    await changed.wait()
+                    self._metrics.consumer_stall_seconds += loop.time() - start
+                else:
+                    await changed.wait()
+        finally:
+            del self._readers[token]
+            if self._readers or self._done:
+                self._advanced()
+            else:
+                # The last reader left; nobody needs the rest
+                self._cancelled = True
+                self._producer.cancel()
+                await asyncio.wait((self._producer,))
+
+    def data(self) -> bytes:
+        """Return what arrived so far; the whole stream only with ``keep``."""
+        return b"".join(self._chunks)
+
+    async def wait(self) -> bytes | None:
+        """Read the whole stream; None if it failed or was cut short."""
+        try:
+            async for _chunk in self.reader():
+                pass
+        except Exception:  # noqa: BLE001 - the caller renders it instead
+            return None
+        return self.data() if self.complete else None
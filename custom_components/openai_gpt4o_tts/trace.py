@@ -0,0 +1,136 @@
+"""Anonymized request traces for replaying real traffic against a stub API."""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import time
+
+from .metrics import RequestTiming
+from .request import SynthesisRequest
+
+_LOGGER = logging.getLogger(__name__)
+
+# Buffered records are appended after this many seconds or records
+TRACE_FLUSH_SECONDS = 10
+TRACE_FLUSH_RECORDS = 256
+# The trace is rotated to ``<file>.1`` once it grows past this size
+TRACE_MAX_BYTES = 16 * 1024 * 1024
+
+
+def trace_hash(salt: bytes, text: str) -> str:
+    """Return a short keyed hash of ``text``; equal texts hash equally."""
+    return hashlib.blake2b(text.encode(), digest_size=8, key=salt).hexdigest()
+
+
+def trace_record(
+    salt: bytes, request: SynthesisRequest, timing: RequestTiming, at: float
+) -> dict:
+    """Return the trace record of one request; no text leaves this function."""
+    return {
+        "t": round(at, 3),
+        "kind": timing.kind,
+        "chars": len(request.text),
+        "text": trace_hash(salt, request.text),
+        "instructions": (
+            trace_hash(salt, request.instructions) if request.instructions else ""
+        ),
+        "model": request.model,
+        "voice": request.voice,
+        "format": request.response_format,
+        "stream": request.stream_format,
+        "speed": request.speed,
+        "priority": request.priority,
+        "ttfb_ms": (
+            None if timing.first_audio_ms is None else round(timing.first_audio_ms, 1)
+        ),
+        "total_ms": round(timing.total_ms, 1),
+        "bytes": timing.size,
+        "outcome": timing.outcome,
+    }
+
+
+def trace_salt(api_key: str) -> bytes:
+    """Return the hash key for an entry's trace, secret like its API key."""
+    return hashlib.blake2b(
+        api_key.encode(), digest_size=32, person=b"gpt4o-tts-trace"
+    ).digest()
+
+
+def load_trace(path: str) -> list[dict]:
+    """Return the records of a trace file, oldest first."""
+    with open(path, encoding="utf-8") as trace:
+        records = [json.loads(line) for line in trace if line.strip()]
+    records.sort(key=lambda record: record["t"])
+    return records
+
+
+class TraceRecorder:
+    """Append one compact JSON line per request to a trace file.
+
+    Texts and instructions are stored as hashes keyed with ``salt``, which is
+    kept out of the file, so repeats stay visible without revealing what was
+    said.  Records are buffered and written in the executor.
+    """
+
+    def __init__(self, hass, path: str, salt: bytes) -> None:
+        self.hass = hass
+        self.path = path
+        self._salt = salt
+        self._pending: list[str] = []
+        self._flush_handle: asyncio.TimerHandle | None = None
+        self._writing: asyncio.Future | None = None
+
+    def record(self, request: SynthesisRequest, timing: RequestTiming) -> None:
+        """Buffer the trace record of a finished request."""
+        self._pending.append(
+            json.dumps(
+                trace_record(self._salt, request, timing, time.time()),
+                separators=(",", ":"),
+            )
+        )
+        if len(self._pending) >= TRACE_FLUSH_RECORDS:
+            self._flush()
+        elif self._flush_handle is None:
+            self._flush_handle = asyncio.get_running_loop().call_later(
+                TRACE_FLUSH_SECONDS, self._flush
+            )
+
+    def _flush(self) -> None:
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        if not self._pending or self._writing is not None:
+            # The running write picks the rest up when it is done
+            return
+        lines, self._pending = self._pending, []
+        self._writing = self.hass.async_add_executor_job(self._write, lines)
+        self._writing.add_done_callback(self._written)
+
+    def _written(self, future: asyncio.Future) -> None:
+        self._writing = None
+        if not future.cancelled() and future.exception() is not None:
+            _LOGGER.warning("Could not write GPT-4o TTS trace: %s", future.exception())
+        if self._pending:
+            self._flush()
+
+    def _write(self, lines: list[str]) -> None:
+        """Append ``lines``, rotating the file when it is full."""
+        try:
+            if os.path.getsize(self.path) >= TRACE_MAX_BYTES:
+                os.replace(self.path, f"{self.path}.1")
+        except FileNotFoundError:
+            pass
+        with open(self.path, "a", encoding="utf-8") as trace:
+            trace.write("\n".join(lines) + "\n")
+
+    async def async_close(self) -> None:
+        """Write out everything buffered."""
+        while self._pending or self._writing is not None:
+            self._flush()
+            if self._writing is not None:
+                # Failures are logged by _written
+                await asyncio.wait([self._writing])
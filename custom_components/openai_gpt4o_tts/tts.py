@@ -23,8 +23,20 @@ from .const import (
     CONF_PLAYBACK_SPEED,
     CONF_MODEL,
     CONF_STREAM_FORMAT,
+    AUTO,
+    CONF_FIRST_CHUNK_MS,
+    CONF_CHUNK_MS,
+    DATA_USAGE,
+    DATA_QUEUES,
+    ATTR_PRIORITY,
+    ATTR_BATCH,
+    DATA_EARCONS,
 )
+from .announce import AnnouncementQueues
+from .dialogue import Dialogue, line_options, parse_dialogue
+from .earcon import EarconMasker
 from .gpt4o import GPT4oClient
+from .usage import UsageTracker
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -36,18 +48,38 @@ async def async_setup_entry(
 ) -> None:
     """Set up GPT‑4o TTS from a config entry."""
     client = hass.data[DOMAIN][config_entry.entry_id]
-    async_add_entities([OpenAIGPT4oTTSProvider(config_entry, client)])
+    usage = hass.data.get(DATA_USAGE, {}).get(config_entry.entry_id)
+    queues = hass.data.get(DATA_QUEUES, {}).get(config_entry.entry_id)
+    earcons = hass.data.get(DATA_EARCONS, {}).get(config_entry.entry_id)
+    async_add_entities(
+        [OpenAIGPT4oTTSProvider(config_entry, client, usage, queues, earcons)]
+    )
 
 
 class OpenAIGPT4oTTSProvider(TextToSpeechEntity):
     """GPT‑4o TTS => 'tts.openai_gpt4o_tts_say' in Developer Tools."""
 
-    def __init__(self, config_entry: ConfigEntry, client: GPT4oClient) -> None:
+    def __init__(
+        self,
+        config_entry: ConfigEntry,
+        client: GPT4oClient,
+        usage: UsageTracker | None = None,
+        queues: AnnouncementQueues | None = None,
+        earcons: EarconMasker | None = None,
+    ) -> None:
         self._config_entry = config_entry
         self._client = client
+        self._usage = usage
+        self._queues = queues
+        self._earcons = earcons
         self._name = "OpenAI GPT‑4o Mini TTS"
         self._attr_unique_id = f"{config_entry.entry_id}-tts"
 
+    async def async_added_to_hass(self) -> None:
+        """Let queued announcements be played through this entity."""
+        if self._queues is not None:
+            self._queues.engine = self.entity_id
+
     @property
     def name(self) -> str:
         """Friendly name for the entity listing."""
@@ -78,12 +110,26 @@ class OpenAIGPT4oTTSProvider(TextToSpeechEntity):
             CONF_PLAYBACK_SPEED,
             CONF_MODEL,
             CONF_STREAM_FORMAT,
+            CONF_FIRST_CHUNK_MS,
+            CONF_CHUNK_MS,
+            ATTR_PRIORITY,
+            ATTR_BATCH,
         ]
 
     async def async_get_tts_audio(
         self, message: str, language: str, options: dict | None = None
     ) -> TtsAudioType:
         """Called by Home Assistant to produce audio from text."""
+        batch = self._queued_batch(message, options)
+        if batch is not None:
+            audio_format, chunks = batch
+            return audio_format, b"".join([chunk async for chunk in chunks])
+        dialogue = self._dialogue(message, options)
+        if dialogue is not None:
+            audio = b"".join([chunk async for chunk in dialogue.stream()])
+            return (dialogue.audio_format, audio) if audio else (None, None)
+        if self._usage is not None:
+            self._usage.record(message, options)
         audio_format, audio_data = await self._client.get_tts_audio(message, options)
         if not audio_data:
             return None, None
@@ -95,9 +141,19 @@ class OpenAIGPT4oTTSProvider(TextToSpeechEntity):
         """Stream audio chunks as they are generated."""
         message = "".join([chunk async for chunk in request.message_gen])
         options = dict(request.options or {})
+        batch = self._queued_batch(message, options)
+        if batch is not None:
+            return TTSAudioResponse(*batch)
+        dialogue = self._dialogue(message, options)
+        if dialogue is not None:
+            return TTSAudioResponse(dialogue.audio_format, dialogue.stream())
+        if self._usage is not None:
+            self._usage.record(message, options)
 
         stream_format = options.get(CONF_STREAM_FORMAT, self._client.stream_format)
-        if stream_format != "sse":
+        # "auto" streams too; the client picks the transport per request.
+        # Acknowledgements need audio passed on as it arrives, so they do too.
+        if stream_format not in ("sse", AUTO) and self._earcons is None:
             ext, data = await self._client.get_tts_audio(message, options)
             if not data or not ext:
                 raise HomeAssistantError(
@@ -112,8 +168,37 @@ class OpenAIGPT4oTTSProvider(TextToSpeechEntity):
         ext, iterator = await self._client.stream_tts_audio(message, options)
         if not iterator or not ext:
             raise HomeAssistantError(f"No TTS from {self.entity_id} for '{message}'")
+        if self._earcons is not None:
+            iterator = self._earcons.mask(iterator, ext, options)
         return TTSAudioResponse(ext, iterator)
 
+    def _queued_batch(self, message: str, options: dict | None):
+        """Return ``(format, chunks)`` of a queued batch, None for normal calls."""
+        batch_id = (options or {}).get(ATTR_BATCH)
+        if batch_id is None:
+            return None
+        batch = self._queues.stream(batch_id) if self._queues is not None else None
+        if batch is None:
+            raise HomeAssistantError(
+                f"Queued announcement '{message}' is no longer available"
+            )
+        return batch
+
+    def _dialogue(self, message: str, options: dict | None) -> Dialogue | None:
+        """Start rendering a multi-voice script, None for ordinary text."""
+        lines = parse_dialogue(message)
+        if lines is None:
+            return None
+        dialogue = Dialogue(self._client, lines, dict(options or {}))
+        if self._usage is not None:
+            # Lines are tracked one by one, as they are requested and cached
+            for line in lines:
+                self._usage.record(
+                    line.text,
+                    line_options(line, options or {}, dialogue.audio_format),
+                )
+        return dialogue
+
     def async_get_supported_voices(self, language: str) -> list[Voice] | None:
         """Return known GPT‑4o voices for the voice dropdown."""
         return [Voice(vid, vid.capitalize()) for vid in OPENAI_TTS_VOICES]
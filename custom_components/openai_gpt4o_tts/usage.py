@@ -0,0 +1,93 @@
+"""Bounded message frequency tracking for cache warming."""
+
+import hashlib
+import re
+from array import array
+
+# Count-min sketch dimensions; memory is depth * width floats
+SKETCH_WIDTH = 2048
+SKETCH_DEPTH = 4
+# Candidate phrases kept for warming
+DEFAULT_CAPACITY = 64
+# Longer messages (LLM replies) essentially never repeat
+MAX_TRACKED_LENGTH = 500
+# Options that change the rendered audio and must be replayed when warming
+WARM_OPTION_KEYS = ("voice", "instructions", "audio_output", "model", "playback_speed")
+
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+def normalize_message(message: str) -> str:
+    """Return ``message`` with whitespace collapsed and case folded."""
+    return _WHITESPACE_RE.sub(" ", message).strip().casefold()
+
+
+class UsageTracker:
+    """Decayed count-min sketch with a fixed-size heavy-hitter table.
+
+    Every message updates the sketch, whose size never changes.  Only the
+    ``capacity`` highest estimates keep their text around so they can be
+    re-rendered; a new phrase replaces the coldest one once its estimate
+    overtakes it.
+    """
+
+    def __init__(
+        self,
+        capacity: int = DEFAULT_CAPACITY,
+        width: int = SKETCH_WIDTH,
+        depth: int = SKETCH_DEPTH,
+    ) -> None:
+        self.capacity = capacity
+        self._width = width
+        self._rows = [array("f", bytes(4 * width)) for _ in range(depth)]
+        # tracking key -> [estimate, message, options]
+        self._hot: dict[str, list] = {}
+
+    def _slots(self, key: str) -> list[int]:
+        digest = hashlib.blake2b(key.encode(), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        return [(h1 + row * h2) % self._width for row in range(len(self._rows))]
+
+    def record(self, message: str, options: dict | None = None) -> float:
+        """Count one use of ``message`` and return its estimated frequency."""
+        if not message or len(message) > MAX_TRACKED_LENGTH:
+            return 0.0
+        options = {
+            key: value
+            for key, value in (options or {}).items()
+            if key in WARM_OPTION_KEYS
+        }
+        key = normalize_message(message) + "\0" + repr(sorted(options.items()))
+
+        estimate = None
+        for row, slot in zip(self._rows, self._slots(key)):
+            row[slot] += 1.0
+            if estimate is None or row[slot] < estimate:
+                estimate = row[slot]
+
+        if key in self._hot or len(self._hot) < self.capacity:
+            self._hot[key] = [estimate, message, options]
+        else:
+            coldest = min(self._hot, key=lambda k: self._hot[k][0])
+            if self._hot[coldest][0] < estimate:
+                del self._hot[coldest]
+                self._hot[key] = [estimate, message, options]
+        return estimate
+
+    def decay(self, factor: float = 0.5) -> None:
+        """Age every count so recent traffic dominates."""
+        for row in self._rows:
+            for slot in range(len(row)):
+                row[slot] *= factor
+        for item in self._hot.values():
+            item[0] *= factor
+
+    def top(self, count: int, min_estimate: float = 0.0) -> list[tuple[str, dict]]:
+        """Return up to ``count`` hottest ``(message, options)`` pairs."""
+        ranked = sorted(self._hot.values(), key=lambda item: item[0], reverse=True)
+        return [
+            (message, dict(options))
+            for estimate, message, options in ranked[:count]
+            if estimate >= min_estimate
+        ]
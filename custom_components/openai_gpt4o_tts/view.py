@@ -0,0 +1,175 @@
+"""HTTP view serving cached clips straight from the segment store."""
+
+from __future__ import annotations
+
+import asyncio
+import re
+from datetime import timedelta
+
+from aiohttp import web
+from homeassistant.components.http import HomeAssistantView
+from homeassistant.components.http.auth import async_sign_path
+from homeassistant.core import HomeAssistant
+
+from .cache import ClipFile
+from .const import DOMAIN
+
+CLIP_URL = f"/api/{DOMAIN}/clip/{{entry_id}}/{{key}}"
+# Signed clip URLs handed to media players stay valid this long
+CLIP_URL_EXPIRY = timedelta(days=1)
+# Players revalidate with the ETag after this
+CACHE_CONTROL = "private, max-age=86400"
+# Read size when the transport cannot sendfile (e.g. TLS)
+FALLBACK_CHUNK_SIZE = 64 * 1024
+
+CONTENT_TYPES = {
+    "mp3": "audio/mpeg",
+    "opus": "audio/ogg",
+    "aac": "audio/aac",
+    "flac": "audio/flac",
+    "wav": "audio/wav",
+    "pcm": "audio/L16;rate=24000;channels=1",
+}
+
+_KEY_RE = re.compile(r"[0-9a-f]{32}")
+
+
+def async_clip_url(hass: HomeAssistant, entry_id: str, key: str) -> str:
+    """Return a signed path a media player can fetch ``key`` from."""
+    return async_sign_path(
+        hass,
+        CLIP_URL.format(entry_id=entry_id, key=key),
+        CLIP_URL_EXPIRY,
+        use_content_user=True,
+    )
+
+
+def _byte_range(request: web.Request, length: int) -> tuple[int, int] | None:
+    """Return the ``(start, stop)`` requested, None for the whole clip.
+
+    Raises ``HTTPRequestRangeNotSatisfiable`` for ranges outside the clip.
+    """
+    try:
+        rng = request.http_range
+    except ValueError:
+        # Malformed or multi-part ranges; RFC 9110 allows ignoring them
+        return None
+    start, stop = rng.start, rng.stop
+    if start is None and stop is None:
+        return None
+    if start is None:
+        start = 0
+    elif start < 0:
+        # Suffix range "-N": the last N bytes
+        start, stop = max(0, length + start), length
+    if stop is None or stop > length:
+        stop = length
+    if start >= length or start >= stop:
+        raise web.HTTPRequestRangeNotSatisfiable(
+            headers={"Content-Range": f"bytes */{length}"}
+        )
+    return start, stop
+
+
+class CachedClipView(HomeAssistantView):
+    """Serve cached audio with Range, ETag and zero-copy sendfile."""
+
+    url = CLIP_URL
+    name = f"api:{DOMAIN}:clip"
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        self.hass = hass
+
+    async def get(
+        self, request: web.Request, entry_id: str, key: str
+    ) -> web.StreamResponse:
+        """Return the clip or the requested part of it."""
+        return await self._serve(request, entry_id, key, body=True)
+
+    async def head(
+        self, request: web.Request, entry_id: str, key: str
+    ) -> web.StreamResponse:
+        """Return the clip headers; some players probe before fetching."""
+        return await self._serve(request, entry_id, key, body=False)
+
+    async def _serve(
+        self, request: web.Request, entry_id: str, key: str, body: bool
+    ) -> web.StreamResponse:
+        client = self.hass.data.get(DOMAIN, {}).get(entry_id)
+        if client is None or client.cache is None or not _KEY_RE.fullmatch(key):
+            raise web.HTTPNotFound()
+        clip = await self.hass.async_add_executor_job(client.cache.open_clip, key)
+        if clip is None:
+            raise web.HTTPNotFound()
+        try:
+            return await self._respond(request, clip, body)
+        finally:
+            await self.hass.async_add_executor_job(clip.file.close)
+
+    async def _respond(
+        self, request: web.Request, clip: ClipFile, body: bool
+    ) -> web.StreamResponse:
+        etag = f'"{clip.etag}"'
+        headers = {
+            "ETag": etag,
+            "Cache-Control": CACHE_CONTROL,
+            "Accept-Ranges": "bytes",
+            "Content-Type": CONTENT_TYPES.get(
+                clip.audio_format, "application/octet-stream"
+            ),
+        }
+        if etag in request.headers.get("If-None-Match", ""):
+            return web.Response(status=304, headers=headers)
+
+        status, start, stop = 200, 0, clip.length
+        if_range = request.headers.get("If-Range")
+        if if_range is None or if_range == etag:
+            byte_range = _byte_range(request, clip.length)
+            if byte_range is not None:
+                start, stop = byte_range
+                status = 206
+                headers["Content-Range"] = f"bytes {start}-{stop - 1}/{clip.length}"
+
+        resp = web.StreamResponse(status=status, headers=headers)
+        resp.content_length = stop - start
+        await resp.prepare(request)
+        if body and stop > start:
+            await self._send(request, resp, clip, clip.offset + start, stop - start)
+        await resp.write_eof()
+        return resp
+
+    async def _send(
+        self,
+        request: web.Request,
+        resp: web.StreamResponse,
+        clip: ClipFile,
+        offset: int,
+        count: int,
+    ) -> None:
+        """Copy ``count`` bytes at ``offset`` to the client."""
+        transport = request.transport
+        if transport is not None:
+            try:
+                # The kernel copies page cache to socket; falls back to
+                # read/send itself when os.sendfile is not usable
+                await asyncio.get_running_loop().sendfile(
+                    transport, clip.file, offset, count
+                )
+                return
+            except NotImplementedError:
+                pass
+        while count > 0:
+            data = await self.hass.async_add_executor_job(
+                _read_at, clip.file, offset, min(count, FALLBACK_CHUNK_SIZE)
+            )
+            if not data:
+                break
+            await resp.write(data)
+            offset += len(data)
+            count -= len(data)
+
+
+def _read_at(fobj, offset: int, size: int) -> bytes:
+    """Read ``size`` bytes at ``offset``; runs in the executor."""
+    fobj.seek(offset)
+    return fobj.read(size)
@@ -0,0 +1,252 @@
+"""Wyoming protocol TTS server streaming GPT-4o audio straight to satellites."""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import json
+import logging
+import re
+
+from aiohttp import ClientError
+
+from .const import (
+    CONF_AUDIO_OUTPUT,
+    CONF_VOICE,
+    OPENAI_TTS_VOICES,
+    SUPPORTED_LANGUAGES,
+)
+from .gpt4o import GPT4oClient
+
+_LOGGER = logging.getLogger(__name__)
+
+WYOMING_VERSION = "1.5.4"
+# OpenAI's raw PCM: 24 kHz, 16 bit, mono
+PCM_RATE = 24000
+PCM_WIDTH = 2
+PCM_CHANNELS = 1
+# Streamed text is spoken a sentence at a time, as soon as one is complete
+_SENTENCE_END = re.compile(r"(?<=[.!?])\s+")
+# Events larger than this are refused instead of read into memory
+MAX_EVENT_BYTES = 1024 * 1024
+
+_ATTRIBUTION = {"name": "OpenAI", "url": "https://openai.com"}
+_AUDIO_FORMAT = {"rate": PCM_RATE, "width": PCM_WIDTH, "channels": PCM_CHANNELS}
+_TTS_FAILED = {"text": "GPT-4o TTS failed", "code": "tts-failed"}
+
+
+async def read_event(
+    reader: asyncio.StreamReader,
+) -> tuple[str, dict, bytes] | None:
+    """Return the next ``(type, data, payload)``, or None at end of stream.
+
+    Raises ValueError for events that are not well-formed.
+    """
+    line = await reader.readline()
+    if not line:
+        return None
+    header = json.loads(line)
+    if not isinstance(header, dict) or not header.get("type"):
+        raise ValueError("Wyoming event without a type")
+    data = _object(header.get("data") or {}, "data")
+    data_length = header.get("data_length") or 0
+    payload_length = header.get("payload_length") or 0
+    if not isinstance(data_length, int) or not isinstance(payload_length, int):
+        raise ValueError("Wyoming event with a non-integer length")
+    if min(data_length, payload_length) < 0:
+        raise ValueError("Wyoming event with a negative length")
+    if data_length + payload_length > MAX_EVENT_BYTES:
+        raise ValueError(f"Wyoming event of {data_length + payload_length} bytes")
+    if data_length:
+        extra = json.loads(await reader.readexactly(data_length))
+        data = {**data, **_object(extra, "data")}
+    payload = await reader.readexactly(payload_length) if payload_length else b""
+    if data.get("voice") is not None:
+        _object(data["voice"], "voice")
+    if not isinstance(data.get("text", ""), str):
+        raise ValueError("Wyoming event text is not a string")
+    return header.get("type"), data, payload
+
+
+def _object(value, name: str) -> dict:
+    """Return ``value``, raising ValueError unless it is a JSON object."""
+    if not isinstance(value, dict):
+        raise ValueError(f"Wyoming event {name} is not an object")
+    return value
+
+
+def write_event(
+    writer: asyncio.StreamWriter,
+    event_type: str,
+    data: dict | None = None,
+    payload: bytes = b"",
+) -> None:
+    """Queue one event on ``writer``."""
+    header: dict = {"type": event_type, "version": WYOMING_VERSION}
+    body = json.dumps(data).encode() if data else b""
+    if body:
+        header["data_length"] = len(body)
+    if payload:
+        header["payload_length"] = len(payload)
+    writer.write(json.dumps(header).encode() + b"\n" + body)
+    if payload:
+        # Audio is written as is, without copying it into the header
+        writer.write(payload)
+
+
+def _info() -> dict:
+    voices = [
+        {
+            "name": voice,
+            "description": voice.capitalize(),
+            "attribution": _ATTRIBUTION,
+            "installed": True,
+            "version": None,
+            "languages": SUPPORTED_LANGUAGES,
+        }
+        for voice in OPENAI_TTS_VOICES
+    ]
+    return {
+        "tts": [
+            {
+                "name": "openai_gpt4o_tts",
+                "description": "OpenAI GPT-4o mini TTS",
+                "attribution": _ATTRIBUTION,
+                "installed": True,
+                "version": None,
+                "voices": voices,
+                "supports_synthesize_streaming": True,
+            }
+        ]
+    }
+
+
+class WyomingServer:
+    """Serve ``synthesize`` requests from Wyoming satellites over TCP.
+
+    Audio is requested as raw PCM and forwarded as ``audio-chunk`` events as
+    it arrives, through the client's cache, so satellites skip Home
+    Assistant's TTS proxy and its full-file buffering.
+    """
+
+    def __init__(self, client: GPT4oClient, host: str, port: int) -> None:
+        self.client = client
+        self.host = host
+        self.port = port
+        self._server: asyncio.Server | None = None
+        self._connections: set[asyncio.Task] = set()
+
+    async def async_start(self) -> None:
+        """Start listening on ``host`` and ``port``.
+
+        Setup treats port 0 as disabled and never starts the server with
+        it; started directly, port 0 binds a free port, stored in ``port``.
+        """
+        try:
+            self._server = await asyncio.start_server(
+                self._handle, self.host, self.port
+            )
+        except OSError as err:
+            _LOGGER.error(
+                "Cannot start GPT-4o Wyoming server on %s:%s: %s",
+                self.host,
+                self.port,
+                err,
+            )
+            return
+        self.port = self._server.sockets[0].getsockname()[1]
+        _LOGGER.debug(
+            "GPT-4o Wyoming server listening on %s:%s", self.host, self.port
+        )
+
+    async def async_stop(self) -> None:
+        """Stop listening and drop open connections."""
+        if self._server is None:
+            return
+        self._server.close()
+        for task in list(self._connections):
+            task.cancel()
+        await asyncio.gather(*self._connections, return_exceptions=True)
+        await self._server.wait_closed()
+        self._server = None
+
+    async def _handle(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        task = asyncio.current_task()
+        self._connections.add(task)
+        try:
+            await self._serve(reader, writer)
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        except ValueError as err:
+            _LOGGER.warning("Bad event from Wyoming client: %s", err)
+        finally:
+            self._connections.discard(task)
+            writer.close()
+            with contextlib.suppress(ConnectionError):
+                await writer.wait_closed()
+
+    async def _serve(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        # Text and voice of a streamed synthesis, None outside of one
+        streaming: list[str] | None = None
+        voice = None
+        started = False
+        while (event := await read_event(reader)) is not None:
+            event_type, data, _payload = event
+            if event_type == "describe":
+                write_event(writer, "info", _info())
+            elif event_type == "synthesize" and streaming is None:
+                # Clients that stream text also send this; it is ignored then
+                if await self._speak(writer, data.get("text", ""), data.get("voice")):
+                    write_event(writer, "audio-stop")
+            elif event_type == "synthesize-start":
+                streaming, voice, started = [], data.get("voice"), False
+            elif event_type == "synthesize-chunk" and streaming is not None:
+                streaming.append(data.get("text", ""))
+                *sentences, rest = _SENTENCE_END.split("".join(streaming))
+                streaming[:] = [rest]
+                for sentence in sentences:
+                    started = await self._speak(writer, sentence, voice, started)
+            elif event_type == "synthesize-stop" and streaming is not None:
+                text = "".join(streaming)
+                if text.strip():
+                    started = await self._speak(writer, text, voice, started)
+                if started:
+                    write_event(writer, "audio-stop")
+                write_event(writer, "synthesize-stopped")
+                streaming = None
+            await writer.drain()
+
+    async def _speak(
+        self,
+        writer: asyncio.StreamWriter,
+        text: str,
+        voice: dict | None,
+        started: bool = False,
+    ) -> bool:
+        """Stream ``text`` as audio events; return whether audio-start was sent."""
+        options = {CONF_AUDIO_OUTPUT: "pcm"}
+        name = (voice or {}).get("name")
+        if name in OPENAI_TTS_VOICES:
+            options[CONF_VOICE] = name
+        _fmt, chunks = await self.client.stream_tts_audio(text, options)
+        sent = False
+        try:
+            if chunks is not None:
+                async with contextlib.aclosing(chunks):
+                    async for chunk in chunks:
+                        if not started:
+                            write_event(writer, "audio-start", _AUDIO_FORMAT)
+                            started = True
+                        write_event(writer, "audio-chunk", _AUDIO_FORMAT, chunk)
+                        sent = True
+                        # Forward as it arrives, at the pace the satellite reads
+                        await writer.drain()
+        except (ClientError, asyncio.TimeoutError) as err:
+            _LOGGER.error("GPT-4o TTS stream for Wyoming failed: %s", err)
+        if not sent:
+            write_event(writer, "error", _TTS_FAILED)
+        return started
@@ -0,0 +1,200 @@
+"""Replay a recorded request trace against a local stub of the OpenAI API.
+
+Enable "Record request trace" in the integration options, let it collect
+real traffic, then copy ``openai_gpt4o_tts.trace.<entry_id>.jsonl`` from the
+config directory and run, from the repository root::
+
+    python scripts/replay_trace.py openai_gpt4o_tts.trace.<entry_id>.jsonl \\
+        --rate 4 --cache-mb 64 --stub-delay 0.3
+
+Requests are re-issued through ``GPT4oClient`` at their recorded offsets,
+``--rate`` times faster.  Texts are stand-ins of the recorded length, equal
+whenever the recorded hashes are equal, so cache hits and repeated phrases
+behave as they did in production.  The summary compares replayed and
+recorded time to first audio, and counts what reached the API.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import tempfile
+from types import SimpleNamespace
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path[:0] = [os.path.join(ROOT, "tests"), ROOT]
+
+from hass_stubs import install_homeassistant_stubs  # noqa: E402
+from stub_api import StubSpeechAPI  # noqa: E402
+
+install_homeassistant_stubs()
+
+from custom_components.openai_gpt4o_tts import gpt4o  # noqa: E402
+from custom_components.openai_gpt4o_tts.trace import load_trace  # noqa: E402
+
+
+def stand_in_text(record: dict) -> str:
+    """Return a text of the recorded length, unique to the recorded hash."""
+    seed = f"{record['text']} "
+    return (seed * (record["chars"] // len(seed) + 1))[: max(1, record["chars"])]
+
+
+def request_options(record: dict) -> dict:
+    """Return the per-call options that reproduce a recorded request."""
+    return {
+        "model": record["model"],
+        "voice": record["voice"],
+        "audio_output": record["format"],
+        "stream_format": record["stream"],
+        "playback_speed": record["speed"],
+        "instructions": record["instructions"],
+        "priority": record["priority"],
+    }
+
+
+def _percentiles(values: list[float]) -> str:
+    if not values:
+        return "-"
+    ordered = sorted(values)
+    p50 = ordered[len(ordered) // 2]
+    p95 = ordered[min(len(ordered) - 1, int(0.95 * len(ordered)))]
+    return f"p50 {p50:.0f} ms, p95 {p95:.0f} ms, max {ordered[-1]:.0f} ms"
+
+
+async def _issue(client: gpt4o.GPT4oClient, record: dict) -> None:
+    text, options = stand_in_text(record), request_options(record)
+    if record["kind"] == "stream":
+        _fmt, chunks = await client.stream_tts_audio(text, options)
+        if chunks is not None:
+            async for _chunk in chunks:
+                pass
+    else:
+        await client.get_tts_audio(text, options)
+
+
+async def replay(
+    records: list[dict],
+    endpoint: str,
+    rate: float = 1.0,
+    cache_mb: int = 0,
+    options: dict | None = None,
+) -> dict:
+    """Re-issue ``records`` against ``endpoint`` and return a summary."""
+    loop = asyncio.get_running_loop()
+    hass = SimpleNamespace(
+        async_add_executor_job=lambda func, *args: loop.run_in_executor(
+            None, func, *args
+        )
+    )
+    entry = SimpleNamespace(
+        entry_id="replay", data={"api_key": "replay"}, options=options or {}
+    )
+    gpt4o.OPENAI_TTS_ENDPOINT = endpoint
+    client = gpt4o.GPT4oClient(hass, entry)
+    timings = []
+    client.async_add_request_observer(lambda request, timing: timings.append(timing))
+    with tempfile.TemporaryDirectory() as cache_dir:
+        if cache_mb:
+            await client.async_load_cache(cache_dir, cache_mb * 1024 * 1024)
+        tasks = []
+        if records:
+            start, origin = loop.time(), records[0]["t"]
+            for record in records:
+                delay = start + (record["t"] - origin) / rate - loop.time()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+                tasks.append(loop.create_task(_issue(client, record)))
+            await asyncio.gather(*tasks)
+        await client.async_close()
+
+    outcomes: dict[str, int] = {}
+    ttfb: dict[str, list[float]] = {}
+    recorded: dict[str, list[float]] = {}
+    for timing in timings:
+        outcomes[timing.outcome] = outcomes.get(timing.outcome, 0) + 1
+        if timing.first_audio_ms is not None:
+            ttfb.setdefault(timing.kind, []).append(timing.first_audio_ms)
+    for record in records:
+        if record["ttfb_ms"] is not None:
+            recorded.setdefault(record["kind"], []).append(record["ttfb_ms"])
+    return {
+        "requests": len(timings),
+        "outcomes": outcomes,
+        "ttfb": ttfb,
+        "recorded_ttfb": recorded,
+    }
+
+
+async def _main(args: argparse.Namespace) -> None:
+    records = load_trace(args.trace)
+    if args.limit:
+        records = records[: args.limit]
+    stub = None
+    endpoint = args.endpoint
+    if endpoint is None:
+        stub = StubSpeechAPI(
+            chunks=args.stub_chunks,
+            chunk_size=args.stub_chunk_size,
+            delay=args.stub_delay,
+            interval=args.stub_interval,
+        )
+        stub.keep_payloads = False
+        stub.real_mp3 = True
+        endpoint = await stub.start()
+    try:
+        summary = await replay(
+            records, endpoint, args.rate, args.cache_mb, json.loads(args.options)
+        )
+    finally:
+        if stub is not None:
+            await stub.close()
+
+    span = (records[-1]["t"] - records[0]["t"]) / args.rate if records else 0
+    print(f"replayed {summary['requests']} requests over {span:.1f} s")
+    print(f"outcomes: {summary['outcomes']}")
+    if stub is not None:
+        upstream = stub.requests
+        print(
+            f"upstream: {upstream} requests ({summary['requests'] - upstream} "
+            f"served locally), peak {stub.peak_active} concurrent"
+        )
+    # A get hands over its audio all at once, so its first audio is its total
+    for kind in ("stream", "get"):
+        if kind not in summary["ttfb"] and kind not in summary["recorded_ttfb"]:
+            continue
+        replayed = _percentiles(summary["ttfb"].get(kind, []))
+        recorded = _percentiles(summary["recorded_ttfb"].get(kind, []))
+        print(f"{kind} first audio: replayed {replayed}; recorded {recorded}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("trace", help="trace file recorded by the integration")
+    parser.add_argument(
+        "--rate", type=float, default=1.0, help="speed-up over the recorded rate"
+    )
+    parser.add_argument("--limit", type=int, default=0, help="replay the first N")
+    parser.add_argument(
+        "--cache-mb", type=int, default=0, help="local clip cache size; 0 disables"
+    )
+    parser.add_argument(
+        "--options", default="{}", help="entry options as JSON, e.g. read-ahead"
+    )
+    parser.add_argument(
+        "--endpoint", help="speech endpoint to use instead of the built-in stub"
+    )
+    parser.add_argument("--stub-delay", type=float, default=0.3)
+    parser.add_argument("--stub-interval", type=float, default=0.05)
+    parser.add_argument("--stub-chunks", type=int, default=8)
+    parser.add_argument("--stub-chunk-size", type=int, default=4096)
+    args = parser.parse_args()
+    if args.rate <= 0:
+        parser.error("--rate must be positive")
+    asyncio.run(_main(args))
+
+
+if __name__ == "__main__":
+    main()
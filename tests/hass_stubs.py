@@ -1,9 +1,46 @@
 from __future__ import annotations
 
+import asyncio
+import os
 import sys
 import types
 from dataclasses import dataclass
+from datetime import datetime
 from collections.abc import AsyncGenerator
+from types import SimpleNamespace
+
+
+class FakeHass:
+    """The parts of Home Assistant the client and its helpers use.
+
+    Paths resolve under ``config_dir``; fired events are kept in ``events``
+    and functions sent to the executor in ``executor_calls``.
+    """
+
+    def __init__(self, config_dir: str = "") -> None:
+        self.data: dict = {}
+        self.config = SimpleNamespace(
+            path=lambda *parts: os.path.join(config_dir, *parts)
+        )
+        self.events: list[tuple[str, dict]] = []
+        self.bus = SimpleNamespace(
+            async_fire=lambda event, data: self.events.append((event, data))
+        )
+        self.executor_calls: list = []
+
+    def async_add_executor_job(self, func, *args):
+        # Like Home Assistant, return a future rather than a coroutine
+        self.executor_calls.append(func)
+        return asyncio.get_running_loop().run_in_executor(None, func, *args)
+
+
+def fake_entry(
+    options: dict | None = None, entry_id: str = "e", **attrs
+) -> SimpleNamespace:
+    """Return a config entry with an API key, ``options`` and ``attrs``."""
+    return SimpleNamespace(
+        entry_id=entry_id, data={"api_key": "k"}, options=options or {}, **attrs
+    )
 
 
 def install_homeassistant_stubs() -> None:
@@ -39,8 +76,55 @@ def install_homeassistant_stubs() -> None:
     tts.TTSAudioRequest = TTSAudioRequest
     tts.TTSAudioResponse = TTSAudioResponse
 
+    tts.media_source = types.ModuleType("media_source")
+
+    def generate_media_source_id(
+        hass, message, engine=None, language=None, options=None, cache=None
+    ):
+        batch = (options or {}).get("queue_batch", "")
+        return f"media-source://tts/{engine}?message={message}&batch={batch}"
+
+    tts.media_source.generate_media_source_id = generate_media_source_id
+
     ha.components.tts = tts
 
+    diagnostics = types.ModuleType("diagnostics")
+
+    def async_redact_data(data, to_redact):
+        return {
+            key: "**REDACTED**" if key in to_redact else value
+            for key, value in data.items()
+        }
+
+    diagnostics.async_redact_data = async_redact_data
+    ha.components.diagnostics = diagnostics
+
+    http = types.ModuleType("http")
+    http.__path__ = []
+
+    class HomeAssistantView:
+        requires_auth = True
+
+    http.HomeAssistantView = HomeAssistantView
+    http.auth = types.ModuleType("auth")
+
+    def async_sign_path(hass, path, expiration, *, use_content_user=False):
+        return f"{path}?authSig=stub"
+
+    http.auth.async_sign_path = async_sign_path
+    ha.components.http = http
+
+    sensor = types.ModuleType("sensor")
+    sensor.SensorEntity = object
+
+    class SensorStateClass:
+        MEASUREMENT = "measurement"
+        TOTAL = "total"
+        TOTAL_INCREASING = "total_increasing"
+
+    sensor.SensorStateClass = SensorStateClass
+    ha.components.sensor = sensor
+
     ha.config_entries = types.ModuleType("config_entries")
     ha.config_entries.CONN_CLASS_CLOUD_POLL = "cloud_poll"
 
@@ -62,12 +146,66 @@ def install_homeassistant_stubs() -> None:
 
     ha.core = types.ModuleType("core")
     ha.core.HomeAssistant = object
+    ha.core.Event = object
+    ha.core.ServiceCall = object
     ha.core.callback = lambda func: func
 
     ha.helpers = types.ModuleType("helpers")
     ha.helpers.entity_platform = types.ModuleType("entity_platform")
     ha.helpers.entity_platform.AddEntitiesCallback = object
 
+    ha.helpers.event = types.ModuleType("event")
+    ha.helpers.event.async_track_time_interval = (
+        lambda hass, action, interval: lambda: None
+    )
+
+    ha.helpers.start = types.ModuleType("start")
+
+    def async_at_started(hass, at_start_cb):
+        # Tests queue callbacks on ``hass.started`` to simulate a booting HA
+        pending = getattr(hass, "started", None)
+        if pending is None:
+            at_start_cb(hass)
+        else:
+            pending.append(at_start_cb)
+        return lambda: None
+
+    ha.helpers.start.async_at_started = async_at_started
+
+    ha.helpers.event.async_track_time_change = (
+        lambda hass, action, hour=None, minute=None, second=None: lambda: None
+    )
+
+    ha.helpers.storage = types.ModuleType("storage")
+    ha.helpers.storage.STORAGE_DIR = ".storage"
+
+    class Store:
+        """In-memory stand-in; ``saved`` is shared so reloads see old data."""
+
+        saved: dict = {}
+
+        def __init__(self, hass, version, key):
+            self.key = key
+
+        async def async_load(self):
+            return Store.saved.get(self.key)
+
+        async def async_save(self, data):
+            Store.saved[self.key] = data
+
+        def async_delay_save(self, data_func, delay=0):
+            Store.saved[self.key] = data_func()
+
+        async def async_remove(self):
+            Store.saved.pop(self.key, None)
+
+    ha.helpers.storage.Store = Store
+
+    ha.util = types.ModuleType("util")
+    ha.util.__path__ = []
+    ha.util.dt = types.ModuleType("dt")
+    ha.util.dt.now = datetime.now
+
     ha.exceptions = types.ModuleType("exceptions")
 
     class HomeAssistantError(Exception):
@@ -77,13 +215,30 @@ def install_homeassistant_stubs() -> None:
 
     ha.const = types.ModuleType("const")
     ha.const.CONF_API_KEY = "api_key"
+    ha.const.EVENT_STATE_CHANGED = "state_changed"
+    ha.const.EVENT_HOMEASSISTANT_STOP = "homeassistant_stop"
+
+    class UnitOfTime:
+        SECONDS = "s"
+
+    ha.const.UnitOfTime = UnitOfTime
 
     sys.modules["homeassistant"] = ha
     sys.modules["homeassistant.components"] = ha.components
     sys.modules["homeassistant.components.tts"] = tts
+    sys.modules["homeassistant.components.tts.media_source"] = tts.media_source
+    sys.modules["homeassistant.components.diagnostics"] = diagnostics
+    sys.modules["homeassistant.components.sensor"] = sensor
+    sys.modules["homeassistant.components.http"] = http
+    sys.modules["homeassistant.components.http.auth"] = http.auth
     sys.modules["homeassistant.config_entries"] = ha.config_entries
     sys.modules["homeassistant.core"] = ha.core
     sys.modules["homeassistant.helpers"] = ha.helpers
     sys.modules["homeassistant.helpers.entity_platform"] = ha.helpers.entity_platform
+    sys.modules["homeassistant.helpers.start"] = ha.helpers.start
+    sys.modules["homeassistant.helpers.storage"] = ha.helpers.storage
+    sys.modules["homeassistant.helpers.event"] = ha.helpers.event
+    sys.modules["homeassistant.util"] = ha.util
+    sys.modules["homeassistant.util.dt"] = ha.util.dt
     sys.modules["homeassistant.exceptions"] = ha.exceptions
     sys.modules["homeassistant.const"] = ha.const
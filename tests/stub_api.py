@@ -0,0 +1,122 @@
+"""Local stand-in for OpenAI's ``/v1/audio/speech`` endpoint."""
+
+from __future__ import annotations
+
+import asyncio
+import base64
+import json
+
+from aiohttp import web
+
+SPEECH_PATH = "/v1/audio/speech"
+
+# MPEG-2 Layer III, 64 kbit/s, 24 kHz mono: 192 byte frames of 24 ms, with
+# side info (part2_3_length 300) marking the frame as not silent
+MP3_FRAME = b"\xff\xf3\x84\xc4" + (300 << 51).to_bytes(9, "big") + b"\x00" * 179
+
+
+class StubSpeechAPI:
+    """Serve fake audio over raw or SSE streaming on a random local port.
+
+    Behaviour is controlled through attributes so a test can change it
+    between requests: ``delay`` before the response starts, ``chunks`` of
+    ``chunk_size`` bytes separated by ``interval`` seconds, and ``status``
+    to return an API error instead of audio.  ``overrides`` maps the part
+    of the input text before a ``:`` to per-request values of ``status``
+    and ``delay``, so one server can mix behaviours.  With ``real_mp3``,
+    mp3 requests get decodable (non-silent) frames instead of filler bytes,
+    so chunking and silence trimming behave as they do against OpenAI.
+    """
+
+    def __init__(
+        self,
+        chunks: int = 4,
+        chunk_size: int = 1024,
+        delay: float = 0.0,
+        interval: float = 0.0,
+        status: int = 200,
+    ) -> None:
+        self.chunks = chunks
+        self.chunk_size = chunk_size
+        self.delay = delay
+        self.interval = interval
+        self.status = status
+        self.requests = 0
+        self.active = 0
+        self.peak_active = 0
+        self.payloads: list[dict] = []
+        # Authorization header of every request, None when it had none
+        self.authorizations: list[str | None] = []
+        self.overrides: dict[str, dict] = {}
+        self.keep_payloads = True
+        self.real_mp3 = False
+        self._runner: web.AppRunner | None = None
+        self.url = ""
+
+    async def start(self) -> str:
+        """Start serving and return the speech endpoint URL."""
+        app = web.Application()
+        app.router.add_post(SPEECH_PATH, self._handle)
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, "127.0.0.1", 0)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+        self.url = f"http://127.0.0.1:{port}{SPEECH_PATH}"
+        return self.url
+
+    async def close(self) -> None:
+        """Stop serving."""
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+    def audio_chunk(self, index: int, audio_format: str = "") -> bytes:
+        """Return the bytes sent as chunk ``index``."""
+        if self.real_mp3 and audio_format == "mp3":
+            return MP3_FRAME * max(1, self.chunk_size // len(MP3_FRAME))
+        return bytes([index % 251]) * self.chunk_size
+
+    async def _handle(self, request: web.Request) -> web.StreamResponse:
+        payload = await request.json()
+        self.requests += 1
+        self.authorizations.append(request.headers.get("Authorization"))
+        if self.keep_payloads:
+            self.payloads.append(payload)
+        settings = self.overrides.get(payload.get("input", "").split(":", 1)[0], {})
+        status = settings.get("status", self.status)
+        delay = settings.get("delay", self.delay)
+        if status >= 400:
+            return web.json_response(
+                {"error": {"message": "stub failure"}}, status=status
+            )
+        if delay:
+            await asyncio.sleep(delay)
+
+        sse = payload.get("stream_format") == "sse"
+        resp = web.StreamResponse(
+            headers={"Content-Type": "text/event-stream" if sse else "audio/mpeg"}
+        )
+        self.active += 1
+        self.peak_active = max(self.peak_active, self.active)
+        try:
+            await resp.prepare(request)
+            for index in range(self.chunks):
+                data = self.audio_chunk(index, payload.get("response_format", ""))
+                if sse:
+                    event = {
+                        "type": "speech.audio.delta",
+                        "audio": base64.b64encode(data).decode(),
+                    }
+                    data = f"data: {json.dumps(event)}\n\n".encode()
+                await resp.write(data)
+                if self.interval:
+                    await asyncio.sleep(self.interval)
+            if sse:
+                await resp.write(b'data: {"type": "speech.audio.done"}\n\n')
+            await resp.write_eof()
+        except ConnectionResetError:
+            pass
+        finally:
+            self.active -= 1
+        return resp
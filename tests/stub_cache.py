@@ -0,0 +1,55 @@
+"""Local stand-in for a shared clip cache speaking the backend protocol."""
+
+from __future__ import annotations
+
+import asyncio
+
+from aiohttp import web
+
+FORMAT_HEADER = "X-Audio-Format"
+
+
+class StubCacheServer:
+    """In-memory ``GET``/``PUT /{key}`` store on a random local port."""
+
+    def __init__(self) -> None:
+        self.clips: dict[str, tuple[str, bytes]] = {}
+        self.gets = 0
+        self.puts = 0
+        # Seconds before answering a lookup
+        self.delay = 0.0
+        self._runner: web.AppRunner | None = None
+
+    async def start(self) -> str:
+        """Start serving and return the base URL."""
+        app = web.Application()
+        app.router.add_get("/clips/{key}", self._get)
+        app.router.add_put("/clips/{key}", self._put)
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, "127.0.0.1", 0)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+        return f"http://127.0.0.1:{port}/clips"
+
+    async def close(self) -> None:
+        """Stop serving."""
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+    async def _get(self, request: web.Request) -> web.Response:
+        self.gets += 1
+        await asyncio.sleep(self.delay)
+        clip = self.clips.get(request.match_info["key"])
+        if clip is None:
+            raise web.HTTPNotFound()
+        return web.Response(body=clip[1], headers={FORMAT_HEADER: clip[0]})
+
+    async def _put(self, request: web.Request) -> web.Response:
+        self.puts += 1
+        self.clips[request.match_info["key"]] = (
+            request.headers[FORMAT_HEADER],
+            await request.read(),
+        )
+        return web.Response(status=204)
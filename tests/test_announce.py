@@ -0,0 +1,134 @@
+import asyncio
+import importlib
+import os
+import sys
+from types import SimpleNamespace
+
+import pytest
+import voluptuous as vol
+
+sys.path.insert(0, os.path.dirname(__file__))
+from hass_stubs import install_homeassistant_stubs
+
+install_homeassistant_stubs()
+
+BASE_DIR = os.path.dirname(os.path.dirname(__file__))
+sys.path.insert(0, BASE_DIR)
+
+announce = importlib.import_module("custom_components.openai_gpt4o_tts.announce")
+
+# 100 ms of 24 kHz 16-bit PCM per message
+CLIP_BYTES = 4800
+
+
+class _Client:
+    audio_output = "pcm"
+
+    def __init__(self, delays):
+        self.delays = delays
+        self.calls = []
+
+    async def get_tts_audio(self, message, options):
+        self.calls.append((message, options))
+        await asyncio.sleep(self.delays.get(message, 0))
+        return "pcm", message[0].encode() * CLIP_BYTES
+
+
+class _Services:
+    def __init__(self):
+        self.played = []
+
+    async def async_call(self, domain, service, data, blocking=False):
+        assert (domain, service) == ("media_player", "play_media")
+        self.played.append((data["entity_id"], data["media_content_id"]))
+
+
+def _queues(client):
+    hass = SimpleNamespace(services=_Services(), tasks=[])
+
+    def async_create_background_task(hass, coro, name):
+        task = asyncio.create_task(coro)
+        hass.tasks.append(name)
+        return task
+
+    entry = SimpleNamespace(async_create_background_task=async_create_background_task)
+    queues = announce.AnnouncementQueues(hass, entry, client)
+    queues.engine = "tts.gpt4o"
+    return hass, queues
+
+
+async def _fetch(hass, queues, count):
+    """Wait for the count-th play_media call and fetch its audio like a player."""
+    while len(hass.services.played) < count:
+        await asyncio.sleep(0.005)
+    batch_id = hass.services.played[-1][1].rsplit("batch=", 1)[1]
+    audio_format, chunks = queues.stream(batch_id)
+    return audio_format, b"".join([chunk async for chunk in chunks])
+
+
+@pytest.mark.asyncio
+async def test_batch_coalesced_deduplicated_and_prioritized(monkeypatch):
+    monkeypatch.setattr(announce, "QUEUE_WINDOW", 0.05)
+    client = _Client({"alpha": 0.2, "bravo": 0.2, "charlie": 0.2})
+    hass, queues = _queues(client)
+    loop = asyncio.get_running_loop()
+
+    queues.enqueue(["media_player.kitchen"], "alpha", {}, False)
+    queues.enqueue(["media_player.kitchen"], "bravo", {}, False)
+    queues.enqueue(["media_player.kitchen"], "  Alpha ", {}, False)
+    queues.enqueue(["media_player.kitchen"], "charlie", {}, True)
+    started = loop.time()
+    audio_format, data = await _fetch(hass, queues, 1)
+
+    assert len(hass.services.played) == 1
+    assert audio_format == "pcm"
+    assert data == b"c" * CLIP_BYTES + b"a" * CLIP_BYTES + b"b" * CLIP_BYTES
+    # Rendered in parallel, not one after another
+    assert loop.time() - started < 0.5
+    assert [options["priority"] for _msg, options in client.calls] == [
+        True,
+        False,
+        False,
+    ]
+    # Renders are the entry's tasks, so unloading it cancels them
+    assert hass.tasks.count("openai_gpt4o_tts_batch") == 3
+    queues.async_shutdown()
+
+
+@pytest.mark.asyncio
+async def test_next_batch_waits_for_playback(monkeypatch):
+    monkeypatch.setattr(announce, "QUEUE_WINDOW", 0.01)
+    hass, queues = _queues(_Client({}))
+    loop = asyncio.get_running_loop()
+
+    queues.enqueue(["media_player.hall"], "one", {}, False)
+    await _fetch(hass, queues, 1)
+    fetched = loop.time()
+    queues.enqueue(["media_player.hall"], "two", {}, False)
+    await _fetch(hass, queues, 2)
+    # The first batch lasts 100 ms
+    assert loop.time() - fetched >= 0.09
+    # A batch is streamed once; later fetches are refused
+    batch_id = hass.services.played[0][1].rsplit("batch=", 1)[1]
+    assert queues.stream(batch_id) is None
+    queues.async_shutdown()
+
+
+def test_enqueue_schema():
+    data = announce.ENQUEUE_SCHEMA(
+        {"entity_id": "media_player.a, media_player.b", "message": "hi"}
+    )
+    assert data["entity_id"] == ["media_player.a", "media_player.b"]
+    assert data["priority"] is False
+    with pytest.raises(vol.Invalid):
+        announce.ENQUEUE_SCHEMA({"entity_id": "light.a", "message": "hi"})
+
+
+@pytest.mark.parametrize(
+    ("requested", "expected"),
+    [("pcm", "pcm"), ("mp3", "mp3"), ("opus", "mp3"), ("flac", "mp3")],
+)
+def test_batches_fall_back_to_a_joinable_format(requested, expected):
+    _hass, queues = _queues(_Client({}))
+    items = [announce.Announcement("one", {"audio_output": requested}, False)]
+    assert queues._audio_format(items) == expected
@@ -0,0 +1,191 @@
+import importlib
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(__file__))
+from hass_stubs import install_homeassistant_stubs
+
+install_homeassistant_stubs()
+
+BASE_DIR = os.path.dirname(os.path.dirname(__file__))
+sys.path.insert(0, BASE_DIR)
+
+audio = importlib.import_module("custom_components.openai_gpt4o_tts.audio")
+
+# MPEG-2 Layer III, 64 kbit/s, 24 kHz: 192 byte frames of 24 ms
+MP3_FRAME = b"\xff\xf3\x84\xc4" + b"\x00" * 188
+
+
+def _ogg_page(granule: int, payload: bytes) -> bytes:
+    return (
+        b"OggS\x00\x00"
+        + granule.to_bytes(8, "little", signed=True)
+        + b"\x00" * 12
+        + bytes([1, len(payload)])
+        + payload
+    )
+
+
+def _split(data: bytes, size: int) -> list[bytes]:
+    return [data[i : i + size] for i in range(0, len(data), size)]
+
+
+def test_mp3_frame_info():
+    assert audio.mp3_frame_info(MP3_FRAME, 0) == (192, 576, 24000)
+    assert audio.mp3_frame_info(b"junk", 0) is None
+
+
+def test_mp3_chunks_are_whole_frames():
+    stream = MP3_FRAME * 50
+    rechunker = audio.Rechunker("mp3", 40, 200)
+    chunks = []
+    for piece in _split(stream, 100):
+        chunks += rechunker.feed(piece)
+    chunks.append(rechunker.flush())
+    assert b"".join(chunks) == stream
+    assert len(chunks[0]) == 2 * 192
+    assert all(len(chunk) % 192 == 0 for chunk in chunks)
+    assert len(chunks[1]) == 9 * 192
+
+
+def test_mp3_junk_passes_through():
+    stream = b"ID3\x03\x00\x00\x00\x00\x00\x02ab" + b"xx" + MP3_FRAME * 4
+    rechunker = audio.Rechunker("mp3", 24, 48)
+    chunks = rechunker.feed(stream) + [rechunker.flush()]
+    assert b"".join(chunks) == stream
+    assert chunks[0].endswith(MP3_FRAME)
+
+
+def test_pcm_chunks_are_sample_aligned():
+    stream = bytes(range(256)) * 100
+    rechunker = audio.Rechunker("pcm", 10, 25)
+    chunks = []
+    for piece in _split(stream, 333):
+        chunks += rechunker.feed(piece)
+    chunks.append(rechunker.flush())
+    assert b"".join(chunks) == stream
+    assert len(chunks[0]) == 480
+    assert len(chunks[1]) == 1200
+
+
+def test_wav_header_then_samples():
+    header = (
+        b"RIFF\xff\xff\xff\xffWAVE"
+        + b"fmt \x10\x00\x00\x00\x01\x00\x01\x00\xc0\x5d\x00\x00\x80\xbb\x00\x00\x02\x00\x10\x00"
+        + b"data\xff\xff\xff\xff"
+    )
+    assert audio.wav_header_info(header) == (44, 24000, 1, 2)
+    stream = header + b"\x01\x00" * 2400
+    rechunker = audio.Rechunker("wav", 20, 50)
+    chunks = rechunker.feed(stream) + [rechunker.flush()]
+    assert b"".join(chunks) == stream
+    assert len(chunks[0]) == 44 + 960
+
+
+def test_ogg_pages_by_granule():
+    pages = [_ogg_page(0, b"OpusHead"), _ogg_page(0, b"OpusTags")]
+    pages += [_ogg_page(960 * (n + 1), b"p" * 50) for n in range(10)]
+    stream = b"".join(pages)
+    rechunker = audio.Rechunker("opus", 20, 60)
+    chunks = []
+    for piece in _split(stream, 64):
+        chunks += rechunker.feed(piece)
+    chunks.append(rechunker.flush())
+    assert b"".join(chunks) == stream
+    # Header pages ride along with the first 20 ms page
+    assert chunks[0] == b"".join(pages[:3])
+    assert chunks[1] == b"".join(pages[3:6])
+
+
+@pytest.mark.asyncio
+async def test_rechunk_async():
+    async def source():
+        for piece in _split(MP3_FRAME * 10, 50):
+            yield piece
+
+    rechunker = audio.Rechunker("mp3", 24, 96)
+    chunks = [chunk async for chunk in rechunker.stream(source())]
+    assert [len(chunk) for chunk in chunks] == [192, 768, 768, 192]
+    assert rechunker.total_ms == 240
+
+
+def _mp3_frame(part2_3_length: int = 0, main_data_begin: int = 0) -> bytes:
+    """Return an MPEG-2 mono frame like ``MP3_FRAME`` with the given side info."""
+    side = (main_data_begin << 64) | (part2_3_length << 51)
+    return MP3_FRAME[:4] + side.to_bytes(9, "big") + b"\x00" * 179
+
+
+def _tone(samples: int, level: int = 8000) -> bytes:
+    return b"".join(
+        (level if n % 2 else -level).to_bytes(2, "little", signed=True)
+        for n in range(samples)
+    )
+
+
+def test_mp3_side_info():
+    assert audio.mp3_side_info(MP3_FRAME, 0) == (0, 13, True)
+    assert audio.mp3_side_info(_mp3_frame(300, 12), 0) == (12, 13, False)
+
+
+def test_trim_pcm_keeps_padding():
+    pad = 24000 * audio.SILENCE_PAD_MS // 1000
+    clip = b"\x00\x00" * 12000 + _tone(4800) + b"\x00\x00" * 12000
+    trimmed = audio.trim_silence(clip, "pcm")
+    assert trimmed == b"\x00\x00" * pad + _tone(4800) + b"\x00\x00" * pad
+    assert audio.trim_silence(trimmed, "pcm") == trimmed
+    assert audio.duration_ms(trimmed, "pcm") == 200 + 2 * audio.SILENCE_PAD_MS
+    # A clip that is silent throughout is left alone
+    assert audio.trim_silence(b"\x00\x00" * 100, "pcm") == b"\x00\x00" * 100
+
+
+def test_trim_wav_rewrites_sizes():
+    header = (
+        b"RIFF\xff\xff\xff\xffWAVE"
+        + b"fmt \x10\x00\x00\x00\x01\x00\x01\x00\xc0\x5d\x00\x00\x80\xbb\x00\x00\x02\x00\x10\x00"
+        + b"data\xff\xff\xff\xff"
+    )
+    trimmed = audio.trim_silence(header + b"\x00\x00" * 6000 + _tone(2400), "wav")
+    body = len(trimmed) - 44
+    assert body == 2 * (2400 + 24000 * audio.SILENCE_PAD_MS // 1000)
+    assert int.from_bytes(trimmed[4:8], "little") == len(trimmed) - 8
+    assert int.from_bytes(trimmed[40:44], "little") == body
+
+
+def test_trim_mp3_keeps_reservoir_frames():
+    silent = _mp3_frame()
+    # The first sound frame reads 200 bytes of main data, more than one frame holds
+    speech = [_mp3_frame(500, 200)] + [_mp3_frame(500)] * 3
+    tag = b"ID3\x03\x00\x00\x00\x00\x00\x02ab"
+    clip = tag + silent * 10 + b"".join(speech) + silent * 10
+    trimmed = audio.trim_silence(clip, "mp3")
+    assert trimmed == tag + silent * 2 + b"".join(speech) + silent
+
+
+@pytest.mark.parametrize("piece", [7, 100, 5000])
+def test_leading_trimmer_matches_full_trim(piece):
+    pcm = b"\x00\x00" * 24000 + _tone(2400) + b"\x00\x00" * 2400
+    mp3 = _mp3_frame() * 30 + _mp3_frame(500, 200) + _mp3_frame(500) + _mp3_frame()
+    for fmt, clip in (("pcm", pcm), ("mp3", mp3)):
+        trimmer = audio.LeadingSilenceTrimmer(fmt)
+        streamed = b"".join(trimmer.feed(part) for part in _split(clip, piece))
+        streamed += trimmer.flush()
+        # Only the trailing silence differs from a full trim
+        assert audio.trim_silence(streamed, fmt) == audio.trim_silence(clip, fmt)
+        assert len(streamed) < len(clip)
+
+
+def test_continuation_joins_wav_clips():
+    header = (
+        b"RIFF\x30\x00\x00\x00WAVE"
+        + b"fmt \x10\x00\x00\x00\x01\x00\x01\x00\xc0\x5d\x00\x00\x80\xbb\x00\x00\x02\x00\x10\x00"
+        + b"data\x04\x00\x00\x00"
+    )
+    joined = audio.continuation(header + b"abcd", "wav", True)
+    joined += audio.continuation(header + b"efgh", "wav", False)
+    assert joined[4:8] == joined[40:44] == b"\xff\xff\xff\xff"
+    assert joined[44:] == b"abcdefgh"
+    tag = b"ID3\x03\x00\x00\x00\x00\x00\x02ab"
+    assert audio.continuation(tag + MP3_FRAME, "mp3", False) == MP3_FRAME
+    assert audio.continuation(tag + MP3_FRAME, "mp3", True) == tag + MP3_FRAME
@@ -0,0 +1,177 @@
+import importlib
+import os
+import sys
+import time
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(__file__))
+from hass_stubs import FakeHass, fake_entry, install_homeassistant_stubs
+
+install_homeassistant_stubs()
+
+BASE_DIR = os.path.dirname(os.path.dirname(__file__))
+sys.path.insert(0, BASE_DIR)
+
+cache = importlib.import_module("custom_components.openai_gpt4o_tts.cache")
+gpt4o = importlib.import_module("custom_components.openai_gpt4o_tts.gpt4o")
+SegmentStore = cache.SegmentStore
+
+
+def _key(n: int) -> str:
+    return f"{n:032x}"
+
+
+def _segment_files(path) -> list[str]:
+    return sorted(name for name in os.listdir(path) if name.endswith(".seg"))
+
+
+def test_put_get_roundtrip(tmp_path):
+    store = SegmentStore(str(tmp_path))
+    store.put(_key(1), "mp3", b"hello", 1.5)
+    clip = store.get(_key(1))
+    assert clip.audio_format == "mp3"
+    assert isinstance(clip.data, memoryview)
+    assert bytes(clip.data) == b"hello"
+    assert clip.duration == 1.5
+    assert store.get(_key(2)) is None
+    store.close()
+
+
+def test_reopen_replays_index(tmp_path):
+    store = SegmentStore(str(tmp_path))
+    store.put(_key(1), "mp3", b"one")
+    store.put(_key(2), "wav", b"two")
+    store.put(_key(1), "mp3", b"uno")
+    store.delete(_key(2))
+    store.close()
+
+    store = SegmentStore(str(tmp_path))
+    assert len(store) == 1
+    assert bytes(store.get(_key(1)).data) == b"uno"
+    assert _key(2) not in store
+    store.close()
+
+
+def test_torn_journal_record_is_ignored(tmp_path):
+    store = SegmentStore(str(tmp_path))
+    store.put(_key(1), "mp3", b"one")
+    store.close()
+    with open(os.path.join(tmp_path, cache.JOURNAL_FILE), "ab") as fobj:
+        fobj.write(b"\x01\x02\x03")
+
+    store = SegmentStore(str(tmp_path))
+    assert bytes(store.get(_key(1)).data) == b"one"
+    store.close()
+
+
+def test_segments_rotate_and_evict_oldest(tmp_path):
+    store = SegmentStore(str(tmp_path), max_bytes=300, segment_size=100)
+    for n in range(4):
+        store.put(_key(n), "pcm", bytes([n]) * 100)
+    # Oldest segment dropped to stay under max_bytes
+    assert _key(0) not in store
+    assert store.get(_key(0)) is None
+    assert store.live_bytes == 300
+    segments = [name for name in os.listdir(tmp_path) if name.endswith(".seg")]
+    assert len(segments) == 3
+    store.close()
+
+
+def test_compaction_reclaims_dead_bytes(tmp_path, monkeypatch):
+    monkeypatch.setattr(cache, "COMPACT_MIN_DEAD_BYTES", 1)
+    store = SegmentStore(str(tmp_path), segment_size=64)
+    for n in range(10):
+        store.put(_key(n), "mp3", bytes([n]) * 64)
+    for n in range(8):
+        store.delete(_key(n))
+    assert store.needs_compaction
+
+    held = store.get(_key(8)).data
+    store.compact()
+    assert store.dead_ratio == 0.0
+    # Dead segments are deleted; live ones need no copy
+    assert _segment_files(tmp_path) == ["00000008.seg", "00000009.seg"]
+    assert bytes(held) == bytes([8]) * 64
+    assert bytes(store.get(_key(9)).data) == bytes([9]) * 64
+    store.close()
+
+    store = SegmentStore(str(tmp_path))
+    assert sorted(store.keys()) == [_key(8), _key(9)]
+    assert bytes(store.get(_key(8)).data) == bytes([8]) * 64
+    store.close()
+
+
+def test_open_large_index_is_fast(tmp_path):
+    count = 100_000
+    with open(os.path.join(tmp_path, "00000000.seg"), "wb") as fobj:
+        fobj.truncate(count * 10)
+    with open(os.path.join(tmp_path, cache.INDEX_FILE), "wb") as fobj:
+        fobj.write(
+            cache._HEADER.pack(cache._INDEX_MAGIC, cache._INDEX_VERSION, count, 0, 1)
+        )
+        fobj.write(cache._SEGMENT.pack(0, count * 10))
+        fobj.write(
+            b"".join(
+                cache._RECORD.pack(n.to_bytes(16, "big"), 0, n * 10, 10, 0, b"mp3", 0.5)
+                for n in range(count)
+            )
+        )
+
+    start = time.perf_counter()
+    store = SegmentStore(str(tmp_path))
+    elapsed = time.perf_counter() - start
+    assert elapsed < 0.05
+    assert _key(count - 1) in store
+    assert store.get(_key(1234)).duration == 0.5
+    assert store.get(_key(count)) is None
+    assert len(store) == count
+    store.close()
+
+
+def test_journal_folded_on_compaction(tmp_path):
+    store = SegmentStore(str(tmp_path))
+    for n in range(5):
+        store.put(_key(n), "mp3", b"x" * 10)
+    store.delete(_key(3))
+    store.compact()
+    assert not store._journal
+    # Nothing worth copying: no new segments, empty or not
+    store.compact()
+    assert _segment_files(tmp_path) == ["00000000.seg"]
+    store.put(_key(9), "mp3", b"new")
+    store.close()
+
+    store = SegmentStore(str(tmp_path))
+    assert sorted(store.keys()) == sorted([_key(0), _key(1), _key(2), _key(4), _key(9)])
+    assert bytes(store.get(_key(9)).data) == b"new"
+    store.close()
+
+
+class _CountingClient(gpt4o.GPT4oClient):
+    calls = 0
+
+    async def iter_tts_audio(self, request):
+        type(self).calls += 1
+        yield b"aud"
+        yield b"io"
+
+
+@pytest.mark.asyncio
+async def test_client_serves_repeat_from_cache(tmp_path):
+    client = _CountingClient(
+        FakeHass(), fake_entry(), cache=SegmentStore(str(tmp_path))
+    )
+
+    assert await client.get_tts_audio("hi") == ("mp3", b"audio")
+    assert await client.get_tts_audio("hi") == ("mp3", b"audio")
+    assert _CountingClient.calls == 1
+
+    fmt, gen = await client.stream_tts_audio("hi")
+    assert fmt == "mp3"
+    assert b"".join([bytes(chunk) async for chunk in gen]) == b"audio"
+    assert _CountingClient.calls == 1
+
+    await client.get_tts_audio("hi", {"voice": "nova"})
+    assert _CountingClient.calls == 2
+    await client.async_close()
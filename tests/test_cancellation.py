@@ -0,0 +1,106 @@
+import asyncio
+import importlib
+import os
+import sys
+
+import pytest
+import pytest_asyncio
+
+sys.path.insert(0, os.path.dirname(__file__))
+from hass_stubs import fake_entry, install_homeassistant_stubs
+from stub_api import StubSpeechAPI
+
+install_homeassistant_stubs()
+
+BASE_DIR = os.path.dirname(os.path.dirname(__file__))
+sys.path.insert(0, BASE_DIR)
+
+gpt4o = importlib.import_module("custom_components.openai_gpt4o_tts.gpt4o")
+
+CANCELLED_STREAMS = int(os.environ.get("CANCELLED_STREAMS", "10000"))
+
+
+def _open_fds() -> int:
+    return len(os.listdir("/proc/self/fd"))
+
+
+@pytest_asyncio.fixture
+async def api(monkeypatch):
+    stub = StubSpeechAPI(chunks=1000, chunk_size=4096, interval=0.005)
+    stub.keep_payloads = False
+    url = await stub.start()
+    monkeypatch.setattr(gpt4o, "OPENAI_TTS_ENDPOINT", url)
+    yield stub
+    await stub.close()
+
+
+def _client(stream_format="audio"):
+    entry = fake_entry({"stream_format": stream_format, "audio_output": "pcm"})
+    return gpt4o.GPT4oClient(None, entry)
+
+
+@pytest.mark.asyncio
+async def test_close_aborts_upstream_request(api):
+    client = _client()
+    _fmt, gen = await client.stream_tts_audio("hello")
+    await gen.__anext__()
+    await gen.aclose()
+    await asyncio.sleep(0.05)
+
+    assert api.active == 0
+    assert client.metrics.cancelled_streams == 1
+    assert client.metrics.cancelled_bytes > 0
+    assert not client._session.connector._acquired
+    await client.async_close()
+
+
+@pytest.mark.asyncio
+async def test_task_cancellation_aborts_upstream_request(api):
+    client = _client("sse")
+    _fmt, gen = await client.stream_tts_audio("hello")
+
+    async def consume():
+        async for _chunk in gen:
+            pass
+
+    task = asyncio.get_running_loop().create_task(consume())
+    await asyncio.sleep(0.05)
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+    await asyncio.sleep(0.05)
+
+    assert api.active == 0
+    assert client.metrics.cancelled_streams == 1
+    await client.async_close()
+
+
+@pytest.mark.asyncio
+async def test_no_leaks_across_cancelled_streams(api):
+    client = _client()
+    api.interval = 0.0005
+
+    async def cancelled_stream(n):
+        _fmt, gen = await client.stream_tts_audio(f"message {n}")
+        await gen.__anext__()
+        if n % 2:
+            await gen.aclose()
+        else:
+            # Abandoned without close; finalization must still abort it
+            del gen
+
+    for n in range(50):
+        await cancelled_stream(n)
+    await asyncio.sleep(0.1)
+    tasks = len(asyncio.all_tasks())
+    fds = _open_fds()
+
+    for n in range(CANCELLED_STREAMS):
+        await cancelled_stream(n)
+    await asyncio.sleep(0.1)
+
+    assert len(asyncio.all_tasks()) <= tasks
+    assert _open_fds() <= fds + 2
+    assert not client._session.connector._acquired
+    assert client.metrics.cancelled_streams == CANCELLED_STREAMS + 50
+    await client.async_close()
@@ -1,4 +1,5 @@
 import importlib
+import json
 import os
 import sys
 
@@ -58,8 +59,8 @@ class DummySession:
     async def __aexit__(self, exc_type, exc, tb):
         pass
 
-    def post(self, url, headers=None, json=None):
-        self.payload = json
+    def post(self, url, headers=None, data=None):
+        self.payload = json.loads(data)
         self.headers = headers
         return DummyResponse()
 
@@ -0,0 +1,143 @@
+import asyncio
+import importlib
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(__file__))
+from hass_stubs import install_homeassistant_stubs
+
+install_homeassistant_stubs()
+
+BASE_DIR = os.path.dirname(os.path.dirname(__file__))
+sys.path.insert(0, BASE_DIR)
+
+dialogue = importlib.import_module("custom_components.openai_gpt4o_tts.dialogue")
+
+WAV_HEADER = (
+    b"RIFF\x30\x00\x00\x00WAVE"
+    + b"fmt \x10\x00\x00\x00\x01\x00\x01\x00\xc0\x5d\x00\x00\x80\xbb\x00\x00\x02\x00\x10\x00"
+    + b"data\x04\x00\x00\x00"
+)
+# 100 ms of 24 kHz 16-bit samples per line
+LINE_BYTES = 4800
+
+SCRIPT = """
+nova (bright and upbeat): Good morning!
+echo: Is it, though?
+
+shimmer (whispering): Coffee first.
+"""
+
+
+class _Client:
+    audio_output = "wav"
+
+    def __init__(self, delays=None, failing=()):
+        self.delays = delays or {}
+        self.failing = failing
+        self.calls = []
+        self.done = []
+
+    def _samples(self, options):
+        return options["voice"][0].encode() * LINE_BYTES
+
+    async def get_tts_audio(self, message, options):
+        self.calls.append(("get", message, options))
+        await asyncio.sleep(self.delays.get(message, 0))
+        self.done.append(message)
+        if message in self.failing:
+            return None, None
+        return options["audio_output"], WAV_HEADER + self._samples(options)
+
+    async def stream_tts_audio(self, message, options):
+        self.calls.append(("stream", message, options))
+        samples = self._samples(options)
+
+        async def chunks():
+            yield WAV_HEADER + samples[:1000]
+            await asyncio.sleep(self.delays.get(message, 0))
+            yield samples[1000:]
+            self.done.append(message)
+
+        return options["audio_output"], chunks()
+
+
+def test_parse_dialogue():
+    lines = dialogue.parse_dialogue(SCRIPT)
+    assert lines == [
+        dialogue.DialogueLine("nova", "bright and upbeat", "Good morning!"),
+        dialogue.DialogueLine("echo", None, "Is it, though?"),
+        dialogue.DialogueLine("shimmer", "whispering", "Coffee first."),
+    ]
+    # Ordinary text is left alone
+    assert dialogue.parse_dialogue("Nova: just one line") is None
+    assert dialogue.parse_dialogue("Note: first\nnova: second") is None
+    assert dialogue.parse_dialogue("nova: first\nand then some prose") is None
+
+
+@pytest.mark.asyncio
+async def test_lines_render_in_parallel_and_play_in_order():
+    client = _Client({"Good morning!": 0.2, "Is it, though?": 0.1})
+    lines = dialogue.parse_dialogue(SCRIPT)
+    loop = asyncio.get_running_loop()
+    started = loop.time()
+    result = dialogue.Dialogue(client, lines, {"playback_speed": 1.2})
+    assert result.audio_format == "wav"
+
+    stream = result.stream()
+    first = await anext(stream)
+    # Playback starts before the first line is even complete
+    assert loop.time() - started < 0.1
+    assert client.done == []
+    audio = first + b"".join([chunk async for chunk in stream])
+    # The later lines were rendered while the first one played
+    assert loop.time() - started < 0.25
+
+    # One WAV stream: a single header with placeholder sizes, then the lines
+    assert audio[4:8] == audio[40:44] == b"\xff\xff\xff\xff"
+    assert audio[44:] == b"n" * LINE_BYTES + b"e" * LINE_BYTES + b"s" * LINE_BYTES
+
+    assert [call[:2] for call in client.calls] == [
+        ("stream", "Good morning!"),
+        ("get", "Is it, though?"),
+        ("get", "Coffee first."),
+    ]
+    options = [call[2] for call in client.calls]
+    assert [opts["voice"] for opts in options] == ["nova", "echo", "shimmer"]
+    assert options[0]["instructions"] == "bright and upbeat"
+    assert "instructions" not in options[1]
+    assert all(opts["playback_speed"] == 1.2 for opts in options)
+
+
+@pytest.mark.asyncio
+async def test_failed_lines_are_skipped_and_unheard_lines_cancelled():
+    client = _Client(failing=("Is it, though?",))
+    lines = dialogue.parse_dialogue(SCRIPT)
+    audio = b"".join(
+        [chunk async for chunk in dialogue.Dialogue(client, lines, {}).stream()]
+    )
+    assert audio[44:] == b"n" * LINE_BYTES + b"s" * LINE_BYTES
+
+    # Formats that cannot be joined fall back to MP3
+    client = _Client({"Coffee first.": 10})
+    result = dialogue.Dialogue(client, lines, {"audio_output": "flac"})
+    assert result.audio_format == "mp3"
+    stream = result.stream()
+    await anext(stream)
+    await stream.aclose()
+    await asyncio.sleep(0)
+    assert result._tasks[-1].cancelled()
+
+
+@pytest.mark.asyncio
+async def test_lines_are_not_rendered_until_streamed():
+    client = _Client()
+    lines = dialogue.parse_dialogue(SCRIPT)
+    result = dialogue.Dialogue(client, lines, {})
+    await asyncio.sleep(0.01)
+    # Nothing runs for a dialogue nobody plays
+    assert client.calls == []
+    audio = b"".join([chunk async for chunk in result.stream()])
+    assert audio[44:] == b"n" * LINE_BYTES + b"e" * LINE_BYTES + b"s" * LINE_BYTES
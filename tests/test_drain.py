@@ -0,0 +1,111 @@
+import asyncio
+import importlib
+import os
+import sys
+
+import pytest
+import pytest_asyncio
+
+sys.path.insert(0, os.path.dirname(__file__))
+from hass_stubs import FakeHass, fake_entry, install_homeassistant_stubs
+from stub_api import StubSpeechAPI
+
+install_homeassistant_stubs()
+
+BASE_DIR = os.path.dirname(os.path.dirname(__file__))
+sys.path.insert(0, BASE_DIR)
+
+cache = importlib.import_module("custom_components.openai_gpt4o_tts.cache")
+gpt4o = importlib.import_module("custom_components.openai_gpt4o_tts.gpt4o")
+
+CHUNKS = 6
+CHUNK_SIZE = 1024
+
+
+@pytest_asyncio.fixture
+async def api(monkeypatch):
+    # Each response takes about 0.3 s to arrive
+    stub = StubSpeechAPI(chunks=CHUNKS, chunk_size=CHUNK_SIZE, interval=0.05)
+    url = await stub.start()
+    monkeypatch.setattr(gpt4o, "OPENAI_TTS_ENDPOINT", url)
+    yield stub
+    await stub.close()
+
+
+def _client(drain_timeout):
+    entry = fake_entry(
+        {"audio_output": "pcm", "trim_silence": False, "drain_timeout": drain_timeout}
+    )
+    return gpt4o.GPT4oClient(FakeHass(), entry)
+
+
+async def _stream(client, text):
+    _fmt, chunks = await client.stream_tts_audio(text, {"stream_format": "sse"})
+    return b"".join([chunk async for chunk in chunks])
+
+
+@pytest.mark.asyncio
+async def test_close_under_load_finishes_in_flight_requests(api, tmp_path):
+    client = _client(drain_timeout=10)
+    await client.async_load_cache(str(tmp_path), 8 * 1024 * 1024)
+    before = asyncio.all_tasks()
+    gets = [
+        asyncio.ensure_future(client.get_tts_audio(f"get {n}")) for n in range(10)
+    ]
+    streams = [asyncio.ensure_future(_stream(client, f"stream {n}")) for n in range(10)]
+    await asyncio.sleep(0.1)
+    assert api.active == 20
+
+    await client.async_close()
+    # Refused once closing started
+    assert await client.get_tts_audio("late") == (None, None)
+    assert await client.stream_tts_audio("late") == (None, None)
+
+    expected = b"".join(api.audio_chunk(i) for i in range(CHUNKS))
+    assert [data for _fmt, data in await asyncio.gather(*gets)] == [expected] * 10
+    assert await asyncio.gather(*streams) == [expected] * 10
+    assert api.requests == 20
+    assert client._session is None
+    assert asyncio.all_tasks() - before <= {asyncio.current_task()}
+
+    # Every completed clip was written to the cache before it closed
+    store = cache.SegmentStore(str(tmp_path), 8 * 1024 * 1024)
+    for n in range(10):
+        assert client.build_request(f"get {n}").key in store
+    store.close()
+
+
+@pytest.mark.asyncio
+async def test_close_aborts_requests_past_the_deadline(api):
+    api.interval = 1.0
+    client = _client(drain_timeout=0.2)
+    stream = asyncio.ensure_future(_stream(client, "slow stream"))
+    get = asyncio.ensure_future(client.get_tts_audio("slow get"))
+    await asyncio.sleep(0.1)
+
+    loop = asyncio.get_running_loop()
+    started = loop.time()
+    await asyncio.gather(client.async_close(), client.async_close())
+    assert loop.time() - started < 0.2 + gpt4o.ABORT_TIMEOUT
+
+    assert await get == (None, None)
+    # The stream ends early, with an error or cut short
+    result = (await asyncio.gather(stream, return_exceptions=True))[0]
+    assert isinstance(result, Exception) or len(result) < CHUNKS * CHUNK_SIZE
+    assert client._inflight == 0
+    # Closed for good: no new session is opened behind the caller's back
+    with pytest.raises(gpt4o.ClientConnectionError):
+        client._get_session()
+
+
+@pytest.mark.asyncio
+async def test_stream_closed_unstarted_does_not_hold_up_close(api):
+    client = _client(drain_timeout=1)
+    _fmt, chunks = await client.stream_tts_audio("never read", {"stream_format": "sse"})
+    await chunks.aclose()
+    assert client._inflight == 0
+
+    loop = asyncio.get_running_loop()
+    started = loop.time()
+    await client.async_close()
+    assert loop.time() - started < 0.5
@@ -0,0 +1,112 @@
+import asyncio
+import importlib
+import os
+import sys
+from types import SimpleNamespace
+
+import pytest
+import pytest_asyncio
+
+sys.path.insert(0, os.path.dirname(__file__))
+from hass_stubs import fake_entry, install_homeassistant_stubs
+from stub_api import StubSpeechAPI
+
+install_homeassistant_stubs()
+
+BASE_DIR = os.path.dirname(os.path.dirname(__file__))
+sys.path.insert(0, BASE_DIR)
+
+gpt4o = importlib.import_module("custom_components.openai_gpt4o_tts.gpt4o")
+earcon = importlib.import_module("custom_components.openai_gpt4o_tts.earcon")
+
+CHUNKS = 3
+# 100 ms of 24 kHz 16-bit PCM
+CHUNK_SIZE = 4800
+# Typical GPT-4o time to first audio, and when to acknowledge instead
+SPEECH_DELAY = 0.5
+THRESHOLD_MS = 100
+ACK = "ack: One moment"
+
+
+@pytest_asyncio.fixture
+async def api(monkeypatch):
+    stub = StubSpeechAPI(chunks=CHUNKS, chunk_size=CHUNK_SIZE, delay=SPEECH_DELAY)
+    # The acknowledgement itself renders right away
+    stub.overrides["ack"] = {"delay": 0}
+    monkeypatch.setattr(gpt4o, "OPENAI_TTS_ENDPOINT", await stub.start())
+    yield stub
+    await stub.close()
+
+
+@pytest_asyncio.fixture
+async def tts(api):
+    entry = fake_entry({"audio_output": "pcm", "trim_silence": False})
+    client = gpt4o.GPT4oClient(None, entry)
+    tasks = []
+    masker = earcon.EarconMasker(
+        client, ACK, THRESHOLD_MS, lambda coro: tasks.append(asyncio.create_task(coro))
+    )
+    yield SimpleNamespace(masker=masker, client=client, tasks=tasks)
+    await client.async_close()
+
+
+async def _first_audio(tts, text, mask=True):
+    """Return the time to first audio and the whole audio of ``text``."""
+    loop = asyncio.get_running_loop()
+    started = loop.time()
+    audio_format, chunks = await tts.client.stream_tts_audio(text)
+    if mask:
+        chunks = tts.masker.mask(chunks, audio_format, {})
+    first = await anext(chunks)
+    elapsed = loop.time() - started
+    return elapsed, first + b"".join([chunk async for chunk in chunks])
+
+
+@pytest.mark.asyncio
+async def test_acknowledgement_masks_slow_first_audio(api, tts):
+    assert tts.masker.prepare(None, "pcm") is None
+    await asyncio.gather(*tts.tasks)
+    ack = tts.masker.prepare(None, "pcm")
+    assert ack == b"".join(api.audio_chunk(i) for i in range(CHUNKS))
+
+    unmasked, speech = await _first_audio(tts, "slow answer", mask=False)
+    masked, audio = await _first_audio(tts, "slow answer")
+    # Perceived latency drops from the API's to the threshold
+    assert unmasked >= SPEECH_DELAY
+    assert masked < SPEECH_DELAY / 2
+    print(f"first audio: {unmasked * 1000:.0f} ms -> {masked * 1000:.0f} ms")
+    # The speech follows the acknowledgement sample for sample
+    assert audio == ack + speech
+    assert tts.client.metrics.masked_requests == 1
+
+
+@pytest.mark.asyncio
+async def test_fast_audio_and_missing_acknowledgement_pass_through(api, tts):
+    # Not rendered yet: nothing to play this time, ready for the next
+    _elapsed, audio = await _first_audio(tts, "first answer")
+    assert len(audio) == CHUNKS * CHUNK_SIZE
+    await asyncio.gather(*tts.tasks)
+    assert tts.masker.prepare(None, "pcm") is not None
+    assert len(tts.tasks) == 1
+
+    api.delay = 0
+    _elapsed, audio = await _first_audio(tts, "quick answer")
+    assert len(audio) == CHUNKS * CHUNK_SIZE
+    assert tts.client.metrics.masked_requests == 0
+    # Formats that cannot be joined never get one
+    assert tts.masker.prepare(None, "flac") is None
+    assert tts.masker.prepare(None, "opus") is None
+
+
+@pytest.mark.asyncio
+async def test_rendering_the_acknowledgement_is_not_reported(api, tts):
+    clips = []
+    timings = []
+    tts.client.async_add_clip_listener(lambda *args: clips.append(args))
+    tts.client.async_add_request_observer(lambda *args: timings.append(args))
+    tts.masker.prepare(None, "pcm")
+    await asyncio.gather(*tts.tasks)
+    assert tts.masker.prepare(None, "pcm") is not None
+    # Nobody heard it, so automations and traces never see it
+    assert clips == []
+    assert timings == []
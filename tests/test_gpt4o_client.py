@@ -1,4 +1,5 @@
 import importlib
+import json
 import os
 import sys
 
@@ -13,8 +14,9 @@ BASE_DIR = os.path.dirname(os.path.dirname(__file__))
 sys.path.insert(0, BASE_DIR)
 
 gpt4o = importlib.import_module("custom_components.openai_gpt4o_tts.gpt4o")
+const = importlib.import_module("custom_components.openai_gpt4o_tts.const")
 GPT4oClient = gpt4o.GPT4oClient
-DEFAULT_VOICE = gpt4o.DEFAULT_VOICE
+DEFAULT_VOICE = const.DEFAULT_VOICE
 
 
 class DummyEntry:
@@ -56,8 +58,8 @@ class DummySession:
     async def __aexit__(self, exc_type, exc, tb):
         pass
 
-    def post(self, url, headers=None, json=None):
-        self.payload = json
+    def post(self, url, headers=None, data=None):
+        self.payload = json.loads(data)
         return DummyResponse()
 
 
@@ -103,8 +105,8 @@ class DummySSESession:
     async def __aexit__(self, exc_type, exc, tb):
         pass
 
-    def post(self, url, headers=None, json=None):
-        self.payload = json
+    def post(self, url, headers=None, data=None):
+        self.payload = json.loads(data)
         return DummySSEResponse(self.lines)
 
 
@@ -239,3 +241,38 @@ async def test_log_api_error_masks_api_key_text(caplog, key):
         await gpt4o._log_api_error(resp)
     assert key not in caplog.text
     assert "sk-***" in caplog.text
+
+
+@pytest.mark.asyncio
+async def test_clip_trimmed_and_duration_reported(monkeypatch):
+    entry = DummyEntry(data={"api_key": "k"})
+    client = GPT4oClient(None, entry)
+    tone = (8000).to_bytes(2, "little") * 2400
+    clip = b"\x00\x00" * 12000 + tone + b"\x00\x00" * 12000
+
+    class PcmContent:
+        async def iter_chunked(self, size):
+            for start in range(0, len(clip), size):
+                yield clip[start : start + size]
+
+    dummy = DummySession()
+    response = DummyResponse()
+    response.content = PcmContent()
+    dummy.post = lambda url, headers=None, data=None: response
+    monkeypatch.setattr(
+        "custom_components.openai_gpt4o_tts.gpt4o.ClientSession",
+        lambda timeout=None: dummy,
+    )
+    reported = []
+    unsub = client.async_add_clip_listener(
+        lambda request, seconds, cached: reported.append((request.text, seconds, cached))
+    )
+
+    fmt, data = await client.get_tts_audio("hi", {gpt4o.CONF_AUDIO_OUTPUT: "pcm"})
+    assert fmt == "pcm"
+    assert len(data) == len(tone) + 2 * 2 * 720
+    assert reported == [("hi", 0.16, False)]
+
+    unsub()
+    await client.get_tts_audio("hi", {gpt4o.CONF_AUDIO_OUTPUT: "pcm"})
+    assert len(reported) == 1
@@ -0,0 +1,151 @@
+import importlib
+import os
+import sys
+
+import pytest
+import pytest_asyncio
+
+sys.path.insert(0, os.path.dirname(__file__))
+from hass_stubs import FakeHass, fake_entry, install_homeassistant_stubs
+from stub_api import StubSpeechAPI
+
+install_homeassistant_stubs()
+
+BASE_DIR = os.path.dirname(os.path.dirname(__file__))
+sys.path.insert(0, BASE_DIR)
+
+from homeassistant.helpers.storage import Store
+
+ledger_mod = importlib.import_module("custom_components.openai_gpt4o_tts.ledger")
+request_mod = importlib.import_module("custom_components.openai_gpt4o_tts.request")
+gpt4o = importlib.import_module("custom_components.openai_gpt4o_tts.gpt4o")
+cache = importlib.import_module("custom_components.openai_gpt4o_tts.cache")
+sensor = importlib.import_module("custom_components.openai_gpt4o_tts.sensor")
+
+DEFAULTS = {
+    "model": "gpt-4o-mini-tts",
+    "voice": "sage",
+    "instructions": "Be cheerful",
+    "audio_output": "mp3",
+    "playback_speed": 1.0,
+    "stream_format": "sse",
+}
+
+
+def _request(text, **options):
+    return request_mod.SynthesisRequest.resolve(text, options, DEFAULTS)
+
+
+@pytest.mark.asyncio
+async def test_ledger_counts_and_persists():
+    ledger = ledger_mod.UsageLedger(None, "persist")
+    await ledger.async_load()
+    ledger.record(_request("hello"), 1.5)
+    ledger.record_hit(_request("hello"), 1.5)
+    ledger.record(_request("hi", voice="nova"), 0.5)
+
+    today = ledger.today()
+    assert today["requests"] == 2
+    assert today["characters"] == 7
+    assert today["cache_hits"] == 1
+    assert today["characters_saved"] == 5
+    assert set(ledger.breakdown()) == {"gpt-4o-mini-tts/sage", "gpt-4o-mini-tts/nova"}
+    await ledger.async_save()
+
+    # A reload merges history with anything recorded before the load
+    reloaded = ledger_mod.UsageLedger(None, "persist")
+    reloaded.record(_request("again"), 1.0)
+    await reloaded.async_load()
+    assert reloaded.today()["requests"] == 3
+    assert reloaded.today()["audio_seconds"] == 3.0
+
+    await reloaded.async_remove()
+    assert "openai_gpt4o_tts.persist.ledger" not in Store.saved
+
+
+@pytest.mark.asyncio
+async def test_ledger_prunes_old_days():
+    Store.saved["openai_gpt4o_tts.old.ledger"] = {
+        "days": {"2000-01-01": {"tts-1/ash": {"requests": 9}}}
+    }
+    ledger = ledger_mod.UsageLedger(None, "old")
+    await ledger.async_load()
+    assert ledger.totals()["requests"] == 0
+
+
+def test_policy_budget_and_priority():
+    ledger = ledger_mod.UsageLedger(None, "budget")
+    policy = ledger_mod.BudgetPolicy(ledger, daily_characters=10)
+    assert policy.downgrade(_request("short")) is None
+    ledger.record(_request("short"), 1.0)
+
+    fallback = policy.downgrade(_request("over budget"))
+    assert fallback.model == "tts-1"
+    assert fallback.instructions == ""
+    assert fallback.stream_format == "audio"
+    assert fallback.downgraded
+    assert fallback.key != _request("over budget").key
+    assert policy.downgrade(_request("over budget", priority=True)) is None
+    assert policy.downgrade(_request("over budget", model="tts-1-hd")) is None
+
+
+def test_policy_latency_slo_rechecks_premium():
+    policy = ledger_mod.BudgetPolicy(ledger_mod.UsageLedger(None, "slo"), latency_slo_ms=500)
+    policy.observe("gpt-4o-mini-tts", 200)
+    assert policy.downgrade(_request("hi")) is None
+    for _ in range(10):
+        policy.observe("gpt-4o-mini-tts", 2000)
+    picks = [policy.downgrade(_request("hi")) for _ in range(ledger_mod.LATENCY_RECHECK)]
+    assert sum(pick is None for pick in picks) == 1
+
+
+@pytest_asyncio.fixture
+async def api(monkeypatch):
+    stub = StubSpeechAPI(chunks=2)
+    url = await stub.start()
+    monkeypatch.setattr(gpt4o, "OPENAI_TTS_ENDPOINT", url)
+    yield stub
+    await stub.close()
+
+
+@pytest.mark.asyncio
+async def test_client_feeds_ledger_and_downgrades(tmp_path, api):
+    ledger = ledger_mod.UsageLedger(None, "client")
+    entry = fake_entry(
+        {"daily_character_budget": 20, "instructions": "Whisper"}, entry_id="client"
+    )
+    client = gpt4o.GPT4oClient(
+        FakeHass(), entry, cache=cache.SegmentStore(str(tmp_path)), ledger=ledger
+    )
+
+    await client.get_tts_audio("Welcome home")
+    await client.get_tts_audio("Welcome home")
+    assert api.requests == 1
+    assert ledger.today()["cache_hits"] == 1
+    assert ledger.today()["characters_saved"] == len("Welcome home")
+
+    # Over budget: routine messages fall back, priority ones do not
+    await client.get_tts_audio("The washing machine has finished")
+    assert api.payloads[-1]["model"] == "tts-1"
+    assert api.payloads[-1]["instructions"] == ""
+    await client.get_tts_audio("Smoke detected", {"priority": True})
+    assert api.payloads[-1]["model"] == "gpt-4o-mini-tts"
+    assert ledger.today()["downgraded"] == 1
+    # The faster tts-1 request says nothing about the premium model's latency
+    assert sum(stats["samples"] for stats in client.selector.as_dict().values()) == 2
+    (endpoint,) = client.router.endpoints
+    assert endpoint.requests == 3 and endpoint.failures == 0
+
+    # Premium audio already cached is still served while over budget
+    await client.get_tts_audio("Welcome home")
+    assert api.requests == 3
+
+    usage = sensor.UsageSensor(entry, ledger, "characters", "Characters today", None)
+    assert usage.native_value == len("Welcome home") + len(
+        "The washing machine has finished"
+    ) + len("Smoke detected")
+    assert set(usage.extra_state_attributes["by_model_voice"]) == {
+        "gpt-4o-mini-tts/sage",
+        "tts-1/sage",
+    }
+    await client.async_close()
@@ -0,0 +1,89 @@
+import importlib
+import os
+import sys
+from types import SimpleNamespace
+
+import pytest
+import pytest_asyncio
+
+sys.path.insert(0, os.path.dirname(__file__))
+from hass_stubs import install_homeassistant_stubs
+from stub_api import StubSpeechAPI
+
+install_homeassistant_stubs()
+
+BASE_DIR = os.path.dirname(os.path.dirname(__file__))
+sys.path.insert(0, BASE_DIR)
+
+init = importlib.import_module("custom_components.openai_gpt4o_tts.__init__")
+gpt4o = importlib.import_module("custom_components.openai_gpt4o_tts.gpt4o")
+diagnostics = importlib.import_module("custom_components.openai_gpt4o_tts.diagnostics")
+
+
+@pytest_asyncio.fixture
+async def api(monkeypatch):
+    stub = StubSpeechAPI(chunks=2)
+    url = await stub.start()
+    monkeypatch.setattr(gpt4o, "OPENAI_TTS_ENDPOINT", url)
+    yield stub
+    await stub.close()
+
+
+def _client():
+    entry = SimpleNamespace(entry_id="e", data={"api_key": "sk-secret"}, options={})
+    return gpt4o.GPT4oClient(None, entry)
+
+
+@pytest.mark.parametrize(
+    ("entity_id", "state", "expected"),
+    [
+        ("assist_satellite.kitchen", "listening", True),
+        ("assist_satellite.kitchen", "processing", True),
+        ("assist_satellite.kitchen", "idle", False),
+        ("binary_sensor.office_assist_in_progress", "on", True),
+        ("binary_sensor.office_assist_in_progress", "off", False),
+        ("light.kitchen", "on", False),
+    ],
+)
+def test_pipeline_start_detection(entity_id, state, expected):
+    assert init._pipeline_starting(entity_id, SimpleNamespace(state=state)) is expected
+    assert init._pipeline_starting(entity_id, None) is False
+
+
+@pytest.mark.asyncio
+async def test_prewarm_marks_next_request_warm(api):
+    client = _client()
+    await client.get_tts_audio("cold")
+    assert client.metrics.cold_requests == 1
+
+    client._warm_until = 0.0
+    client._last_activity = 0.0
+    await client.async_prewarm()
+    assert client.metrics.prewarms == 1
+    # Pre-connect never synthesizes anything
+    assert api.requests == 1
+
+    await client.get_tts_audio("warm")
+    assert client.metrics.warm_requests == 1
+    assert client.metrics.ttfb_improvement_ms is not None
+    await client.async_close()
+
+
+@pytest.mark.asyncio
+async def test_prewarm_skipped_when_pool_recently_used(api):
+    client = _client()
+    await client.get_tts_audio("hello")
+    await client.async_prewarm()
+    assert client.metrics.prewarms == 0
+    await client.async_close()
+
+
+@pytest.mark.asyncio
+async def test_diagnostics_report_metrics_and_redact_key():
+    client = _client()
+    client.metrics.record_ttfb(400, warm=False)
+    client.metrics.record_ttfb(150, warm=True)
+    hass = SimpleNamespace(data={"openai_gpt4o_tts": {"e": client}})
+    result = await diagnostics.async_get_config_entry_diagnostics(hass, client.entry)
+    assert result["data"]["api_key"] == "**REDACTED**"
+    assert result["metrics"]["ttfb_improvement_ms"] == 250
@@ -0,0 +1,79 @@
+import asyncio
+import importlib
+import os
+import pstats
+import sys
+
+import pytest
+import pytest_asyncio
+import voluptuous as vol
+
+sys.path.insert(0, os.path.dirname(__file__))
+from hass_stubs import FakeHass, fake_entry, install_homeassistant_stubs
+from stub_api import StubSpeechAPI
+
+install_homeassistant_stubs()
+
+from homeassistant.exceptions import HomeAssistantError
+
+BASE_DIR = os.path.dirname(os.path.dirname(__file__))
+sys.path.insert(0, BASE_DIR)
+
+gpt4o = importlib.import_module("custom_components.openai_gpt4o_tts.gpt4o")
+profiler = importlib.import_module("custom_components.openai_gpt4o_tts.profiler")
+
+
+@pytest_asyncio.fixture
+async def api(monkeypatch):
+    stub = StubSpeechAPI(chunks=3)
+    url = await stub.start()
+    monkeypatch.setattr(gpt4o, "OPENAI_TTS_ENDPOINT", url)
+    yield stub
+    await stub.close()
+
+
+@pytest.mark.asyncio
+async def test_profile_stops_after_request_count(api, tmp_path):
+    hass = FakeHass(str(tmp_path))
+    entry = fake_entry()
+    client = gpt4o.GPT4oClient(hass, entry)
+    hass.data["openai_gpt4o_tts"] = {"e": client}
+
+    session = profiler.async_start_profile(hass, max_requests=2)
+    with pytest.raises(HomeAssistantError):
+        profiler.async_start_profile(hass)
+    finished = asyncio.ensure_future(profiler.async_finish_profile(hass, session, 30))
+
+    await client.get_tts_audio("hello there")
+    _fmt, chunks = await client.stream_tts_audio("streamed", {"stream_format": "sse"})
+    assert b"".join([chunk async for chunk in chunks])
+    path = await asyncio.wait_for(finished, 5)
+    await client.async_close()
+
+    assert client._request_observers == []
+    assert "openai_gpt4o_tts_profile" not in hass.data
+    timings = [timing for _chars, _fmt, timing in session.timings]
+    assert [timing.kind for timing in timings] == ["get", "stream"]
+    assert all(timing.outcome == "ok" for timing in timings)
+    assert all(timing.first_audio_ms is not None for timing in timings)
+    report = open(path, encoding="utf-8").read()
+    assert "2 requests" in report
+    assert "gpt4o.py" in report
+    # The rest of the event loop, e.g. aiohttp, is left out
+    assert "aiohttp" not in report
+    prof = pstats.Stats(path.replace(".txt", ".prof"))
+    assert prof.stats
+    assert all(
+        filename.startswith(os.path.dirname(profiler.__file__))
+        for filename, _line, _name in prof.stats
+    )
+    assert hass.events == [
+        ("openai_gpt4o_tts_profile", {"path": path, "requests": 2})
+    ]
+
+
+def test_profile_schema():
+    data = profiler.PROFILE_SCHEMA({"requests": "5"})
+    assert data == {"duration": profiler.DEFAULT_PROFILE_SECONDS, "requests": 5}
+    with pytest.raises(vol.Invalid):
+        profiler.PROFILE_SCHEMA({"duration": profiler.MAX_PROFILE_SECONDS + 1})
@@ -0,0 +1,61 @@
+import dataclasses
+import importlib
+import json
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(__file__))
+from hass_stubs import install_homeassistant_stubs
+
+install_homeassistant_stubs()
+
+BASE_DIR = os.path.dirname(os.path.dirname(__file__))
+sys.path.insert(0, BASE_DIR)
+
+request_mod = importlib.import_module("custom_components.openai_gpt4o_tts.request")
+SynthesisRequest = request_mod.SynthesisRequest
+
+DEFAULTS = {
+    "model": "gpt-4o-mini-tts",
+    "voice": None,
+    "instructions": None,
+    "audio_output": "mp3",
+    "playback_speed": "1.0",
+    "stream_format": "audio",
+}
+
+
+def test_resolve_applies_defaults_and_canonicalizes():
+    req = SynthesisRequest.resolve("hi", None, DEFAULTS)
+    assert req.voice == request_mod.DEFAULT_VOICE
+    assert req.instructions == ""
+    assert req.speed == 1.0
+    assert (req.first_chunk_ms, req.chunk_ms) == (100.0, 500.0)
+
+    req = SynthesisRequest.resolve(
+        "hi", {"audio_output": "pcm", "chunk_ms": "250"}, DEFAULTS
+    )
+    assert (req.first_chunk_ms, req.chunk_ms) == (40.0, 250.0)
+
+
+def test_key_tracks_audio_not_transport():
+    base = SynthesisRequest.resolve("hi", {}, DEFAULTS)
+    assert SynthesisRequest.resolve("hi", {}, DEFAULTS).key == base.key
+    for options in ({"stream_format": "sse"}, {"first_chunk_ms": 20}):
+        assert SynthesisRequest.resolve("hi", options, DEFAULTS).key == base.key
+    for options in ({"voice": "nova"}, {"playback_speed": 1.5}, {"model": "tts-1"}):
+        assert SynthesisRequest.resolve("hi", options, DEFAULTS).key != base.key
+    assert SynthesisRequest.resolve("hello", {}, DEFAULTS).key != base.key
+
+
+def test_body_serialized_once_and_request_immutable():
+    req = SynthesisRequest.resolve("hi", {"voice": "nova"}, DEFAULTS)
+    body = req.body
+    assert req.body is body
+    assert json.loads(body) == req.payload
+    assert json.loads(body)["voice"] == "nova"
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        req.voice = "ash"
+    assert not hasattr(req, "__dict__")
@@ -0,0 +1,160 @@
+import importlib
+import os
+import sys
+from types import SimpleNamespace
+
+import pytest
+import pytest_asyncio
+
+sys.path.insert(0, os.path.dirname(__file__))
+from hass_stubs import fake_entry, install_homeassistant_stubs
+from stub_api import StubSpeechAPI
+
+install_homeassistant_stubs()
+
+BASE_DIR = os.path.dirname(os.path.dirname(__file__))
+sys.path.insert(0, BASE_DIR)
+
+gpt4o = importlib.import_module("custom_components.openai_gpt4o_tts.gpt4o")
+routing = importlib.import_module("custom_components.openai_gpt4o_tts.routing")
+
+CHUNKS = 3
+CHUNK_SIZE = 960
+# Nothing listens here, so connecting fails right away
+UNREACHABLE = "http://127.0.0.1:1/v1/audio/speech"
+
+
+@pytest_asyncio.fixture
+async def apis():
+    fast = StubSpeechAPI(chunks=CHUNKS, chunk_size=CHUNK_SIZE, delay=0.01)
+    slow = StubSpeechAPI(chunks=CHUNKS, chunk_size=CHUNK_SIZE, delay=0.15)
+    broken = StubSpeechAPI(chunks=CHUNKS, chunk_size=CHUNK_SIZE, status=503)
+    for stub in (fast, slow, broken):
+        await stub.start()
+    yield SimpleNamespace(fast=fast, slow=slow, broken=broken)
+    for stub in (fast, slow, broken):
+        await stub.close()
+
+
+def _client(endpoints):
+    entry = fake_entry(
+        {"audio_output": "pcm", "trim_silence": False, "endpoints": endpoints}
+    )
+    return gpt4o.GPT4oClient(None, entry)
+
+
+def test_parse_endpoints():
+    endpoints = routing.parse_endpoints(
+        "https://eu.example/v1/audio/speech models=tts-1,gpt-4o-mini-tts key=sk-eu;"
+        "\n  http://tts.local:8000/v1/audio/speech voices=alloy  \nftp://nope",
+        gpt4o.OPENAI_TTS_ENDPOINT,
+    )
+    assert [endpoint.url for endpoint in endpoints] == [
+        "https://eu.example/v1/audio/speech",
+        "http://tts.local:8000/v1/audio/speech",
+    ]
+    assert endpoints[0].api_key == "sk-eu"
+    assert endpoints[0].models == ("tts-1", "gpt-4o-mini-tts")
+    assert endpoints[0].voices is None
+    assert endpoints[1].serves("tts-1", "alloy")
+    assert not endpoints[1].serves("tts-1", "nova")
+    assert not endpoints[0].serves("tts-1-hd", "nova")
+    # Nothing configured: OpenAI itself
+    (default,) = routing.parse_endpoints("", gpt4o.OPENAI_TTS_ENDPOINT)
+    assert default.url == gpt4o.OPENAI_TTS_ENDPOINT and default.api_key is None
+
+
+
+def test_openai_key_only_goes_where_it_belongs():
+    third_party, own_key, opted_in, openai = routing.parse_endpoints(
+        "https://tts.example/v1/audio/speech;"
+        "https://eu.example/v1/audio/speech key=sk-eu;"
+        "http://tts.local:8000/v1/audio/speech openai_key;"
+        "https://api.openai.com/v1/audio/speech",
+        gpt4o.OPENAI_TTS_ENDPOINT,
+    )
+    assert third_party.authorization("sk-openai") is None
+    assert own_key.authorization("sk-openai") == "sk-eu"
+    assert opted_in.authorization("sk-openai") == "sk-openai"
+    assert openai.authorization("sk-openai") == "sk-openai"
+    (default,) = routing.parse_endpoints("", gpt4o.OPENAI_TTS_ENDPOINT)
+    assert default.authorization("sk-openai") == "sk-openai"
+
+
+def test_router_prefers_fast_healthy_endpoints():
+    now = [0.0]
+    a, b, c = (routing.Endpoint(url) for url in "abc")
+    router = routing.EndpointRouter([a, b, c], clock=lambda: now[0])
+
+    # Every endpoint is tried once before latency decides
+    assert [router.route("m", "v")[0] for _ in range(3)] == [a, b, c]
+    router.record_success(a, 300.0)
+    router.record_success(b, 100.0)
+    router.record_success(c, 200.0)
+    assert router.route("m", "v") == [b, c, a]
+
+    # A failing endpoint backs off, and is only a last resort meanwhile
+    router.record_failure(b)
+    assert router.route("m", "v") == [c, a, b]
+    now[0] = routing.BACKOFF_SECONDS + 0.1
+    # Back from backoff, but its recent errors still count against it
+    assert router.rank("m", "v") == [c, a, b]
+    router.record_success(b, 100.0)
+    router.record_success(b, 100.0)
+    assert router.rank("m", "v")[0] is c
+    for _ in range(6):
+        router.record_success(b, 100.0)
+    assert router.rank("m", "v")[0] is b
+
+
+def test_router_probes_the_stalest_endpoint():
+    a, b = routing.Endpoint("a"), routing.Endpoint("b")
+    router = routing.EndpointRouter([a, b], probe_every=4)
+    assert router.route("m", "v")[0] is a
+    router.record_success(a, 100.0)
+    assert router.route("m", "v")[0] is b
+    router.record_success(b, 300.0)
+    assert router.route("m", "v")[0] is a
+    router.record_success(a, 100.0)
+    # The fourth route re-measures the slow endpoint, in case it recovered
+    assert router.route("m", "v")[0] is b
+    assert router.route("m", "v")[0] is a
+
+
+@pytest.mark.asyncio
+async def test_requests_follow_the_fastest_endpoint(apis):
+    client = _client(f"{apis.fast.url}\n{apis.slow.url}\n{apis.broken.url}")
+    expected = b"".join(apis.fast.audio_chunk(i) for i in range(CHUNKS))
+    for n in range(12):
+        assert await client.get_tts_audio(f"message {n}") == ("pcm", expected)
+
+    # Each endpoint was tried once; the broken one failed over to the fast one
+    assert apis.slow.requests == 1
+    # None of them is OpenAI, so the entry's key was never sent
+    assert set(apis.fast.authorizations) == {None}
+    assert apis.broken.requests == 1
+    assert apis.fast.requests == 11
+    stats = client.router.as_dict()
+    assert stats[apis.broken.url]["errors"] == 1
+    assert stats[apis.fast.url]["ttfb_ms"] < stats[apis.slow.url]["ttfb_ms"]
+    await client.async_close()
+
+
+@pytest.mark.asyncio
+async def test_capabilities_and_failover_on_connection_errors(apis):
+    client = _client(
+        f"{UNREACHABLE}; {apis.fast.url} voices=sage,nova; {apis.slow.url} models=tts-1"
+    )
+    # The unreachable endpoint is tried first, then the stream fails over
+    _fmt, chunks = await client.stream_tts_audio("one", {"voice": "nova"})
+    audio = b"".join([chunk async for chunk in chunks])
+    assert len(audio) == CHUNKS * CHUNK_SIZE
+    assert [p["input"] for p in apis.fast.payloads] == ["one"]
+    assert client.router.as_dict()[UNREACHABLE]["failures"] == 1
+
+    # Only the slow endpoint serves tts-1; the fast one only some voices
+    await client.get_tts_audio("two", {"model": "tts-1", "voice": "echo"})
+    assert [p["input"] for p in apis.slow.payloads] == ["two"]
+    assert await client.get_tts_audio("three", {"voice": "echo"}) == (None, None)
+    assert apis.fast.requests == 1
+    await client.async_close()
@@ -0,0 +1,111 @@
+import importlib
+import os
+import sys
+
+import pytest
+import pytest_asyncio
+
+sys.path.insert(0, os.path.dirname(__file__))
+from hass_stubs import FakeHass, fake_entry, install_homeassistant_stubs
+from stub_api import StubSpeechAPI
+
+install_homeassistant_stubs()
+
+BASE_DIR = os.path.dirname(os.path.dirname(__file__))
+sys.path.insert(0, BASE_DIR)
+
+selection = importlib.import_module("custom_components.openai_gpt4o_tts.selection")
+gpt4o = importlib.import_module("custom_components.openai_gpt4o_tts.gpt4o")
+
+FORMATS = ("wav", "mp3")
+MODES = ("audio", "sse")
+
+
+def _measured(selector, latencies):
+    for (fmt, mode), ttfb in latencies.items():
+        assert selector.choose(FORMATS, MODES) == (fmt, mode)
+        selector.record(fmt, mode, ttfb, 1000, 0.5)
+
+
+def test_tries_every_pair_then_picks_fastest():
+    selector = selection.FormatSelector(probe_every=1000)
+    _measured(
+        selector,
+        {
+            ("wav", "audio"): 300,
+            ("wav", "sse"): 120,
+            ("mp3", "audio"): 400,
+            ("mp3", "sse"): 250,
+        },
+    )
+    assert selector.choose(FORMATS, MODES) == ("wav", "sse")
+    # Converting for the player costs more than the latency gap here
+    assert selector.choose(FORMATS, MODES, preferred="mp3") == ("mp3", "sse")
+    assert selector.as_dict()["wav/sse"]["bytes_per_second"] == 2000
+
+
+def test_periodic_probe_and_failed_pairs():
+    selector = selection.FormatSelector(probe_every=6)
+    _measured(selector, {("wav", "audio"): 100, ("wav", "sse"): 500})
+    selector.choose(FORMATS, MODES)  # mp3/audio tried but never answers
+    selector.choose(FORMATS, MODES)  # so is mp3/sse
+    # Fastest pair wins, the stalest one gets re-measured every sixth pick
+    assert selector.choose(FORMATS, MODES) == ("wav", "audio")
+    selector.record("wav", "audio", 100, 1000, 0.5)
+    assert selector.choose(FORMATS, MODES) == ("wav", "sse")
+
+
+@pytest_asyncio.fixture
+async def api(monkeypatch):
+    stub = StubSpeechAPI(chunks=2)
+    url = await stub.start()
+    monkeypatch.setattr(gpt4o, "OPENAI_TTS_ENDPOINT", url)
+    yield stub
+    await stub.close()
+
+
+@pytest.mark.asyncio
+async def test_client_auto_options(api):
+    entry = fake_entry({"audio_output": "auto", "stream_format": "auto"})
+    client = gpt4o.GPT4oClient(None, entry)
+    seen = set()
+    for n in range(len(selection.AUTO_FORMATS) * 2):
+        # Home Assistant converts to the player's format from any other
+        fmt, data = await client.get_tts_audio(f"hi {n}", {"preferred_format": "wav"})
+        assert data
+        seen.add((fmt, api.payloads[-1]["stream_format"]))
+    assert len(seen) == len(selection.AUTO_FORMATS) * 2
+    assert "pcm" not in {fmt for fmt, _mode in seen}
+    assert all(stats["samples"] == 1 for stats in client.selector.as_dict().values())
+
+    await client.get_tts_audio("legacy", {"model": "tts-1", "audio_output": "mp3"})
+    assert api.payloads[-1]["stream_format"] == "audio"
+    await client.async_close()
+
+
+@pytest.mark.asyncio
+async def test_auto_prefers_cached_audio(api, tmp_path):
+    entry = fake_entry({"audio_output": "auto", "stream_format": "auto"})
+    client = gpt4o.GPT4oClient(FakeHass(), entry)
+    await client.async_load_cache(str(tmp_path), 1024 * 1024)
+    preferred = {"preferred_format": "wav"}
+    fmt, data = await client.get_tts_audio("hello", preferred)
+    # The selector would try another format next, but the cached one wins
+    for _ in range(3):
+        assert await client.get_tts_audio("hello", preferred) == (fmt, data)
+    assert api.requests == 1
+    assert sum(stats["selected"] for stats in client.selector.as_dict().values()) == 1
+    await client.async_close()
+
+
+@pytest.mark.asyncio
+async def test_auto_without_preferred_format_uses_mp3(api):
+    entry = fake_entry({"audio_output": "auto", "stream_format": "auto"})
+    client = gpt4o.GPT4oClient(None, entry)
+    # Nothing converts the audio, so only a format every player plays
+    for n in range(len(selection.AUTO_FORMATS) * 2):
+        fmt, data = await client.get_tts_audio(f"hi {n}")
+        assert (fmt, api.payloads[-1]["response_format"]) == ("mp3", "mp3")
+    # Stream modes are still measured
+    assert {payload["stream_format"] for payload in api.payloads} == {"audio", "sse"}
+    await client.async_close()
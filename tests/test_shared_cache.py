@@ -0,0 +1,114 @@
+import asyncio
+import importlib
+import os
+import sys
+
+import pytest
+import pytest_asyncio
+
+sys.path.insert(0, os.path.dirname(__file__))
+from hass_stubs import FakeHass, fake_entry, install_homeassistant_stubs
+from stub_api import StubSpeechAPI
+from stub_cache import StubCacheServer
+
+install_homeassistant_stubs()
+
+BASE_DIR = os.path.dirname(os.path.dirname(__file__))
+sys.path.insert(0, BASE_DIR)
+
+gpt4o = importlib.import_module("custom_components.openai_gpt4o_tts.gpt4o")
+backend = importlib.import_module("custom_components.openai_gpt4o_tts.backend")
+cache = importlib.import_module("custom_components.openai_gpt4o_tts.cache")
+
+
+@pytest_asyncio.fixture
+async def api(monkeypatch):
+    stub = StubSpeechAPI(chunks=2)
+    url = await stub.start()
+    monkeypatch.setattr(gpt4o, "OPENAI_TTS_ENDPOINT", url)
+    yield stub
+    await stub.close()
+
+
+@pytest_asyncio.fixture
+async def shared():
+    server = StubCacheServer()
+    server.url = await server.start()
+    yield server
+    await server.close()
+
+
+def _instance(tmp_path, name, url):
+    store = cache.SegmentStore(str(tmp_path / name))
+    return gpt4o.GPT4oClient(
+        FakeHass(), fake_entry({"shared_cache_url": url}), cache=store
+    )
+
+
+@pytest.mark.asyncio
+async def test_one_synthesis_serves_every_instance(tmp_path, api, shared):
+    house = _instance(tmp_path, "house", shared.url)
+    garage = _instance(tmp_path, "garage", shared.url)
+
+    fmt, audio = await house.get_tts_audio("Front door opened")
+    await house._write_behind.async_flush(5)
+    assert api.requests == 1
+    assert shared.puts == 1
+
+    assert await garage.get_tts_audio("Front door opened") == (fmt, audio)
+    assert api.requests == 1
+    assert garage.metrics.shared_hits == 1
+
+    # The shared hit filled the garage's local cache
+    lookups = shared.gets
+    assert await garage.get_tts_audio("Front door opened") == (fmt, audio)
+    assert shared.gets == lookups
+    await house.async_close()
+    await garage.async_close()
+
+
+@pytest.mark.asyncio
+async def test_unreachable_backend_falls_back_to_synthesis(tmp_path, api):
+    client = _instance(tmp_path, "office", "http://127.0.0.1:9/clips")
+    fmt, audio = await client.get_tts_audio("hello")
+    assert audio
+    assert client.metrics.shared_misses == 1
+    await client.async_close()
+
+
+@pytest.mark.asyncio
+async def test_slow_backend_is_a_quick_miss(tmp_path, api, shared):
+    shared.delay = 2
+    client = _instance(tmp_path, "attic", shared.url)
+    loop = asyncio.get_running_loop()
+    started = loop.time()
+    _fmt, audio = await client.get_tts_audio("hello")
+    assert audio
+    # Synthesis waited a fraction of a second for the shared cache, not 2 s
+    assert loop.time() - started < 1
+    assert client.metrics.shared_misses == 1
+    await client.async_close()
+
+
+@pytest.mark.asyncio
+async def test_write_behind_drops_when_backlogged():
+    release = asyncio.Event()
+    stored = []
+
+    class SlowBackend(backend.CacheBackend):
+        async def async_get(self, key):
+            return None
+
+        async def async_put(self, key, audio_format, data):
+            await release.wait()
+            stored.append(key)
+
+    writer = backend.WriteBehind(SlowBackend(), limit=2)
+    for n in range(5):
+        writer.enqueue(f"k{n}", "mp3", b"x")
+    await asyncio.sleep(0)
+    assert writer.dropped >= 2
+    release.set()
+    await writer.async_flush(1)
+    assert stored[0] == "k0"
+    assert len(stored) + writer.dropped == 5
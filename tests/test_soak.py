@@ -0,0 +1,176 @@
+"""Soak test: many mixed requests must not grow memory, fds or tasks.
+
+The default run is short enough for every ``pytest`` invocation.  Before
+trusting a change on a 24/7 install, run the long version::
+
+    SOAK_REQUESTS=300000 pytest tests/test_soak.py -s
+"""
+
+import asyncio
+import gc
+import importlib
+import os
+import sys
+import tracemalloc
+
+import pytest
+import pytest_asyncio
+
+sys.path.insert(0, os.path.dirname(__file__))
+from hass_stubs import FakeHass, fake_entry, install_homeassistant_stubs
+from stub_api import StubSpeechAPI
+
+install_homeassistant_stubs()
+
+from homeassistant.components.tts import TTSAudioRequest
+
+BASE_DIR = os.path.dirname(os.path.dirname(__file__))
+sys.path.insert(0, BASE_DIR)
+
+cache = importlib.import_module("custom_components.openai_gpt4o_tts.cache")
+gpt4o = importlib.import_module("custom_components.openai_gpt4o_tts.gpt4o")
+tts_module = importlib.import_module("custom_components.openai_gpt4o_tts.tts")
+usage = importlib.import_module("custom_components.openai_gpt4o_tts.usage")
+
+SOAK_REQUESTS = int(os.environ.get("SOAK_REQUESTS", "3000"))
+# Requests in flight at once
+CONCURRENCY = 25
+# Resource samples taken over the run; the first ones are warm-up
+SAMPLES = 12
+WARMUP_SAMPLES = 2
+# Growth tolerated between the first and second half of the samples
+SLACK = {
+    "rss_kb": 8 * 1024,
+    "traced_kb": 1024,
+    "fds": 2,
+    "tasks": 2,
+}
+# Distinct phrases; repeats are served from the cache
+PHRASES = 200
+# One request in this many hits the client timeout
+TIMEOUT_EVERY = 200
+# The cache journal grows until it is folded into the index; a small limit
+# lets that happen several times even in the short run
+JOURNAL_LIMIT = 256
+
+
+def _rss_kb() -> int:
+    with open("/proc/self/statm") as statm:
+        return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") // 1024
+
+
+def _sample() -> dict[str, int]:
+    gc.collect()
+    return {
+        "rss_kb": _rss_kb(),
+        "traced_kb": tracemalloc.get_traced_memory()[0] // 1024,
+        "fds": len(os.listdir("/proc/self/fd")),
+        "tasks": len(asyncio.all_tasks()),
+    }
+
+
+def _growth(samples: list[dict[str, int]]) -> dict[str, tuple[int, int]]:
+    """Return metrics whose second half never drops to the first half's peak."""
+    samples = samples[WARMUP_SAMPLES:]
+    half = len(samples) // 2
+    grown = {}
+    for name, slack in SLACK.items():
+        first = max(sample[name] for sample in samples[:half])
+        second = min(sample[name] for sample in samples[half:])
+        if second > first + slack:
+            grown[name] = (first, second)
+    return grown
+
+
+@pytest_asyncio.fixture
+async def api(monkeypatch):
+    stub = StubSpeechAPI(chunks=4, chunk_size=2048)
+    stub.keep_payloads = False
+    stub.overrides = {"err": {"status": 500}, "slow": {"delay": 2.0}}
+    url = await stub.start()
+    monkeypatch.setattr(gpt4o, "OPENAI_TTS_ENDPOINT", url)
+    monkeypatch.setattr(gpt4o, "REQUEST_TIMEOUT", 0.5)
+    monkeypatch.setattr(cache, "JOURNAL_LIMIT", JOURNAL_LIMIT)
+    yield stub
+    await stub.close()
+
+
+async def _consume(chunks) -> int:
+    return sum([len(chunk) async for chunk in chunks])
+
+
+async def _request(client, provider, n: int) -> None:
+    """Run one request; ``n`` picks what kind."""
+    text = f"phrase {n % PHRASES}" if n % 3 else f"unique {n}"
+    sse = {"stream_format": "sse"}
+    kind = n % 10
+    if n % TIMEOUT_EVERY == 7:
+        assert await client.get_tts_audio(f"slow: {n}") == (None, None)
+    elif kind == 0:
+        assert await client.get_tts_audio(f"err: {n}") == (None, None)
+    elif kind == 1:
+        # Streams have started when the API error arrives; they end empty
+        request = TTSAudioRequest("en", sse, _message(f"err: {n}"))
+        response = await provider.async_stream_tts_audio(request)
+        assert await _consume(response.data_gen) == 0
+    elif kind == 2:
+        _fmt, chunks = await client.stream_tts_audio(f"unique {n}", sse)
+        await chunks.__anext__()
+        await chunks.aclose()
+    elif kind == 3:
+        task = asyncio.get_running_loop().create_task(
+            client.get_tts_audio(f"unique {n}")
+        )
+        await asyncio.sleep(0)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+    elif kind in (4, 5):
+        request = TTSAudioRequest("en", sse, _message(text))
+        assert await _consume((await provider.async_stream_tts_audio(request)).data_gen)
+    else:
+        _fmt, data = await provider.async_get_tts_audio(text, "en", {})
+        assert data
+
+
+async def _message(text: str):
+    yield text
+
+
+@pytest.mark.asyncio
+async def test_soak_mixed_requests(api, tmp_path):
+    entry = fake_entry({"audio_output": "pcm"}, entry_id="soak")
+    client = gpt4o.GPT4oClient(FakeHass(), entry)
+    await client.async_load_cache(str(tmp_path), 2 * 1024 * 1024)
+    provider = tts_module.OpenAIGPT4oTTSProvider(entry, client, usage.UsageTracker())
+
+    tracemalloc.start()
+    samples = []
+    rounds = max(1, SOAK_REQUESTS // CONCURRENCY)
+    every = max(1, rounds // SAMPLES)
+    try:
+        for rnd in range(rounds):
+            await asyncio.gather(
+                *(
+                    _request(client, provider, rnd * CONCURRENCY + idx)
+                    for idx in range(CONCURRENCY)
+                )
+            )
+            if rnd % every == every - 1:
+                # Let aborted connections and finalizers settle
+                await asyncio.sleep(0.01)
+                samples.append(_sample())
+                snapshot = tracemalloc.take_snapshot()
+                if len(samples) == WARMUP_SAMPLES + 1:
+                    baseline = snapshot
+    finally:
+        tracemalloc.stop()
+        await client.async_close()
+
+    print(f"soak: {rounds * CONCURRENCY} requests, {api.requests} upstream")
+    for sample in samples:
+        print("soak sample:", sample)
+    grown = _growth(samples)
+    top = "\n".join(str(stat) for stat in snapshot.compare_to(baseline, "lineno")[:10])
+    assert not grown, f"resources grew: {grown}\nlargest allocation growth:\n{top}"
+    assert not client._session or not client._session.connector._acquired
@@ -0,0 +1,117 @@
+"""Guard the cost the integration adds to Home Assistant startup."""
+
+import asyncio
+import importlib
+import os
+import subprocess
+import sys
+import time
+from types import SimpleNamespace
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(__file__))
+from hass_stubs import FakeHass, install_homeassistant_stubs
+
+install_homeassistant_stubs()
+
+BASE_DIR = os.path.dirname(os.path.dirname(__file__))
+sys.path.insert(0, BASE_DIR)
+
+init = importlib.import_module("custom_components.openai_gpt4o_tts.__init__")
+
+# Generous bounds: CI machines are slow, regressions are usually 10x
+MAX_IMPORT_SECONDS = float(os.environ.get("MAX_IMPORT_SECONDS", "0.5"))
+MAX_SETUP_SECONDS = float(os.environ.get("MAX_SETUP_SECONDS", "0.05"))
+
+_IMPORT_SCRIPT = """
+import sys, time
+sys.path[:0] = [{tests!r}, {base!r}]
+from hass_stubs import FakeHass, install_homeassistant_stubs
+install_homeassistant_stubs()
+import aiohttp.web, voluptuous  # already loaded by Home Assistant itself
+before = set(sys.modules)
+start = time.perf_counter()
+import custom_components.openai_gpt4o_tts
+import custom_components.openai_gpt4o_tts.tts
+elapsed = time.perf_counter() - start
+print(elapsed)
+print(" ".join(sorted(set(sys.modules) - before)))
+"""
+
+
+class DummyConfigEntries:
+    async def async_forward_entry_setups(self, entry, platforms):
+        return True
+
+
+class DummyEntry(SimpleNamespace):
+    def async_on_unload(self, func):
+        self.unloads.append(func)
+
+    def add_update_listener(self, listener):
+        return lambda: None
+
+    def async_create_background_task(self, hass, coro, name):
+        task = asyncio.get_running_loop().create_task(coro)
+        self.tasks.append(task)
+        return task
+
+
+def _hass(tmp_path):
+    hass = FakeHass(str(tmp_path))
+    hass.started = []
+    hass.config_entries = DummyConfigEntries()
+    hass.bus.async_listen = lambda event, cb: lambda: None
+    hass.bus.async_listen_once = lambda event, cb: lambda: None
+    hass.http = SimpleNamespace(register_view=lambda view: None)
+    hass.services = SimpleNamespace(
+        has_service=lambda domain, service: False,
+        async_register=lambda domain, service, handler, schema=None: None,
+    )
+    return hass
+
+
+def test_import_time():
+    script = _IMPORT_SCRIPT.format(tests=os.path.dirname(__file__), base=BASE_DIR)
+    out = subprocess.run(
+        [sys.executable, "-c", script], capture_output=True, text=True, check=True
+    ).stdout.splitlines()
+    elapsed, loaded = float(out[0]), out[1].split()
+    print(f"integration import: {elapsed * 1000:.1f} ms, {len(loaded)} modules")
+    assert elapsed < MAX_IMPORT_SECONDS
+    top_level = {name.split(".")[0] for name in loaded}
+    # No optional audio libraries are pulled in at import time
+    assert top_level <= {"custom_components"} | set(sys.stdlib_module_names)
+
+
+@pytest.mark.asyncio
+async def test_setup_entry_defers_heavy_work(tmp_path):
+    hass = _hass(tmp_path)
+    entry = DummyEntry(
+        entry_id="bench",
+        data={"api_key": "k"},
+        options={"cache_audio": True, "cache_warm_count": 5},
+        unloads=[],
+        tasks=[],
+    )
+
+    start = time.perf_counter()
+    assert await init.async_setup_entry(hass, entry)
+    elapsed = time.perf_counter() - start
+    print(f"async_setup_entry: {elapsed * 1000:.2f} ms")
+    assert elapsed < MAX_SETUP_SECONDS
+
+    client = hass.data["openai_gpt4o_tts"]["bench"]
+    # Nothing touches disk or the network until Home Assistant has started
+    assert hass.executor_calls == []
+    assert client.cache is None
+    assert client._session is None
+    assert not tmp_path.joinpath(".storage").exists()
+
+    for at_started in hass.started:
+        at_started(hass)
+    await asyncio.gather(*entry.tasks)
+    assert client.cache is not None
+    assert tmp_path.joinpath(".storage").exists()
+    await client.async_close()
@@ -0,0 +1,115 @@
+import asyncio
+import importlib
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(__file__))
+from hass_stubs import install_homeassistant_stubs
+
+install_homeassistant_stubs()
+
+BASE_DIR = os.path.dirname(os.path.dirname(__file__))
+sys.path.insert(0, BASE_DIR)
+
+stream = importlib.import_module("custom_components.openai_gpt4o_tts.stream")
+metrics_module = importlib.import_module("custom_components.openai_gpt4o_tts.metrics")
+
+
+class Source:
+    def __init__(self, count, size=10, delay=0.0, error=None):
+        self.count = count
+        self.size = size
+        self.delay = delay
+        self.error = error
+        self.produced = 0
+        self.closed = False
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        if self.produced == self.count:
+            if self.error:
+                raise self.error
+            raise StopAsyncIteration
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        self.produced += 1
+        return b"x" * self.size
+
+    async def aclose(self):
+        self.closed = True
+
+
+def _reader(source, high_water, low_water, metrics=None, keep=False):
+    tee = stream.StreamTee(high_water, low_water, keep, metrics)
+    tee.attach(source)
+    return tee, tee.reader()
+
+
+@pytest.mark.asyncio
+async def test_reads_ahead_up_to_high_water():
+    metrics = metrics_module.ClientMetrics()
+    source = Source(100)
+    tee, gen = _reader(source, high_water=50, low_water=20, metrics=metrics)
+    assert await gen.__anext__() == b"x" * 10
+    await asyncio.sleep(0.01)
+    # Producer ran ahead of the consumer until the budget was exhausted
+    assert source.produced == 6
+    assert metrics.producer_stalls == 1
+
+    data = b"".join([await gen.__anext__()] + [chunk async for chunk in gen])
+    assert len(data) == 990
+    assert metrics.peak_buffered_bytes <= 60
+    assert source.closed
+    # Nothing is kept once read
+    assert tee.data() == b""
+
+
+@pytest.mark.asyncio
+async def test_consumer_stalls_are_counted():
+    metrics = metrics_module.ClientMetrics()
+    source = Source(3, delay=0.01)
+    _tee, gen = _reader(source, 1000, 100, metrics)
+    chunks = [c async for c in gen]
+    assert len(chunks) == 3
+    assert metrics.consumer_stalls == 2
+    assert metrics.consumer_stall_seconds > 0
+    assert metrics.producer_stalls == 0
+
+
+@pytest.mark.asyncio
+async def test_producer_error_reaches_consumer():
+    source = Source(2, error=ValueError("boom"))
+    _tee, gen = _reader(source, 1000, 100)
+    with pytest.raises(ValueError):
+        [chunk async for chunk in gen]
+
+
+@pytest.mark.asyncio
+async def test_closing_consumer_cancels_producer():
+    source = Source(1000, delay=0.001)
+    _tee, gen = _reader(source, 1000, 100)
+    await gen.__anext__()
+    before = len(asyncio.all_tasks())
+    await gen.aclose()
+    assert source.closed
+    assert len(asyncio.all_tasks()) == before - 1
+
+
+@pytest.mark.asyncio
+async def test_producer_outlives_readers_that_leave():
+    source = Source(20, delay=0.001)
+    tee, first = _reader(source, 1000, 100, keep=True)
+    await first.__anext__()
+    late = tee.reader()
+    await late.__anext__()
+    await first.aclose()
+    # The remaining reader still gets the whole stream
+    rest = [chunk async for chunk in late]
+    assert len(rest) == 19
+    assert tee.complete and tee.data() == b"x" * 200
+    # Joining after the end replays it all
+    assert await tee.wait() == b"x" * 200
@@ -0,0 +1,126 @@
+import asyncio
+import importlib
+import os
+import sys
+
+import pytest
+import pytest_asyncio
+
+sys.path.insert(0, os.path.dirname(__file__))
+from hass_stubs import FakeHass, fake_entry, install_homeassistant_stubs
+from stub_api import StubSpeechAPI
+
+install_homeassistant_stubs()
+
+BASE_DIR = os.path.dirname(os.path.dirname(__file__))
+sys.path.insert(0, BASE_DIR)
+
+gpt4o = importlib.import_module("custom_components.openai_gpt4o_tts.gpt4o")
+
+CHUNKS = 5
+# 100 ms of 24 kHz 16-bit PCM
+CHUNK_SIZE = 4800
+STREAM = {"stream_format": "sse"}
+
+
+@pytest_asyncio.fixture
+async def api(monkeypatch):
+    stub = StubSpeechAPI(chunks=CHUNKS, chunk_size=CHUNK_SIZE, interval=0.05)
+    monkeypatch.setattr(gpt4o, "OPENAI_TTS_ENDPOINT", await stub.start())
+    yield stub
+    await stub.close()
+
+
+@pytest_asyncio.fixture
+async def client(tmp_path):
+    entry = fake_entry({"audio_output": "pcm", "trim_silence": False})
+    client = gpt4o.GPT4oClient(FakeHass(), entry)
+    await client.async_load_cache(str(tmp_path), 8 * 1024 * 1024)
+    yield client
+    await client.async_close()
+
+
+async def _stream(client, text, received=None):
+    _fmt, chunks = await client.stream_tts_audio(text, STREAM)
+    audio = []
+    async for chunk in chunks:
+        audio.append(chunk)
+        if received is not None:
+            received.set()
+    return b"".join(audio)
+
+
+def _expected(api):
+    return b"".join(api.audio_chunk(i) for i in range(CHUNKS))
+
+
+@pytest.mark.asyncio
+async def test_completed_stream_is_cached(api, client):
+    key = client.build_request("hello", STREAM).key
+    assert await _stream(client, "hello") == _expected(api)
+    assert key in client.cache and not client._tees
+
+    # Served from the cache from now on, streamed or fetched whole
+    assert await _stream(client, "hello") == _expected(api)
+    assert await client.get_tts_audio("hello") == ("pcm", _expected(api))
+    assert api.requests == 1
+
+
+@pytest.mark.asyncio
+async def test_cut_short_stream_is_not_cached(api, client):
+    _fmt, chunks = await client.stream_tts_audio("hello", STREAM)
+    await anext(chunks)
+    await chunks.aclose()
+    await asyncio.sleep(0.05)
+    assert client.build_request("hello", STREAM).key not in client.cache
+    assert not client._tees
+
+
+@pytest.mark.asyncio
+async def test_concurrent_readers_tail_the_stream_in_progress(api, client):
+    received = asyncio.Event()
+    leader = asyncio.ensure_future(_stream(client, "hello", received))
+    await received.wait()
+    # What already arrived is replayed at once, then the rest as it comes
+    _fmt, chunks = await client.stream_tts_audio("hello", STREAM)
+    get = asyncio.ensure_future(client.get_tts_audio("hello"))
+    first = await asyncio.wait_for(anext(chunks), 0.01)
+    follower = first + b"".join([chunk async for chunk in chunks])
+
+    assert follower == _expected(api)
+    assert await get == ("pcm", _expected(api))
+    assert await leader == _expected(api)
+    assert api.requests == 1
+    assert client.metrics.tailed_requests == 2
+
+
+@pytest.mark.asyncio
+async def test_followers_outlive_a_cancelled_leader(api, client):
+    received = asyncio.Event()
+    leader = asyncio.ensure_future(_stream(client, "hello", received))
+    await received.wait()
+    _fmt, chunks = await client.stream_tts_audio("hello", STREAM)
+    first = await anext(chunks)
+    leader.cancel()
+
+    # The shared stream keeps running for the follower, to the end
+    follower = first + b"".join([chunk async for chunk in chunks])
+    assert follower == _expected(api)
+    assert api.requests == 1
+    assert client.build_request("hello", STREAM).key in client.cache
+
+
+@pytest.mark.asyncio
+async def test_streams_are_not_buffered_whole_without_a_cache(api):
+    entry = fake_entry({"audio_output": "pcm", "trim_silence": False})
+    client = gpt4o.GPT4oClient(None, entry)
+    received = asyncio.Event()
+    leader = asyncio.ensure_future(_stream(client, "hello", received))
+    await received.wait()
+    # Nothing to share: the second reader renders its own
+    assert not client._tees
+    assert await _stream(client, "hello") == _expected(api)
+    assert await leader == _expected(api)
+    assert api.requests == 2
+    assert client.metrics.tailed_requests == 0
+    await client.async_close()
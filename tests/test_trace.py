@@ -0,0 +1,113 @@
+import asyncio
+import importlib
+import importlib.util
+import os
+import sys
+
+import pytest
+import pytest_asyncio
+
+sys.path.insert(0, os.path.dirname(__file__))
+from hass_stubs import FakeHass, fake_entry, install_homeassistant_stubs
+from stub_api import StubSpeechAPI
+
+install_homeassistant_stubs()
+
+BASE_DIR = os.path.dirname(os.path.dirname(__file__))
+sys.path.insert(0, BASE_DIR)
+
+gpt4o = importlib.import_module("custom_components.openai_gpt4o_tts.gpt4o")
+trace = importlib.import_module("custom_components.openai_gpt4o_tts.trace")
+
+_spec = importlib.util.spec_from_file_location(
+    "replay_trace", os.path.join(BASE_DIR, "scripts", "replay_trace.py")
+)
+replay_trace = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(replay_trace)
+
+
+@pytest_asyncio.fixture
+async def api(monkeypatch):
+    stub = StubSpeechAPI(chunks=2)
+    url = await stub.start()
+    monkeypatch.setattr(gpt4o, "OPENAI_TTS_ENDPOINT", url)
+    yield stub
+    await stub.close()
+
+
+@pytest.mark.asyncio
+async def test_recorded_trace_is_anonymized(api, tmp_path):
+    hass = FakeHass()
+    entry = fake_entry()
+    client = gpt4o.GPT4oClient(hass, entry)
+    path = str(tmp_path / "trace.jsonl")
+    recorder = trace.TraceRecorder(hass, path, trace.trace_salt("k"))
+    unsubscribe = client.async_add_request_observer(recorder.record)
+
+    await client.get_tts_audio("Good morning, Alice")
+    await client.get_tts_audio("Good morning, Alice")
+    _fmt, chunks = await client.stream_tts_audio(
+        "Secret plans", {"stream_format": "sse", "voice": "nova"}
+    )
+    async for _chunk in chunks:
+        pass
+    unsubscribe()
+    await client.get_tts_audio("not recorded")
+    await recorder.async_close()
+    await client.async_close()
+
+    raw = open(path, encoding="utf-8").read()
+    assert "Alice" not in raw and "Secret" not in raw
+    records = trace.load_trace(path)
+    assert [r["kind"] for r in records] == ["get", "get", "stream"]
+    assert records[0]["text"] == records[1]["text"] != records[2]["text"]
+    assert records[2]["chars"] == len("Secret plans")
+    assert records[2]["voice"] == "nova"
+    assert all(r["outcome"] == "ok" and r["ttfb_ms"] is not None for r in records)
+
+
+def test_trace_rotates(tmp_path, monkeypatch):
+    monkeypatch.setattr(trace, "TRACE_MAX_BYTES", 10)
+    path = str(tmp_path / "trace.jsonl")
+    recorder = trace.TraceRecorder(None, path, b"salt")
+    recorder._write(["{}"] * 6)
+    recorder._write(["{}"])
+    assert open(f"{path}.1").read().count("{}") == 6
+    assert open(path).read() == "{}\n"
+
+
+@pytest.mark.asyncio
+async def test_replay_reissues_trace(api, tmp_path):
+    base = {
+        "kind": "get",
+        "chars": 12,
+        "instructions": "",
+        "model": "gpt-4o-mini-tts",
+        "voice": "sage",
+        "format": "mp3",
+        "stream": "audio",
+        "speed": 1.0,
+        "priority": False,
+        "ttfb_ms": 400.0,
+        "total_ms": 900.0,
+        "bytes": 2048,
+        "outcome": "ok",
+    }
+    records = [
+        {**base, "t": 100.0, "text": "aaaa"},
+        # A multi-room broadcast: the same phrase twice at once
+        {**base, "t": 100.5, "text": "bbbb", "kind": "stream", "stream": "sse"},
+        {**base, "t": 100.5, "text": "bbbb", "kind": "stream", "stream": "sse"},
+        {**base, "t": 101.0, "text": "aaaa"},
+    ]
+    loop = asyncio.get_running_loop()
+    started = loop.time()
+    summary = await replay_trace.replay(records, api.url, rate=10, cache_mb=1)
+    # One second of trace at 10x
+    assert 0.1 <= loop.time() - started < 1.0
+    assert summary["requests"] == 4
+    assert summary["outcomes"] == {"ok": 4}
+    # The repeated "aaaa" is a cache hit
+    assert api.requests == 3
+    assert replay_trace.stand_in_text(records[0]) == "aaaa aaaa aa"
+    assert replay_trace.request_options(records[1])["stream_format"] == "sse"
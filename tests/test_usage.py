@@ -0,0 +1,93 @@
+import importlib
+import os
+import sys
+from types import SimpleNamespace
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(__file__))
+from hass_stubs import FakeHass, fake_entry, install_homeassistant_stubs
+
+install_homeassistant_stubs()
+
+BASE_DIR = os.path.dirname(os.path.dirname(__file__))
+sys.path.insert(0, BASE_DIR)
+
+usage = importlib.import_module("custom_components.openai_gpt4o_tts.usage")
+cache = importlib.import_module("custom_components.openai_gpt4o_tts.cache")
+gpt4o = importlib.import_module("custom_components.openai_gpt4o_tts.gpt4o")
+tts_module = importlib.import_module("custom_components.openai_gpt4o_tts.tts")
+
+
+def test_top_phrases_and_normalization():
+    tracker = usage.UsageTracker(capacity=4)
+    for _ in range(5):
+        tracker.record("Front door  is open", {"voice": "nova", "stream_format": "sse"})
+    tracker.record("front door is OPEN", {"voice": "nova"})
+    tracker.record("Washing done")
+    top = tracker.top(1)
+    assert top == [("front door is OPEN", {"voice": "nova"})]
+
+
+def test_memory_is_bounded():
+    tracker = usage.UsageTracker(capacity=8)
+    rows = [len(row) for row in tracker._rows]
+    for n in range(20_000):
+        tracker.record(f"unique message {n}")
+    for _ in range(50):
+        tracker.record("hot phrase")
+    assert len(tracker._hot) == 8
+    assert [len(row) for row in tracker._rows] == rows
+    assert tracker.top(1)[0][0] == "hot phrase"
+
+
+def test_decay_and_threshold():
+    tracker = usage.UsageTracker()
+    tracker.record("once")
+    for _ in range(4):
+        tracker.record("often")
+    assert [msg for msg, _ in tracker.top(5, min_estimate=2)] == ["often"]
+    tracker.decay(0.25)
+    assert tracker.top(5, min_estimate=2) == []
+
+
+def test_long_messages_not_tracked():
+    tracker = usage.UsageTracker()
+    assert tracker.record("x" * (usage.MAX_TRACKED_LENGTH + 1)) == 0.0
+    assert tracker.top(5) == []
+
+
+class _CountingClient(gpt4o.GPT4oClient):
+    async def iter_tts_audio(self, request):
+        self.rendered.append((request.text, request.voice))
+        yield b"audio"
+
+
+@pytest.mark.asyncio
+async def test_warm_renders_only_missing(tmp_path):
+    client = _CountingClient(
+        FakeHass(), fake_entry(), cache=cache.SegmentStore(str(tmp_path))
+    )
+    client.rendered = []
+
+    await client.get_tts_audio("cached")
+    phrases = [("cached", {}), ("missing", {"voice": "nova"})]
+    assert await client.async_warm_cache(phrases) == 1
+    assert client.rendered[-1] == ("missing", "nova")
+    assert await client.async_warm_cache(phrases) == 0
+    await client.async_close()
+
+
+@pytest.mark.asyncio
+async def test_provider_records_usage():
+    class Client:
+        async def get_tts_audio(self, message, options=None):
+            return "mp3", b"x"
+
+    tracker = usage.UsageTracker()
+    provider = tts_module.OpenAIGPT4oTTSProvider(
+        SimpleNamespace(entry_id="id"), Client(), tracker
+    )
+    await provider.async_get_tts_audio("hello", "en", {"voice": "ash"})
+    await provider.async_get_tts_audio("hello", "en", {"voice": "ash"})
+    assert tracker.top(1, min_estimate=2) == [("hello", {"voice": "ash"})]
@@ -0,0 +1,116 @@
+import asyncio
+import importlib
+import os
+import sys
+from types import SimpleNamespace
+
+import pytest
+import pytest_asyncio
+from aiohttp import web
+from aiohttp.test_utils import TestClient, TestServer
+
+sys.path.insert(0, os.path.dirname(__file__))
+from hass_stubs import FakeHass, install_homeassistant_stubs
+
+install_homeassistant_stubs()
+
+BASE_DIR = os.path.dirname(os.path.dirname(__file__))
+sys.path.insert(0, BASE_DIR)
+
+cache = importlib.import_module("custom_components.openai_gpt4o_tts.cache")
+view_mod = importlib.import_module("custom_components.openai_gpt4o_tts.view")
+
+KEY = "ab" * 16
+AUDIO = bytes(range(256)) * 40
+
+
+@pytest_asyncio.fixture
+async def http(tmp_path):
+    store = cache.SegmentStore(str(tmp_path))
+    store.put("cd" * 16, "wav", b"other clip first")
+    store.put(KEY, "mp3", AUDIO)
+    hass = FakeHass()
+    hass.data["openai_gpt4o_tts"] = {"e": SimpleNamespace(cache=store)}
+    view = view_mod.CachedClipView(hass)
+    app = web.Application()
+
+    def handler(method):
+        # Home Assistant passes the URL match info as keyword arguments
+        async def handle(request):
+            return await method(request, **request.match_info)
+
+        return handle
+
+    app.router.add_get(view.url, handler(view.get), allow_head=False)
+    app.router.add_head(view.url, handler(view.head))
+    client = TestClient(TestServer(app))
+    await client.start_server()
+    yield client
+    await client.close()
+    store.close()
+
+
+def _url(key=KEY):
+    return view_mod.CLIP_URL.format(entry_id="e", key=key)
+
+
+@pytest.mark.asyncio
+async def test_full_clip_and_conditional_get(http):
+    resp = await http.get(_url())
+    assert resp.status == 200
+    assert await resp.read() == AUDIO
+    assert resp.headers["Content-Type"] == "audio/mpeg"
+    assert resp.headers["Accept-Ranges"] == "bytes"
+    assert "max-age" in resp.headers["Cache-Control"]
+    etag = resp.headers["ETag"]
+
+    resp = await http.get(_url(), headers={"If-None-Match": etag})
+    assert resp.status == 304
+    assert await resp.read() == b""
+
+    resp = await http.head(_url())
+    assert resp.status == 200
+    assert int(resp.headers["Content-Length"]) == len(AUDIO)
+
+
+@pytest.mark.asyncio
+async def test_ranges(http):
+    resp = await http.get(_url(), headers={"Range": "bytes=100-199"})
+    assert resp.status == 206
+    assert await resp.read() == AUDIO[100:200]
+    assert resp.headers["Content-Range"] == f"bytes 100-199/{len(AUDIO)}"
+
+    resp = await http.get(_url(), headers={"Range": "bytes=-10"})
+    assert await resp.read() == AUDIO[-10:]
+
+    resp = await http.get(_url(), headers={"Range": f"bytes={len(AUDIO)}-"})
+    assert resp.status == 416
+
+    # A stale If-Range validator means the client gets the whole clip
+    resp = await http.get(
+        _url(), headers={"Range": "bytes=0-9", "If-Range": '"stale"'}
+    )
+    assert resp.status == 200
+    assert await resp.read() == AUDIO
+
+
+@pytest.mark.asyncio
+async def test_unknown_clip(http):
+    assert (await http.get(_url("ef" * 16))).status == 404
+    assert (await http.get(_url("not-a-key"))).status == 404
+
+
+@pytest.mark.asyncio
+async def test_fallback_without_sendfile(http, monkeypatch):
+    async def no_sendfile(*args, **kwargs):
+        raise NotImplementedError
+
+    monkeypatch.setattr(asyncio.get_running_loop(), "sendfile", no_sendfile)
+    monkeypatch.setattr(view_mod, "FALLBACK_CHUNK_SIZE", 1000)
+    resp = await http.get(_url(), headers={"Range": "bytes=10-"})
+    assert await resp.read() == AUDIO[10:]
+
+
+def test_signed_url():
+    url = view_mod.async_clip_url(None, "e", KEY)
+    assert url.startswith(f"/api/openai_gpt4o_tts/clip/e/{KEY}?authSig=")
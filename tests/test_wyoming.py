@@ -0,0 +1,125 @@
+import asyncio
+import importlib
+import os
+import sys
+
+import pytest
+import pytest_asyncio
+
+sys.path.insert(0, os.path.dirname(__file__))
+from hass_stubs import fake_entry, install_homeassistant_stubs
+from stub_api import StubSpeechAPI
+
+install_homeassistant_stubs()
+
+BASE_DIR = os.path.dirname(os.path.dirname(__file__))
+sys.path.insert(0, BASE_DIR)
+
+gpt4o = importlib.import_module("custom_components.openai_gpt4o_tts.gpt4o")
+wyoming = importlib.import_module("custom_components.openai_gpt4o_tts.wyoming_server")
+
+CHUNK_SIZE = 4800
+
+
+@pytest_asyncio.fixture
+async def server(monkeypatch):
+    stub = StubSpeechAPI(chunks=3, chunk_size=CHUNK_SIZE)
+    monkeypatch.setattr(gpt4o, "OPENAI_TTS_ENDPOINT", await stub.start())
+    entry = fake_entry({"trim_silence": False})
+    client = gpt4o.GPT4oClient(None, entry)
+    server = wyoming.WyomingServer(client, "127.0.0.1", 0)
+    await server.async_start()
+    server.stub = stub
+    yield server
+    await server.async_stop()
+    await client.async_close()
+    await stub.close()
+
+
+async def _events_until(reader, last_type):
+    events = []
+    while True:
+        event = await asyncio.wait_for(wyoming.read_event(reader), 5)
+        events.append(event)
+        if event[0] == last_type:
+            return events
+
+
+@pytest.mark.asyncio
+async def test_describe_and_synthesize(server):
+    reader, writer = await asyncio.open_connection("127.0.0.1", server.port)
+    wyoming.write_event(writer, "describe")
+    (info,) = await _events_until(reader, "info")
+    voices = [voice["name"] for voice in info[1]["tts"][0]["voices"]]
+    assert "nova" in voices
+
+    wyoming.write_event(
+        writer, "synthesize", {"text": "Hello there", "voice": {"name": "nova"}}
+    )
+    events = await _events_until(reader, "audio-stop")
+    assert events[0][:2] == ("audio-start", {"rate": 24000, "width": 2, "channels": 1})
+    chunks = [
+        payload for event_type, _data, payload in events if event_type == "audio-chunk"
+    ]
+    # PCM is forwarded in 40/200 ms chunks, as it is rechunked for streaming
+    assert len(chunks) > 1
+    expected = b"".join(server.stub.audio_chunk(i) for i in range(3))
+    assert b"".join(chunks) == expected
+    payload = server.stub.payloads[0]
+    assert (payload["voice"], payload["response_format"]) == ("nova", "pcm")
+    writer.close()
+
+
+@pytest.mark.asyncio
+async def test_streamed_text_is_spoken_per_sentence(server):
+    reader, writer = await asyncio.open_connection("127.0.0.1", server.port)
+    wyoming.write_event(writer, "synthesize-start", {"voice": {"name": "echo"}})
+    wyoming.write_event(writer, "synthesize-chunk", {"text": "First sentence. Sec"})
+    wyoming.write_event(writer, "synthesize-chunk", {"text": "ond one"})
+    # Sent for older servers; ignored while streaming
+    wyoming.write_event(writer, "synthesize", {"text": "First sentence. Second one"})
+    wyoming.write_event(writer, "synthesize-stop")
+    events = await _events_until(reader, "synthesize-stopped")
+
+    types = [event_type for event_type, _data, _payload in events]
+    assert types[0] == "audio-start" and types.count("audio-start") == 1
+    assert types[-2:] == ["audio-stop", "synthesize-stopped"]
+    inputs = [payload["input"] for payload in server.stub.payloads]
+    assert inputs == ["First sentence.", "Second one"]
+    size = sum(len(payload) for _type, _data, payload in events)
+    assert size == 2 * 3 * CHUNK_SIZE
+    writer.close()
+
+
+@pytest.mark.asyncio
+async def test_api_failure_is_reported(server):
+    server.stub.status = 500
+    reader, writer = await asyncio.open_connection("127.0.0.1", server.port)
+    wyoming.write_event(writer, "synthesize", {"text": "Hello"})
+    events = await _events_until(reader, "error")
+    assert [event_type for event_type, _data, _payload in events] == ["error"]
+    assert events[0][1]["code"] == "tts-failed"
+    writer.close()
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "line",
+    [
+        b'{"data": {}}\n',
+        b"[1]\n",
+        b"not json\n",
+        b'{"type": "synthesize", "data": "Hello"}\n',
+        b'{"type": "synthesize", "data": {"text": "Hi", "voice": "nova"}}\n',
+        b'{"type": "synthesize-chunk", "data": {"text": 1}}\n',
+        b'{"type": "synthesize", "data_length": 3}\n[1]',
+        b'{"type": "synthesize", "data_length": -1}\n',
+        b'{"type": "synthesize", "payload_length": "2"}\n',
+    ],
+)
+async def test_malformed_events_are_refused(line):
+    reader = asyncio.StreamReader()
+    reader.feed_data(line)
+    reader.feed_eof()
+    with pytest.raises(ValueError):
+        await wyoming.read_event(reader)